@@ -1,16 +1,26 @@
 import os
 from typing import List
-from openai import OpenAI
 import dotenv
 import json
+from llmCache import llm_cache
+from resumeMatcher import match_resume
+from llmGateway import LLMGateway, parse_model_limits
+from promptBudget import prepare
 
 dotenv.load_dotenv()
 
-# initialize OpenRouter client (Gemini models)
-client = OpenAI(
+# initialize the shared OpenRouter gateway (Gemini models); `client` is its
+# synchronous facade with the same chat.completions.create() interface
+gateway = LLMGateway(
     base_url="https://openrouter.ai/api/v1",
     api_key=os.getenv("OPENROUTER_API_KEY"),
+    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "16")),
+    model_concurrency=int(os.getenv("LLM_MODEL_CONCURRENCY", "4")),
+    model_limits=parse_model_limits(os.getenv("LLM_MODEL_LIMITS")),
+    timeout=float(os.getenv("LLM_TIMEOUT", "60")),
+    max_retries=int(os.getenv("LLM_MAX_RETRIES", "4")),
 )
+client = gateway.sync_client
 
 SYSTEM = {
     "role": "system",
@@ -55,118 +65,94 @@ AI_MODELS = [
     }
 ]
 
-def stream_ai_summary(job_description: str, model: str = "mistralai/mixtral-8x7b-instruct") -> str:
+def stream_ai_summary(job_description: str, model: str = "mistralai/mixtral-8x7b-instruct", use_cache: bool = True) -> str:
     """
     Ask AI to distill a job description down to its key points.
     
     Parameters:
         job_description: The job description text
         model: The model ID to use for analysis
+        use_cache: Replay a cached answer for an identical prompt instead of calling the model
     """
     USER = {
         "role": "user",
         "content": (
             "Here is the job description to analyze:\n\n"
-            f"{job_description}"
+            f"{prepare(job_description, model, label='summary')}"
         )
     }
     
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            SYSTEM,
-            USER,
-        ],
-        stream=True,
-    )
-    
-    return response
+    return llm_cache.stream(client, model, [SYSTEM, USER], use_cache=use_cache)
 
 
 def get_ai_resume_suggestions(
     job_details,
     resume_text,
-    model="mistralai/mixtral-8x7b-instruct"
+    model="mistralai/mixtral-8x7b-instruct",
+    use_cache=True,
+    match=None
 ) -> dict:
     """
     Given a job description and a candidate's resume text,
     return structured, categorized suggestions for improving the resume
     along with matched and missing keywords.
+
+    The score and keyword lists come from the local resume matcher (pass
+    `match` if it was already computed); the model is only asked for the
+    narrative suggestions.
     """
-    # Create a more structured system prompt
+    if match is None:
+        match = match_resume(job_details, resume_text)
+
     system_prompt = """
-    You are an expert resume consultant and job application coach. Analyze the resume 
-    against the job details and provide structured feedback in JSON format.
-    
-    Your response MUST be a valid JSON object with the following structure:
-    {
-      "compatibilityScore": <number 0-100>,
-      "missingKeywords": [<array of important keywords from job not found in resume>],
-      "matchedKeywords": [<array of important keywords found in both>],
-      "suggestions": [
-        {
-          "category": "<category name>",
-          "suggestions": [<array of specific suggestions>]
-        },
-        ...more categories
-      ]
-    }
-    
-    Categories should include at least:
-    - "Skills & Keywords" (technical and soft skills suggestions)
-    - "Experience & Achievements" (how to better present experience)
-    - "Resume Structure & Formatting" (organization suggestions)
-    
-    Each suggestion should be specific, actionable, and directly tied to the job requirements.
+    You are an expert resume consultant. Given a job, the result of a keyword
+    match and a resume, respond ONLY with a JSON object of the form
+    {"suggestions": [{"category": "<category name>", "suggestions": [<specific, actionable suggestions>]}]}
+    with at least the categories "Skills & Keywords", "Experience & Achievements"
+    and "Resume Structure & Formatting".
     """
     
-    # Extract key details from job details JSON
-    title = job_details.get('title', '')
-    company = job_details.get('company', '')
-    requirements = job_details.get('requirements', [])
-    responsibilities = job_details.get('responsibilities', [])
-    keywords = job_details.get('keywords', [])
+    # Requirements the resume already covers well need no advice
+    weak_requirements = [item["text"] for item in match["requirements"] if item["coverage"] < 0.5]
     
-    # Create a more specific user prompt with the job details
     user_prompt = f"""
-    JOB DETAILS:
-    Title: {title}
-    Company: {company}
-    
-    Requirements:
-    {", ".join(requirements) if requirements else "Not specified"}
-    
-    Responsibilities:
-    {", ".join(responsibilities) if responsibilities else "Not specified"}
+    JOB: {job_details.get('title', '')} at {job_details.get('company', '')}
+    Match score: {match['compatibilityScore']}/100
+    Missing keywords: {", ".join(match['missingKeywords']) or "None"}
+    Matched keywords: {", ".join(match['matchedKeywords']) or "None"}
+    Weakly covered requirements: {"; ".join(weak_requirements) or "None"}
     
-    Key Skills/Keywords:
-    {", ".join(keywords) if keywords else "Not specified"}
-    
-    CANDIDATE'S RESUME:
-    {resume_text}
-    
-    Please analyze how well this resume matches the job requirements and provide specific, 
-    actionable suggestions to improve it. Format your response ONLY as the JSON structure specified.
+    RESUME:
+    {" ".join(prepare(resume_text, model, kind="resume", label="resume suggestions").split())}
     """
 
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
+    content = llm_cache.complete(
+        client,
+        model,
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ],
         response_format={ "type": "json_object" },
+        use_cache=use_cache,
     )
 
+    local_fields = {
+        "compatibilityScore": match["compatibilityScore"],
+        "missingKeywords": match["missingKeywords"],
+        "matchedKeywords": match["matchedKeywords"],
+    }
+
     # Parse the response
     try:
-        result_text = response.choices[0].message.content.strip()
+        result_text = content.strip()
         result = json.loads(result_text)
         print(f"AI Resume Analysis: {result}")
-        return result
+        suggestions = result.get("suggestions", []) if isinstance(result, dict) else []
+        return {**local_fields, "suggestions": suggestions}
     except json.JSONDecodeError:
         # Fallback in case of parsing error
-        text = response.choices[0].message.content.strip()
+        text = content.strip()
         print(f"Error parsing JSON from AI. Raw response: {text}")
         
         # Return a basic structure with just the suggestions as plain text
@@ -181,9 +167,7 @@ def get_ai_resume_suggestions(
             fallback_suggestions = [s.strip() for s in text.split("\n") if s.strip()]
         
         return {
-            "compatibilityScore": 50,
-            "missingKeywords": [],
-            "matchedKeywords": [],
+            **local_fields,
             "suggestions": [
                 {
                     "category": "General Improvements",
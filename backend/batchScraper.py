@@ -0,0 +1,193 @@
+"""
+Batch Job Scraper
+
+Scrapes a list of job URLs concurrently while staying polite to each job
+board: at most `per_domain` requests in flight per domain, and at least
+`delay` seconds between request starts on the same domain. Results are
+yielded as each URL completes, followed by a summary with throughput and
+average time spent in each pipeline stage.
+
+Usage from the command line (results are written as NDJSON to stdout or
+--output; the pipeline's progress messages go to stderr):
+    python batchScraper.py urls.txt --concurrency 8 --per-domain 2 --delay 1 --output jobs.ndjson
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+from jobSites import get_domain
+
+
+class DomainThrottle:
+    """Per-domain concurrency limit plus a minimum delay between request starts"""
+
+    def __init__(self, per_domain=2, delay=1.0):
+        self.per_domain = per_domain
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    @contextmanager
+    def slot(self, url):
+        domain = get_domain(url)
+        with self._lock:
+            semaphore = self._semaphores.setdefault(domain, threading.Semaphore(self.per_domain))
+
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(domain, now))
+                self._next_start[domain] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+def interleave_by_domain(urls):
+    """Round-robin URLs across domains so one large domain does not hog every worker"""
+    queues = defaultdict(deque)
+    for url in urls:
+        queues[get_domain(url)].append(url)
+
+    ordered = []
+    while queues:
+        for domain in list(queues):
+            ordered.append(queues[domain].popleft())
+            if not queues[domain]:
+                del queues[domain]
+    return ordered
+
+
+def scrape_batch(urls, pipeline, model, save=None, concurrency=8, per_domain=2, delay=1.0):
+    """
+    Scrape many URLs, yielding one record per URL as it completes and a
+    final {"summary": {...}} record.
+
+    Parameters:
+        urls: Job posting URLs
+        pipeline: Callable(url, model, progress) returning the job data
+        model: AI model used to enrich each posting
+        save: Optional callable storing the job data and returning its ID
+        concurrency: Total number of URLs scraped at once
+        per_domain: Number of URLs scraped at once per domain
+        delay: Minimum seconds between request starts on one domain
+    """
+    throttle = DomainThrottle(per_domain, delay)
+    stage_totals = defaultdict(float)
+    stage_counts = defaultdict(int)
+    totals_lock = threading.Lock()
+
+    def run(url):
+        timings = {}
+        queued = time.monotonic()
+        with throttle.slot(url):
+            started = last = time.monotonic()
+            timings["wait"] = round(started - queued, 3)
+
+            def progress(stage):
+                nonlocal last
+                now = time.monotonic()
+                timings[stage] = round(now - last, 3)
+                last = now
+
+            record = {"url": url, "ok": True}
+            try:
+                job_data = pipeline(url, model, progress)
+                record["job"] = job_data
+                if save is not None:
+                    record["job_id"] = save(job_data)
+            except Exception as e:
+                record.update(ok=False, error=str(e))
+            timings["total"] = round(time.monotonic() - started, 3)
+
+        record["timings"] = timings
+        with totals_lock:
+            for stage, seconds in timings.items():
+                stage_totals[stage] += seconds
+                stage_counts[stage] += 1
+        return record
+
+    batch_start = time.monotonic()
+    succeeded = failed = 0
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch-scrape")
+    try:
+        futures = [executor.submit(run, url) for url in interleave_by_domain(urls)]
+        for future in as_completed(futures):
+            record = future.result()
+            if record["ok"]:
+                succeeded += 1
+            else:
+                failed += 1
+            yield record
+    finally:
+        # If the consumer goes away (e.g. the client disconnects) drop the URLs not yet started
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.monotonic() - batch_start
+    yield {
+        "summary": {
+            "urls": len(urls),
+            "succeeded": succeeded,
+            "failed": failed,
+            "elapsed_seconds": round(elapsed, 2),
+            "urls_per_minute": round(len(urls) / elapsed * 60, 1) if elapsed else 0.0,
+            "avg_stage_seconds": {
+                stage: round(stage_totals[stage] / stage_counts[stage], 3) for stage in stage_totals
+            },
+        }
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+    from contextlib import redirect_stdout
+
+    parser = argparse.ArgumentParser(description="Scrape a list of job posting URLs")
+    parser.add_argument("file", help="Text file with one URL per line ('-' for stdin)")
+    parser.add_argument("--model", default="mistralai/mixtral-8x7b-instruct")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--per-domain", type=int, default=2)
+    parser.add_argument("--delay", type=float, default=1.0)
+    parser.add_argument("--no-save", action="store_true", help="Do not save results to the job store")
+    parser.add_argument("--output", help="Write the NDJSON records to this file instead of stdout")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    with source:
+        urls = [line.strip() for line in source if line.strip() and not line.startswith("#")]
+    urls = [url if url.startswith(("http://", "https://")) else "https://" + url for url in urls]
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        # The scraper and fetcher print progress; keep it out of the records
+        with redirect_stdout(sys.stderr):
+            from jobPipeline import scrape_and_enrich, save_job_data
+
+            for record in scrape_batch(
+                urls,
+                scrape_and_enrich,
+                args.model,
+                save=None if args.no_save else save_job_data,
+                concurrency=args.concurrency,
+                per_domain=args.per_domain,
+                delay=args.delay,
+            ):
+                if "summary" in record:
+                    summary = record["summary"]
+                    print(
+                        f"{summary['succeeded']}/{summary['urls']} succeeded in {summary['elapsed_seconds']}s "
+                        f"({summary['urls_per_minute']} URLs/min), avg stage seconds: {summary['avg_stage_seconds']}",
+                        file=sys.stderr,
+                    )
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
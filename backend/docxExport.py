@@ -0,0 +1,258 @@
+"""
+DOCX Export
+
+Converts the resume editor's HTML into a Word document in one pass over
+the blocks produced by htmlBlocks: headings, paragraphs, nested bulleted
+and numbered lists, bold/italic/underline, links and tables are mapped to
+the matching python-docx styles.
+
+Styles are set up once in a template document (or loaded from
+DOCX_TEMPLATE_PATH) whose bytes are kept in memory; every export opens a
+fresh copy of those bytes instead of creating a document and styling it
+from scratch. Style names are resolved to style IDs once, on the template:
+python-docx otherwise rescans every style definition for each paragraph,
+which was most of the export time.
+
+Command line:
+    python docxExport.py bench [resume.html]   # exports/sec, cached template vs styling each time
+    python docxExport.py check [resume.html]   # round trip through parse_docx_content
+"""
+
+import difflib
+import io
+import os
+import threading
+import time
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Inches, Pt, RGBColor
+
+from htmlBlocks import SAMPLE_RESUME_HTML, block_text, iter_blocks
+
+TEMPLATE_PATH = os.getenv("DOCX_TEMPLATE_PATH")
+
+BODY_FONT = "Calibri"
+BODY_SIZE = Pt(10.5)
+HEADING_SIZES = {1: Pt(18), 2: Pt(13), 3: Pt(11.5)}
+ACCENT = RGBColor(0x1F, 0x3A, 0x5F)
+LINK_COLOR = RGBColor(0x05, 0x63, 0xC1)
+MAX_LIST_LEVEL = 3  # the built-in styles go up to "List Bullet 3"
+
+STYLE_NAMES = (
+    [f"Heading {level}" for level in range(1, 7)]
+    + [f"{base}{suffix}" for base in ("List Bullet", "List Number") for suffix in ("", " 2", " 3")]
+    + ["Hyperlink", "Table Grid"]
+)
+
+_template = None  # (document bytes, style name -> style ID)
+_template_lock = threading.Lock()
+
+
+def style_document(doc):
+    """Apply the resume styles to a document (done once, on the template)"""
+    for section in doc.sections:
+        section.top_margin = section.bottom_margin = Inches(0.7)
+        section.left_margin = section.right_margin = Inches(0.8)
+
+    normal = doc.styles["Normal"]
+    normal.font.name = BODY_FONT
+    normal.font.size = BODY_SIZE
+    normal.paragraph_format.space_after = Pt(3)
+
+    for level, size in HEADING_SIZES.items():
+        heading = doc.styles[f"Heading {level}"]
+        heading.font.name = BODY_FONT
+        heading.font.size = size
+        heading.font.color.rgb = ACCENT
+        heading.paragraph_format.space_before = Pt(10 if level > 1 else 0)
+        heading.paragraph_format.space_after = Pt(3)
+
+    if "Hyperlink" not in doc.styles:
+        link = doc.styles.add_style("Hyperlink", WD_STYLE_TYPE.CHARACTER)
+        link.font.color.rgb = LINK_COLOR
+        link.font.underline = True
+
+
+def _clear_body(doc):
+    """Remove a template's sample content, keeping its section settings"""
+    body = doc.element.body
+    for child in list(body):
+        if child.tag != qn("w:sectPr"):
+            body.remove(child)
+
+
+def template():
+    """(bytes of the styled, empty template document, style IDs by name), built on first use"""
+    global _template
+    with _template_lock:
+        if _template is None:
+            doc = Document(TEMPLATE_PATH) if TEMPLATE_PATH else Document()
+            _clear_body(doc)
+            style_document(doc)
+            style_ids = {name: doc.styles[name].style_id for name in STYLE_NAMES if name in doc.styles}
+            buffer = io.BytesIO()
+            doc.save(buffer)
+            _template = (buffer.getvalue(), style_ids)
+        return _template
+
+
+def _add_runs(paragraph, runs, style_ids, bold=False):
+    for spec in runs:
+        run = paragraph.add_run(spec["text"])  # "\n" becomes a line break
+        if spec["bold"] or bold:
+            run.bold = True
+        if spec["italic"]:
+            run.italic = True
+        if spec["underline"]:
+            run.underline = True
+        if spec["href"]:
+            if "Hyperlink" in style_ids:
+                run._r.style = style_ids["Hyperlink"]
+            r_id = paragraph.part.relate_to(spec["href"], RT.HYPERLINK, is_external=True)
+            link = OxmlElement("w:hyperlink")
+            link.set(qn("r:id"), r_id)
+            paragraph._p.append(link)
+            link.append(run._r)  # moves the run inside the link
+
+
+def _add_rule(doc):
+    paragraph = doc.add_paragraph()
+    borders = OxmlElement("w:pBdr")
+    bottom = OxmlElement("w:bottom")
+    for key, value in (("w:val", "single"), ("w:sz", "6"), ("w:space", "1"), ("w:color", "auto")):
+        bottom.set(qn(key), value)
+    borders.append(bottom)
+    paragraph._p.get_or_add_pPr().append(borders)
+
+
+def _list_style(block):
+    base = "List Number" if block["ordered"] else "List Bullet"
+    level = min(block["depth"] + 1, MAX_LIST_LEVEL)
+    return base if level == 1 else f"{base} {level}"
+
+
+def _add_table(doc, rows, style_ids):
+    columns = max(len(row) for row in rows)
+    table = doc.add_table(rows=len(rows), cols=columns)
+    if "Table Grid" in style_ids:
+        table._tbl.tblStyle_val = style_ids["Table Grid"]
+    for row, cells in zip(table.rows, rows):
+        row_cells = row.cells  # fetched once per row; table.cell() rescans the grid
+        for cell, spec in zip(row_cells, cells):
+            _add_runs(cell.paragraphs[0], spec["runs"], style_ids, bold=spec["header"])
+
+
+def _add_paragraph(doc, style_ids, style=None):
+    paragraph = doc.add_paragraph()
+    if style in style_ids:
+        paragraph._p.style = style_ids[style]
+    return paragraph
+
+
+def write_blocks(doc, blocks, style_ids):
+    """Append htmlBlocks blocks to a document made from the template"""
+    for block in blocks:
+        kind = block["type"]
+        if kind == "heading":
+            _add_runs(_add_paragraph(doc, style_ids, f"Heading {block['level']}"), block["runs"], style_ids)
+        elif kind == "paragraph":
+            _add_runs(_add_paragraph(doc, style_ids), block["runs"], style_ids)
+        elif kind == "list_item":
+            _add_runs(_add_paragraph(doc, style_ids, _list_style(block)), block["runs"], style_ids)
+        elif kind == "table":
+            _add_table(doc, block["rows"], style_ids)
+        elif kind == "rule":
+            _add_rule(doc)
+
+
+def html_to_docx(html):
+    """A BytesIO holding the resume HTML as a .docx file"""
+    data, style_ids = template()
+    doc = Document(io.BytesIO(data))
+    write_blocks(doc, iter_blocks(html), style_ids)
+    output = io.BytesIO()
+    doc.save(output)
+    output.seek(0)
+    return output
+
+
+def round_trip_check(html):
+    """
+    Export the HTML, read the result back with parse_docx_content (as the
+    editor does on upload) and compare the two.
+
+    Returns {"text_similarity", "blocks": {type: [in, out]}, "links": [in, out]}
+    where text_similarity is 0..1 over the block texts in order.
+    """
+    from resumeEditor import parse_docx_content
+
+    parsed = parse_docx_content(html_to_docx(html).getvalue(), "round_trip.docx")
+    if not parsed["success"]:
+        raise RuntimeError(parsed["error"])
+
+    before = list(iter_blocks(html))
+    after = list(iter_blocks(parsed["html"]))
+
+    def counts(blocks):
+        result = {}
+        for block in blocks:
+            result[block["type"]] = result.get(block["type"], 0) + 1
+        return result
+
+    def links(blocks):
+        return sum(1 for block in blocks for run in block.get("runs", []) if run["href"])
+
+    before_counts, after_counts = counts(before), counts(after)
+    return {
+        "text_similarity": round(difflib.SequenceMatcher(
+            None, [block_text(b) for b in before], [block_text(b) for b in after]
+        ).ratio(), 3),
+        "blocks": {kind: [before_counts.get(kind, 0), after_counts.get(kind, 0)]
+                   for kind in sorted(set(before_counts) | set(after_counts))},
+        "links": [links(before), links(after)],
+    }
+
+
+def benchmark(html=SAMPLE_RESUME_HTML, exports=50):
+    """Exports/sec with the cached template vs creating, styling and resolving styles per export"""
+
+    def uncached():
+        doc = Document()
+        style_document(doc)
+        write_blocks(doc, iter_blocks(html), {name: doc.styles[name].style_id for name in STYLE_NAMES})
+        doc.save(io.BytesIO())
+
+    template()
+    results = {}
+    for name, run in (("styled per export", uncached), ("cached template", lambda: html_to_docx(html))):
+        start = time.perf_counter()
+        for _ in range(exports):
+            run()
+        results[name] = round(exports / (time.perf_counter() - start), 1)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="HTML to DOCX export")
+    parser.add_argument("command", choices=["bench", "check"])
+    parser.add_argument("path", nargs="?", help="HTML file (defaults to a built-in two-page resume)")
+    parser.add_argument("--exports", type=int, default=50)
+    args = parser.parse_args()
+
+    source = SAMPLE_RESUME_HTML
+    if args.path:
+        with open(args.path, encoding="utf-8") as f:
+            source = f.read()
+
+    if args.command == "bench":
+        for name, rate in benchmark(source, args.exports).items():
+            print(f"{name:>18}: {rate} exports/sec")
+    else:
+        print(json.dumps(round_trip_check(source), indent=2))
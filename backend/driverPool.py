@@ -0,0 +1,244 @@
+"""
+Chrome WebDriver Pool
+
+Keeps a bounded set of headless Chrome instances warm so that scraping a job
+posting does not pay the browser cold start (ChromeDriverManager lookup plus
+process launch) on every request. Drivers are handed out one request at a
+time, reset between uses and recycled after a number of pages or on crash.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+
+class DriverPool:
+    """
+    A bounded pool of Selenium drivers.
+
+    Parameters:
+        factory: Callable returning a new driver (scraper.configure_driver)
+        size: Maximum number of browsers alive at once
+        max_pages: Recycle a driver after it has served this many pages
+        acquire_timeout: Seconds to wait for a free driver before giving up
+    """
+
+    def __init__(self, factory, size=2, max_pages=50, acquire_timeout=30):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = []  # most recently used last
+        self._lock = threading.Lock()
+        # Notified when a driver becomes idle or a slot frees up for a new one
+        self._available = threading.Condition(self._lock)
+        self._pages = {}  # id(driver) -> pages served
+        self._created = 0
+        self._alive = 0
+        self._in_use = 0
+        self._closed = False
+
+        # Metrics
+        self._acquisitions = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._recycled = 0
+        self._crashed = 0
+
+    def warm(self, count=None):
+        """Start up to `count` drivers in the background so the first requests find them ready"""
+        count = self.size if count is None else min(count, self.size)
+
+        def _warm():
+            for _ in range(count):
+                try:
+                    driver = self._spawn()
+                except Exception as e:
+                    print(f"Error warming WebDriver pool: {str(e)}")
+                    break
+                if driver is None:
+                    break
+                self._put_idle(driver)
+
+        threading.Thread(target=_warm, name="driver-pool-warm", daemon=True).start()
+
+    def _spawn(self):
+        """Create a new driver if the pool has room, otherwise return None"""
+        with self._lock:
+            if self._closed or self._alive >= self.size:
+                return None
+            self._alive += 1
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._available:
+                self._alive -= 1
+                self._available.notify()
+            raise
+
+        with self._lock:
+            self._created += 1
+            self._pages[id(driver)] = 0
+        return driver
+
+    def acquire(self, timeout=None):
+        """
+        Take a driver out of the pool, starting a new one if there is room.
+        Blocks until one is free or `timeout` seconds have passed.
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        while True:
+            with self._available:
+                if self._idle:
+                    driver = self._idle.pop()
+                    break
+                if self._closed or self._alive >= self.size:
+                    # Woken by a release, or by a discard that leaves room to spawn
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise TimeoutError(f"No WebDriver available after {timeout}s")
+                    self._available.wait(remaining)
+                    continue
+            driver = self._spawn()  # outside the lock: starting Chrome takes seconds
+            if driver is not None:
+                break
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self._in_use += 1
+            self._acquisitions += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+        return driver
+
+    def release(self, driver, broken=False):
+        """
+        Return a driver to the pool. Broken drivers, and drivers that have
+        served `max_pages` pages, are quit instead of being reused.
+        """
+        with self._lock:
+            self._in_use -= 1
+            pages = self._pages.get(id(driver), 0)
+
+        if not broken and pages < self.max_pages and not self._closed:
+            try:
+                self._reset(driver)
+                self._put_idle(driver)
+                return
+            except Exception as e:
+                print(f"Error resetting WebDriver, discarding it: {str(e)}")
+                broken = True
+
+        with self._lock:
+            if broken:
+                self._crashed += 1
+            else:
+                self._recycled += 1
+        self._discard(driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context manager around acquire/release that discards the driver on WebDriver errors"""
+        driver = self.acquire(timeout)
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def _reset(self, driver):
+        """Clear cookies, storage and extra tabs so the next request starts clean"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        driver.delete_all_cookies()
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            # Storage is not accessible on some pages (e.g. about:blank, error pages)
+            pass
+        driver.get("about:blank")
+
+    def _put_idle(self, driver):
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    def _discard(self, driver):
+        with self._available:
+            self._alive -= 1
+            self._pages.pop(id(driver), None)
+            self._available.notify()
+        try:
+            driver.quit()
+        except Exception:
+            print("Error closing WebDriver")
+
+    def close(self):
+        """Quit every idle driver; drivers in use are quit when released"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+    def stats(self):
+        """Pool size and wait-time metrics"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "alive": self._alive,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "created": self._created,
+                "recycled": self._recycled,
+                "crashed": self._crashed,
+                "acquisitions": self._acquisitions,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait / self._acquisitions * 1000, 2) if self._acquisitions else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Return the process-wide driver pool, creating and warming it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from scraper import configure_driver
+
+            _pool = DriverPool(
+                configure_driver,
+                size=int(os.getenv("DRIVER_POOL_SIZE", "2")),
+                max_pages=int(os.getenv("DRIVER_MAX_PAGES", "50")),
+                acquire_timeout=float(os.getenv("DRIVER_ACQUIRE_TIMEOUT", "30")),
+            )
+            _pool.warm(int(os.getenv("DRIVER_POOL_WARM", "1")))
+        return _pool
+
+
+def driver_pool_stats():
+    """Metrics for the process-wide pool without starting any browsers"""
+    with _pool_lock:
+        return _pool.stats() if _pool is not None else None
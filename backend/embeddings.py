@@ -0,0 +1,547 @@
+"""
+Embeddings
+
+Offline vector embeddings for saved jobs and resume sections, used for
+semantic search, duplicate-posting detection and resume-to-job similarity
+without any network calls.
+
+- Embedder: a local sentence-transformers model when EMBEDDING_MODEL names
+  one (a path or an already-downloaded model), otherwise a hashing embedder
+  (signed feature hashing of normalized unigrams and bigrams, with skill
+  aliases such as "k8s" -> "kubernetes" resolved first).
+- Storage: job vectors live in memory-mapped float32 files under
+  data/embeddings, one per embedder; an SQLite table maps keys to rows so
+  several worker processes can share the files. Resume-section vectors are
+  candidate data and stay in memory, in a bounded LRU keyed by the resume's
+  SHA-256 (RESUME_VECTOR_CACHE_SIZE resumes).
+- Search: exact dot products for small spaces, random-hyperplane LSH with
+  multi-probe lookups and exact re-ranking once a space grows past
+  BRUTE_FORCE_LIMIT vectors.
+
+Job vectors are kept in sync with the job store incrementally, the same way
+as the job ranker.
+
+Command line:
+    python embeddings.py reembed       # re-embed every saved job
+    python embeddings.py duplicates    # list likely duplicate postings
+    python embeddings.py bench         # query latency and recall vs store size
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from jobStore import job_store
+from resumeMatcher import content_terms
+from scrapeCache import DATA_DIR
+
+EMBEDDINGS_DIR = os.getenv("EMBEDDINGS_DIR", os.path.join(DATA_DIR, "embeddings"))
+
+BRUTE_FORCE_LIMIT = 5000
+DUPLICATE_THRESHOLD = 0.92
+INITIAL_CAPACITY = 1024
+
+# Characters of a job description that are embedded
+DESCRIPTION_CHARS = 4000
+
+# Resume paragraphs are merged into sections of at least this many characters
+MIN_SECTION_CHARS = 200
+
+SYNC_OVERLAP = 5.0
+
+RESUME_VECTOR_CACHE_SIZE = int(os.getenv("RESUME_VECTOR_CACHE_SIZE", "256"))
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-ngrams embedding; no model files needed"""
+
+    def __init__(self, dim=512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text):
+        terms = content_terms(text)
+        return terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            counts = {}
+            for feature in self._features(text):
+                counts[feature] = counts.get(feature, 0) + 1
+            for feature, count in counts.items():
+                h = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if h & 0x80000000 else -1.0
+                vectors[i, h % self.dim] += sign * (1.0 + np.log(count))
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """A local sentence-transformers model, run on the CPU"""
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = "st-" + os.path.basename(model_name.rstrip("/")).replace("/", "-")
+
+    def embed(self, texts):
+        vectors = self.model.encode(list(texts), batch_size=32, normalize_embeddings=True, convert_to_numpy=True)
+        return vectors.astype(np.float32)
+
+
+def create_embedder():
+    model_name = os.getenv("EMBEDDING_MODEL")
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception as e:
+            print(f"Could not load embedding model {model_name}, using hashing embeddings: {str(e)}")
+    return HashingEmbedder(int(os.getenv("EMBEDDING_DIM", "512")))
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class LSHIndex:
+    """
+    Random-hyperplane LSH over unit vectors. Each of `tables` tables hashes
+    a vector to `bits` sign bits; a query collects the rows in its own bucket
+    and in the buckets one bit away, in every table.
+    """
+
+    def __init__(self, dim, tables=16, bits=12, seed=13):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((tables * bits, dim)).astype(np.float32)
+        self.tables = tables
+        self.bits = bits
+        self._weights = (1 << np.arange(bits, dtype=np.int64))
+        self._buckets = [{} for _ in range(tables)]
+        self._codes = {}  # row -> codes, to move a row when its vector changes
+
+    def _hash(self, vectors):
+        signs = (vectors @ self.planes.T > 0).reshape(len(vectors), self.tables, self.bits)
+        return signs.astype(np.int64) @ self._weights
+
+    def add(self, rows, vectors):
+        for row, codes in zip(rows, self._hash(vectors)):
+            self.remove(row)
+            for table, code in enumerate(codes):
+                self._buckets[table].setdefault(int(code), []).append(row)
+            self._codes[row] = codes
+
+    def remove(self, row):
+        codes = self._codes.pop(row, None)
+        if codes is not None:
+            for table, code in enumerate(codes):
+                self._buckets[table][int(code)].remove(row)
+
+    def candidates(self, vector):
+        found = set()
+        for table, code in enumerate(self._hash(vector[None, :])[0]):
+            buckets = self._buckets[table]
+            code = int(code)
+            found.update(buckets.get(code, ()))
+            for bit in range(self.bits):
+                found.update(buckets.get(code ^ (1 << bit), ()))
+        return found
+
+    def __len__(self):
+        return len(self._codes)
+
+
+class VectorSpace:
+    """
+    Keyed vectors of one kind (e.g. jobs) from one embedder, stored in a
+    memory-mapped file. Rows are allocated through the shared SQLite
+    database so concurrent processes never hand out the same row twice.
+    """
+
+    def __init__(self, name, dim, directory, db_path):
+        self.name = name
+        self.dim = dim
+        self.path = os.path.join(directory, f"{name}.f32")
+        self._db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._keys = {}      # key -> row
+        self._row_keys = {}  # row -> key
+        self._embedded_at = {}  # key -> time the vector was written
+        self._loaded_at = 0.0
+        self._array = None
+        self._index = LSHIndex(dim)
+
+        os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self.path):
+            with open(self.path, "wb") as f:
+                f.truncate(INITIAL_CAPACITY * dim * 4)
+        self._map()
+        self.refresh()
+
+    def _db(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _map(self):
+        rows = os.path.getsize(self.path) // (self.dim * 4)
+        self._array = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(rows, self.dim))
+
+    def _ensure_capacity(self, row):
+        if row < len(self._array):
+            return
+        needed = max(row + 1, len(self._array) * 2) * self.dim * 4
+        with open(self.path, "r+b") as f:
+            if os.path.getsize(self.path) < needed:  # another process may already have grown it
+                f.truncate(needed)
+        self._map()
+
+    def refresh(self):
+        """Pick up rows written by other processes since the last refresh"""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT key, row, updated_at FROM vectors WHERE space = ? AND updated_at > ?",
+                (self.name, self._loaded_at - SYNC_OVERLAP),
+            ).fetchall()
+            if not rows:
+                return
+            self._ensure_capacity(max(row for _, row, _ in rows))
+            for key, row, updated_at in rows:
+                self._keys[key] = row
+                self._row_keys[row] = key
+                self._embedded_at[key] = updated_at
+                self._loaded_at = max(self._loaded_at, updated_at)
+            changed = [row for _, row, _ in rows]
+            self._index.add(changed, np.asarray(self._array[changed]))
+
+    def put(self, keys, vectors):
+        """Store vectors under keys, replacing existing ones"""
+        if not len(keys):
+            return
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                next_row = conn.execute(
+                    "SELECT COALESCE(MAX(row) + 1, 0) FROM vectors WHERE space = ?", (self.name,)
+                ).fetchone()[0]
+                rows = []
+                for key in keys:
+                    existing = conn.execute(
+                        "SELECT row FROM vectors WHERE space = ? AND key = ?", (self.name, key)
+                    ).fetchone()
+                    if existing:
+                        row = existing[0]
+                        conn.execute(
+                            "UPDATE vectors SET updated_at = ? WHERE space = ? AND key = ?", (now, self.name, key)
+                        )
+                    else:
+                        row = next_row
+                        next_row += 1
+                        conn.execute(
+                            "INSERT INTO vectors (space, key, row, updated_at) VALUES (?, ?, ?, ?)",
+                            (self.name, key, row, now),
+                        )
+                    rows.append(row)
+
+                # Write the vectors before committing so other processes never see an empty row
+                self._ensure_capacity(max(rows))
+                self._array[rows] = vectors
+                self._array.flush()
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+            for key, row in zip(keys, rows):
+                self._keys[key] = row
+                self._row_keys[row] = key
+                self._embedded_at[key] = now
+            self._index.add(rows, np.asarray(vectors, dtype=np.float32))
+
+    def get(self, key):
+        with self._lock:
+            row = self._keys.get(key)
+            return None if row is None else np.array(self._array[row])
+
+    def has(self, key):
+        return key in self._keys
+
+    def embedded_at(self, key):
+        """When the key's vector was last written, or 0.0 if it has none"""
+        return self._embedded_at.get(key, 0.0)
+
+    def search(self, vector, k=10, exclude=()):
+        """[(key, similarity)] of the k nearest stored vectors"""
+        with self._lock:
+            if len(self._row_keys) <= BRUTE_FORCE_LIMIT:
+                rows = np.fromiter(self._row_keys, dtype=np.int64)
+            else:
+                rows = np.fromiter(self._index.candidates(vector), dtype=np.int64)
+                if len(rows) < k:
+                    rows = np.fromiter(self._row_keys, dtype=np.int64)
+            if not len(rows):
+                return []
+            scores = np.asarray(self._array[rows]) @ vector
+            keys = [self._row_keys[row] for row in rows]
+
+        order = np.argsort(-scores)
+        results = []
+        for i in order:
+            if keys[i] in exclude:
+                continue
+            results.append((keys[i], float(scores[i])))
+            if len(results) == k:
+                break
+        return results
+
+    def keys(self):
+        return list(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class EmbeddingIndex:
+    """Job and resume-section vectors for one embedder"""
+
+    def __init__(self, store, embedder, directory=EMBEDDINGS_DIR, resume_cache_size=RESUME_VECTOR_CACHE_SIZE):
+        self.store = store
+        self.embedder = embedder
+        self._lock = threading.Lock()
+        self._synced_at = 0.0
+        self._job_updated = {}
+        self._resume_vectors = OrderedDict()  # resume SHA-256 -> section vectors, least recently used first
+        self._resume_lock = threading.Lock()
+        self.resume_cache_size = resume_cache_size
+
+        os.makedirs(directory, exist_ok=True)
+        db_path = os.path.join(directory, "index.db")
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS vectors (
+                space TEXT NOT NULL,
+                key TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (space, key)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_vectors_updated ON vectors (space, updated_at)")
+        conn.commit()
+        conn.close()
+
+        self.jobs = VectorSpace(f"jobs-{embedder.name}", embedder.dim, directory, db_path)
+
+    @staticmethod
+    def job_text(job):
+        parts = [job.get("title") or "", job.get("company") or ""]
+        for field in ("keywords", "requirements", "responsibilities"):
+            parts += [item for item in job.get(field) or [] if isinstance(item, str)]
+        parts.append((job.get("description") or "")[:DESCRIPTION_CHARS])
+        return "\n".join(parts)
+
+    def embed_jobs(self, jobs, batch_size=64):
+        for start in range(0, len(jobs), batch_size):
+            batch = jobs[start:start + batch_size]
+            vectors = self.embedder.embed([self.job_text(job) for job in batch])
+            self.jobs.put([str(job["id"]) for job in batch], vectors)
+
+    def sync(self):
+        """Embed jobs saved or updated since the last sync; returns how many were embedded"""
+        with self._lock:
+            self.jobs.refresh()
+            since = max(0.0, self._synced_at - SYNC_OVERLAP)
+            changes = {
+                job_id: updated_at
+                for job_id, updated_at in self.store.updated_since(since)
+                if self._job_updated.get(job_id) != updated_at
+            }
+            # Skip jobs another worker (or an earlier run) already embedded
+            stale = [job_id for job_id, updated_at in changes.items()
+                     if self.jobs.embedded_at(str(job_id)) < updated_at]
+            self.embed_jobs(self.store.get_many(stale))
+            for job_id, updated_at in changes.items():
+                self._job_updated[job_id] = updated_at
+                self._synced_at = max(self._synced_at, updated_at)
+            return len(stale)
+
+    def reembed(self):
+        """Re-embed every saved job (e.g. after changing EMBEDDING_MODEL)"""
+        with self._lock:
+            jobs = list(self.store.iter_jobs())
+            self.embed_jobs(jobs)
+            return len(jobs)
+
+    def _results(self, matches):
+        jobs = {job["id"]: job for job in self.store.get_many([int(key) for key, _ in matches])}
+        results = []
+        for key, score in matches:
+            job = jobs.get(int(key))
+            if job is not None:
+                results.append({
+                    "id": job["id"],
+                    "title": job.get("title"),
+                    "company": job.get("company"),
+                    "url": job.get("url"),
+                    "similarity": round(score, 4),
+                })
+        return results
+
+    def semantic_search(self, query, k=10):
+        self.sync()
+        vector = self.embedder.embed([query])[0]
+        return self._results(self.jobs.search(vector, k))
+
+    def similar_jobs(self, job_id, k=10, threshold=DUPLICATE_THRESHOLD):
+        """Jobs most similar to a saved job, flagging likely duplicates"""
+        self.sync()
+        vector = self.jobs.get(str(job_id))
+        if vector is None:
+            return None
+        results = self._results(self.jobs.search(vector, k, exclude={str(job_id)}))
+        for result in results:
+            result["duplicate"] = result["similarity"] >= threshold
+        return results
+
+    def duplicates(self, threshold=DUPLICATE_THRESHOLD, k=5):
+        """Pairs of saved jobs whose vectors are at least `threshold` similar"""
+        self.sync()
+        pairs = []
+        for key in self.jobs.keys():
+            vector = self.jobs.get(key)
+            for other, score in self.jobs.search(vector, k, exclude={key}):
+                if score >= threshold and int(key) < int(other):
+                    pairs.append((int(key), int(other), round(score, 4)))
+        return sorted(pairs, key=lambda pair: -pair[2])
+
+    @staticmethod
+    def resume_sections_of(resume_text):
+        """Split a resume into paragraph groups of at least MIN_SECTION_CHARS characters"""
+        sections, current = [], ""
+        for paragraph in resume_text.split("\n\n"):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+            if len(current) >= MIN_SECTION_CHARS:
+                sections.append(current)
+                current = ""
+        if current:
+            sections.append(current)
+        return sections or [resume_text]
+
+    def _resume_section_vectors(self, resume_text):
+        """Section vectors of a resume, embedded once per distinct text while it stays in the LRU"""
+        digest = hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+        with self._resume_lock:
+            vectors = self._resume_vectors.get(digest)
+            if vectors is not None:
+                self._resume_vectors.move_to_end(digest)
+                return vectors
+        vectors = self.embedder.embed(self.resume_sections_of(resume_text))
+        with self._resume_lock:
+            self._resume_vectors[digest] = vectors
+            while len(self._resume_vectors) > self.resume_cache_size:
+                self._resume_vectors.popitem(last=False)
+        return vectors
+
+    def match_resume(self, resume_text, k=10, per_section=50):
+        """
+        Saved jobs most similar to a resume: each job scores its best
+        similarity to any resume section.
+        """
+        self.sync()
+        best = {}
+        for vector in self._resume_section_vectors(resume_text):
+            for job_key, score in self.jobs.search(vector, per_section):
+                best[job_key] = max(score, best.get(job_key, -1.0))
+        ranked = sorted(best.items(), key=lambda item: -item[1])[:k]
+        return self._results(ranked)
+
+    def stats(self):
+        return {
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "jobs": len(self.jobs),
+            "cached_resumes": len(self._resume_vectors),
+        }
+
+
+def benchmark(sizes=(1000, 10000, 100000), dim=256, queries=50, k=10):
+    """Query latency of exact search vs LSH, and LSH recall@k, on clustered random vectors"""
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    results = []
+    for size in sizes:
+        centers = _normalize(rng.standard_normal((max(size // 50, 1), dim)).astype(np.float32))
+        vectors = _normalize(centers[rng.integers(0, len(centers), size)]
+                             + 0.6 * rng.standard_normal((size, dim)).astype(np.float32) / np.sqrt(dim))
+        query_vectors = _normalize(vectors[rng.integers(0, size, queries)]
+                                   + 0.3 * rng.standard_normal((queries, dim)).astype(np.float32) / np.sqrt(dim))
+
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "index.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute("CREATE TABLE vectors (space TEXT, key TEXT, row INTEGER, updated_at REAL, PRIMARY KEY (space, key))")
+            conn.commit()
+            conn.close()
+            space = VectorSpace("bench", dim, directory, db_path)
+            space.put([str(i) for i in range(size)], vectors)
+
+            start = time.perf_counter()
+            exact = [set(np.argsort(-(vectors @ q))[:k]) for q in query_vectors]
+            exact_ms = (time.perf_counter() - start) / queries * 1000
+
+            start = time.perf_counter()
+            approximate = []
+            for q in query_vectors:
+                rows = np.fromiter(space._index.candidates(q), dtype=np.int64)
+                scores = np.asarray(space._array[rows]) @ q if len(rows) else np.zeros(0)
+                approximate.append(set(rows[np.argsort(-scores)[:k]]))
+            lsh_ms = (time.perf_counter() - start) / queries * 1000
+
+        recall = np.mean([len(a & e) / k for a, e in zip(approximate, exact)])
+        results.append({"size": size, "exact_ms": round(exact_ms, 2), "lsh_ms": round(lsh_ms, 2), "recall": round(float(recall), 3)})
+    return results
+
+
+embedding_index = EmbeddingIndex(job_store, create_embedder())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the job embedding index")
+    parser.add_argument("command", choices=["reembed", "duplicates", "bench"])
+    parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    if args.command == "reembed":
+        start = time.perf_counter()
+        count = embedding_index.reembed()
+        print(f"Re-embedded {count} jobs with {embedding_index.embedder.name} in {time.perf_counter() - start:.1f}s")
+    elif args.command == "duplicates":
+        for first, second, score in embedding_index.duplicates(args.threshold):
+            print(f"{first}\t{second}\t{score}")
+    else:
+        print(f"{'size':>8} {'exact ms':>9} {'lsh ms':>8} {'recall@10':>10}")
+        for result in benchmark(args.sizes):
+            print(f"{result['size']:>8} {result['exact_ms']:>9} {result['lsh_ms']:>8} {result['recall']:>10}")
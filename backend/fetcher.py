@@ -0,0 +1,251 @@
+"""
+Tiered Page Fetcher
+
+Fetches job postings over plain HTTP first, using a pooled requests.Session,
+and only escalates to a headless browser from the driver pool when the
+returned HTML does not contain a usable description. Domains that keep
+needing the browser are remembered so later requests skip the HTTP attempt.
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from driverPool import get_driver_pool
+from jobSites import get_domain, get_site_profile
+from pageReadiness import wait_for_page
+from parsedPage import ParsedPage, html_to_text
+
+# A description shorter than this is most likely a JS placeholder or a teaser
+MIN_DESCRIPTION_CHARS = int(os.getenv("FETCH_MIN_DESCRIPTION_CHARS", "200"))
+
+# After this many consecutive insufficient HTTP fetches a domain goes straight to the browser
+ESCALATION_THRESHOLD = int(os.getenv("FETCH_ESCALATION_THRESHOLD", "2"))
+
+# Browser-routed domains get one HTTP probe every this many fetches in case the site changed
+REPROBE_INTERVAL = int(os.getenv("FETCH_REPROBE_INTERVAL", "25"))
+
+HTTP_TIMEOUT = 10
+
+try:
+    import brotli  # noqa: F401  (lets urllib3 decode br responses)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide requests.Session with keep-alive connection pooling"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _session = session
+        return _session
+
+
+def http_get(url, etag=None, last_modified=None):
+    """
+    GET a page with the pooled session, conditionally when validators are given.
+    Returns the response for 200 and 304 answers, otherwise None.
+    """
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    try:
+        print(f"Fetching {url} using requests library...")
+        response = get_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+        if response.status_code in (200, 304):
+            print(f"Successfully fetched page with requests (status {response.status_code})")
+            return response
+        print(f"Failed to fetch with requests: Status code {response.status_code}")
+        return None
+    except Exception as e:
+        print(f"Error fetching with requests: {str(e)}")
+        return None
+
+
+def fetch_with_requests(url):
+    """
+    Fetch a webpage using the pooled requests session
+    Returns the page content as a ParsedPage
+    """
+    response = http_get(url)
+    if response is None or response.status_code != 200:
+        return None
+    return ParsedPage(response.text)
+
+
+def is_content_sufficient(page):
+    """Check whether a parsed page already contains a usable job description"""
+    if len(page.fields().get("description", "")) >= MIN_DESCRIPTION_CHARS:
+        return True
+
+    job_posting = page.json_ld_job()
+    if job_posting and len(html_to_text(job_posting.get("description") or "")) >= MIN_DESCRIPTION_CHARS:
+        return True
+
+    return False
+
+
+class DomainRouter:
+    """
+    Learns per domain whether plain HTTP is enough or the browser is needed.
+    Domains flagged `requires_js` in jobSites.SITE_PROFILES start out browser-routed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._domains = {}
+
+    def _state(self, domain):
+        return self._domains.setdefault(domain, {"failures": 0, "browser": False, "since_probe": 0})
+
+    def use_browser_first(self, url):
+        """Decide whether to skip the HTTP attempt for this URL"""
+        if get_site_profile(url).get("requires_js"):
+            return True
+
+        with self._lock:
+            state = self._state(get_domain(url))
+            if not state["browser"]:
+                return False
+            state["since_probe"] += 1
+            if state["since_probe"] >= REPROBE_INTERVAL:
+                state["since_probe"] = 0
+                return False
+            return True
+
+    def record_http(self, url, sufficient):
+        """Record the outcome of an HTTP attempt"""
+        with self._lock:
+            state = self._state(get_domain(url))
+            if sufficient:
+                state.update(failures=0, browser=False)
+            else:
+                state["failures"] += 1
+                if state["failures"] >= ESCALATION_THRESHOLD:
+                    state["browser"] = True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "domains": len(self._domains),
+                "browser_routed": sorted(d for d, s in self._domains.items() if s["browser"]),
+            }
+
+
+router = DomainRouter()
+
+_counters = {"http": 0, "browser": 0, "escalations": 0, "not_modified": 0}
+_counters_lock = threading.Lock()
+
+
+def _count(key):
+    with _counters_lock:
+        _counters[key] += 1
+
+
+def fetch_with_browser(url):
+    """
+    Load a page in a pooled headless browser
+    Returns the rendered page source
+    """
+    pool = get_driver_pool()
+    driver = pool.acquire()
+    broken = False
+    try:
+        driver.get(url)
+        wait_for_page(driver, url)  # Wait until the description renders or the page settles
+        return driver.page_source
+    except Exception:
+        broken = True
+        raise
+    finally:
+        pool.release(driver, broken=broken)
+
+
+def _http_result(response):
+    return {
+        "page": ParsedPage(response.text),
+        "html": response.text,
+        "source": "requests",
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+def fetch_page(url, etag=None, last_modified=None):
+    """
+    Fetch a job posting, escalating from HTTP to the browser only when needed.
+
+    Returns a dictionary with the parsed `page`, the raw `html`, the `source`
+    that produced it and, for HTTP responses, the `etag`/`last_modified`
+    validators. When validators are passed and the origin answers 304, the
+    result is just {"not_modified": True}. Raises if neither tier could fetch
+    the page.
+    """
+    result = None
+
+    if not router.use_browser_first(url):
+        response = http_get(url, etag, last_modified)
+        if response is not None and response.status_code == 304:
+            _count("not_modified")
+            return {"not_modified": True, "source": "requests"}
+
+        if response is not None:
+            result = _http_result(response)
+        sufficient = result is not None and is_content_sufficient(result["page"])
+        router.record_http(url, sufficient)
+        if sufficient:
+            _count("http")
+            return result
+        print("HTTP response has no usable description, escalating to browser...")
+        _count("escalations")
+
+    try:
+        html = fetch_with_browser(url)
+        _count("browser")
+        return {"page": ParsedPage(html), "html": html, "source": "browser"}
+    except Exception as browser_error:
+        print(f"Selenium error: {str(browser_error)}")
+
+    # Browser failed: keep whatever HTTP gave us, or try HTTP now if we skipped it
+    if result is None:
+        print("Falling back to requests library...")
+        response = http_get(url)
+        if response is not None and response.status_code == 200:
+            result = _http_result(response)
+    if result is None:
+        raise Exception("Failed to fetch page with both requests and Selenium")
+    _count("http")
+    return result
+
+
+def fetcher_stats():
+    """Counts of pages served by each tier plus the learned routing table"""
+    with _counters_lock:
+        stats = dict(_counters)
+    stats["routing"] = router.stats()
+    return stats
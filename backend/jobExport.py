@@ -0,0 +1,201 @@
+"""
+Job Export
+
+Streams saved jobs out of the job store as Excel, CSV or Parquet without
+holding the whole set in memory:
+
+- Excel rows go straight into xlsxwriter's `constant_memory` mode, which
+  flushes each row to a temporary file as soon as the next one starts.
+- CSV is generated in chunks of rows and can be sent as it is produced.
+- Parquet (only when pyarrow is installed) is written in record batches.
+
+Columns and their Excel widths are worked out from the first WIDTH_SAMPLE
+jobs instead of a pass over every row.
+"""
+
+import csv
+import io
+import itertools
+import json
+import os
+import tempfile
+
+import xlsxwriter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+PARQUET_AVAILABLE = pa is not None
+
+# Known job fields, in the order they appear in exports; other fields follow
+EXPORT_COLUMNS = [
+    "id", "timestamp", "title", "company", "location", "salary", "url",
+    "requirements", "responsibilities", "keywords", "description",
+]
+LIST_COLUMNS = {"requirements", "responsibilities", "keywords"}
+
+WIDTH_SAMPLE = 200
+MAX_COLUMN_WIDTH = 50
+EXCEL_CELL_LIMIT = 32767  # characters Excel allows in one cell
+CHUNK_SIZE = 64 * 1024
+CSV_ROWS_PER_CHUNK = 500
+
+FORMATS = {
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "job_postings.xlsx"),
+    "csv": ("text/csv; charset=utf-8", "job_postings.csv"),
+    "parquet": ("application/vnd.apache.parquet", "job_postings.parquet"),
+}
+
+
+def format_cell(value):
+    """Render a job field as cell text; lists become bulleted lines"""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "\n• " + "\n• ".join(str(item) for item in value) if value else ""
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value if isinstance(value, (int, float, str)) else str(value)
+
+
+def _peek(jobs, count=WIDTH_SAMPLE):
+    """Return (first `count` jobs, iterator over all jobs)"""
+    jobs = iter(jobs)
+    sample = list(itertools.islice(jobs, count))
+    return sample, itertools.chain(sample, jobs)
+
+
+def columns_for(sample):
+    """Export columns: the known fields present in the sample, then any others"""
+    seen = {key for job in sample for key in job}
+    columns = [column for column in EXPORT_COLUMNS if column in seen]
+    for job in sample:
+        for key in job:
+            if key not in columns:
+                columns.append(key)
+    return columns
+
+
+def estimate_widths(sample, columns):
+    """Column widths from the sample, like the old max-length scan but bounded"""
+    widths = []
+    for column in columns:
+        longest = max((len(str(format_cell(job.get(column)))) for job in sample), default=0)
+        widths.append(min(max(longest, len(column)) + 2, MAX_COLUMN_WIDTH))
+    return widths
+
+
+def write_xlsx(jobs, path):
+    """Write jobs to an .xlsx file at `path`; returns the number of rows written"""
+    sample, jobs = _peek(jobs)
+    columns = columns_for(sample)
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "strings_to_urls": False})
+    try:
+        worksheet = workbook.add_worksheet("Job Postings")
+        header = workbook.add_format({"bold": True})
+        for i, width in enumerate(estimate_widths(sample, columns)):
+            worksheet.set_column(i, i, width)
+        worksheet.write_row(0, 0, columns, header)
+
+        rows = 0
+        for rows, job in enumerate(jobs, start=1):
+            for i, column in enumerate(columns):
+                value = format_cell(job.get(column))
+                if isinstance(value, str) and len(value) > EXCEL_CELL_LIMIT:
+                    value = value[:EXCEL_CELL_LIMIT]
+                worksheet.write(rows, i, value)
+    finally:
+        workbook.close()
+    return rows
+
+
+def write_parquet(jobs, path, batch_size=1000):
+    """Write jobs to a Parquet file at `path` in record batches; returns the number of rows written"""
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    sample, jobs = _peek(jobs)
+    columns = columns_for(sample)
+    schema = pa.schema([
+        (column, pa.int64() if column == "id" else pa.list_(pa.string()) if column in LIST_COLUMNS else pa.string())
+        for column in columns
+    ])
+
+    def convert(column, value):
+        if column == "id":
+            return value
+        if column in LIST_COLUMNS:
+            return [str(item) for item in value] if isinstance(value, list) else None
+        return None if value is None else str(format_cell(value))
+
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        while True:
+            batch = list(itertools.islice(jobs, batch_size))
+            if not batch:
+                break
+            arrays = [
+                pa.array([convert(column, job.get(column)) for job in batch], type=schema.field(column).type)
+                for column in columns
+            ]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            rows += len(batch)
+    return rows
+
+
+def iter_csv(jobs):
+    """Yield CSV text in chunks of CSV_ROWS_PER_CHUNK rows, header first"""
+    sample, jobs = _peek(jobs)
+    columns = columns_for(sample)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for i, job in enumerate(jobs, start=1):
+        writer.writerow([format_cell(job.get(column)) for column in columns])
+        if i % CSV_ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _stream_file(path):
+    """Yield a file in chunks, deleting it once it has been read (or the client left)"""
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.remove(path)
+
+
+def export_jobs(jobs, fmt):
+    """
+    Export jobs in the given format ("xlsx", "csv" or "parquet").
+    Returns a generator of response body chunks.
+    """
+    if fmt == "csv":
+        return (chunk.encode("utf-8") for chunk in iter_csv(jobs))
+
+    write = {"xlsx": write_xlsx, "parquet": write_parquet}.get(fmt)
+    if write is None:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    # Both formats end in a footer/zip directory, so they are built in a temporary file first
+    fd, path = tempfile.mkstemp(suffix="." + fmt)
+    os.close(fd)
+    try:
+        write(jobs, path)
+    except BaseException:
+        os.remove(path)
+        raise
+    return _stream_file(path)
@@ -0,0 +1,156 @@
+"""
+Job Posting Text Extraction
+
+Precompiled patterns for pulling salary, requirements and responsibilities
+out of a posting's text, and a skill matcher that finds every known skill
+in a single pass over the text no matter how large the vocabulary grows.
+
+Skills are also indexed under their other spellings from SKILL_ALIASES,
+so "k8s" in a posting finds Kubernetes and "Machine Learning" finds a
+vocabulary skill written "ML". The text itself is matched as written.
+
+The skill vocabulary is COMMON_SKILLS plus, if SKILLS_FILE points at one,
+a text file with one skill per line (blank lines and # comments ignored).
+"""
+
+import os
+import re
+
+SALARY_PATTERN = re.compile(
+    r'\$[\d,.]+\s*(?:to|–|-)\s*\$[\d,.]+|\$[\d,.]+\s*(?:per|an?|/)\s*(?:hour|year|month|annum|yr)'
+)
+
+
+def _section_patterns(headings):
+    """One pattern per heading matching the heading and everything up to the next blank line"""
+    return [
+        re.compile(re.escape(heading) + r":?.*?(?=\n\n|\Z)", re.DOTALL | re.IGNORECASE)
+        for heading in headings
+    ]
+
+
+REQUIREMENTS_PATTERNS = _section_patterns(["Requirements", "Qualifications", "What You'll Need", "Skills"])
+RESPONSIBILITIES_PATTERNS = _section_patterns(["Responsibilities", "Duties", "What You'll Do", "The Role"])
+
+# Bullet points or numbered items inside a section
+BULLET_PATTERN = re.compile(r'[•\-\*\d+\.]\s*(.*?)(?=\n[•\-\*\d+\.]|\Z)')
+
+# Lowercase word tokens that keep skill punctuation intact: c++, c#, node.js
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+COMMON_SKILLS = [
+    "Python", "Java", "JavaScript", "HTML", "CSS", "SQL", "React", "Angular",
+    "Node.js", "PHP", "C#", "C++", "Ruby", "Swift", "Kotlin", "AWS", "Azure",
+    "Docker", "Kubernetes", "Excel", "Word", "PowerPoint", "Tableau", "Power BI",
+    "Agile", "Scrum", "Project Management", "Marketing", "Sales", "Communication",
+    "Leadership", "Management", "Customer Service", "Accounting", "Finance"
+]
+
+
+# Alternative spellings of a skill -> its canonical spelling
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "golang": "go",
+    "postgres": "postgresql",
+    "py": "python",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "gcp": "google cloud",
+}
+
+
+def extract_salary(text):
+    """Return the first salary range or rate mentioned in the text, if any"""
+    match = SALARY_PATTERN.search(text)
+    return match.group(0) if match else None
+
+
+def extract_section_items(text, patterns):
+    """
+    Find the first section whose heading matches (in pattern order) and
+    return its bullet items
+    """
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            items = BULLET_PATTERN.findall(match.group(0))
+            return [item.strip() for item in items if item.strip()]
+    return []
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _alias_spellings():
+    """Token tuple of each spelling in SKILL_ALIASES -> every spelling of the same term"""
+    groups = {}
+    for alias, canonical in SKILL_ALIASES.items():
+        key = tuple(tokenize(canonical))
+        groups.setdefault(key, {key}).add(tuple(tokenize(alias)))
+    return {spelling: group for group in groups.values() for spelling in group}
+
+
+ALIAS_SPELLINGS = _alias_spellings()
+
+
+class SkillMatcher:
+    """
+    Matches a skill vocabulary against text in one pass over its tokens.
+
+    Skills are indexed by their first token, so each text token costs one
+    dictionary lookup plus a check of the few multi-word skills starting
+    with it; the vocabulary size does not affect the scan.
+    """
+
+    def __init__(self, skills):
+        self.skills = []
+        self._by_first = {}
+        self._seen = set()
+        for skill in skills:
+            self.add(skill)
+
+    def add(self, skill):
+        tokens = tuple(tokenize(skill))
+        if not tokens or tokens in self._seen:
+            return
+        self._seen.add(tokens)
+        index = len(self.skills)
+        self.skills.append(skill)
+        for spelling in ALIAS_SPELLINGS.get(tokens, (tokens,)):
+            self._by_first.setdefault(spelling[0], []).append((spelling, index))
+
+    def find(self, text):
+        """Return the skills mentioned in the text, in vocabulary order"""
+        tokens = tokenize(text)
+        found = set()
+        for i, token in enumerate(tokens):
+            for phrase, index in self._by_first.get(token, ()):
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    found.add(index)
+        return [self.skills[index] for index in sorted(found)]
+
+
+def load_skills_file(path):
+    """Read one skill per line, skipping blank lines and # comments"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _build_skill_matcher():
+    skills = list(COMMON_SKILLS)
+    skills_file = os.getenv("SKILLS_FILE")
+    if skills_file:
+        try:
+            skills.extend(load_skills_file(skills_file))
+        except OSError as e:
+            print(f"Could not load skills file {skills_file}: {str(e)}")
+    return SkillMatcher(skills)
+
+
+skill_matcher = _build_skill_matcher()
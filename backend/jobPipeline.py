@@ -0,0 +1,159 @@
+"""
+Job Pipeline
+
+Scrape a job posting and enrich it with an AI model, shared by the Flask
+routes, the background scrape queue and the batch scraper CLI. Importing
+it does not start the server or its background threads.
+"""
+
+import json
+
+from aiSummary import stream_ai_summary
+from jobStore import job_store
+from scrapeCache import scrape_cache
+from scraper import scrape_job_posting
+from streaming import parse_json_response
+
+
+def save_job_data(job_data):
+    """Save job data to the job store and return its ID"""
+    return job_store.save(job_data)
+
+
+def scrape_and_enrich(url, model, progress=None):
+    """
+    Scrape a job posting URL and enhance it with the selected AI model.
+    `progress` is called with each pipeline stage as it completes
+    ("fetched", "parsed", "enriched", or "cached" for cache hits).
+    Returns the job data dictionary; raises if every fallback failed.
+    """
+    report = progress or (lambda stage: None)
+    
+    try:
+        print(f"Starting to scrape URL: {url}")
+        
+        # Same URL already analyzed with this model and still fresh
+        cached_result = scrape_cache.get_merged(url, model)
+        if cached_result:
+            print("Returning cached analysis")
+            report("cached")
+            return cached_result
+        
+        # Try to scrape the job posting
+        job_data = scrape_job_posting(url, progress=report)
+        print(f"Scraped job data: {job_data.keys()}")
+        
+        # A stale page that revalidated as unchanged keeps its previous analysis
+        cached_result = scrape_cache.get_merged(url, model, count_miss=False)
+        if cached_result:
+            print("Page unchanged, returning cached analysis")
+            report("cached")
+            return cached_result
+        
+        # Always enhance with AI API if we have a description
+        if job_data.get("description"):
+            print(f"Enhancing scraped data with {model}...")
+            
+            # Use selected model to analyze the description
+            ai_stream = stream_ai_summary(job_data["description"], model=model)
+            summary = ""
+            for chunk in ai_stream:
+                if hasattr(chunk.choices[0].delta, 'content') and chunk.choices[0].delta.content:
+                    delta = chunk.choices[0].delta.content
+                    summary += delta
+            
+            # Try to parse the AI-generated summary
+            try:
+                # Extract JSON object if embedded in text
+                ai_data = parse_json_response(summary)
+                
+                print("AI data:", ai_data.keys() if isinstance(ai_data, dict) else "Not a dictionary")
+                
+                # Merge AI data with scraped data, but keep scraped data if it's already populated
+                if isinstance(ai_data, dict):
+                    for key in ai_data:
+                        # Only use AI data if the field is empty or minimal
+                        if key in job_data:
+                            if isinstance(job_data[key], list) and len(job_data[key]) == 0:
+                                # Empty lists (requirements, responsibilities, keywords)
+                                job_data[key] = ai_data[key]
+                            elif isinstance(job_data[key], str) and (not job_data[key] or job_data[key] in ["Unknown Title", "Unknown Company", "Unknown Location", "Not specified"]):
+                                # Empty or default string values
+                                job_data[key] = ai_data[key]
+            except Exception as e:
+                print(f"Error processing AI data: {str(e)}")
+                # If we can't get structured data from the AI, but still have an unstructured description,
+                # try one more time with a more explicit prompt
+                if not job_data["requirements"] or not job_data["responsibilities"]:
+                    try:
+                        print("Trying more explicit prompt for requirements/responsibilities...")
+                        # Create a more explicit prompt
+                        explicit_prompt = f"Extract the following information from this job posting:\n\n{job_data['description']}\n\nPlease return ONLY a JSON object with these keys: title, company, requirements (array), responsibilities (array), keywords (array), location, salary."
+                        
+                        # Call the AI again with this explicit prompt
+                        from aiSummary import client
+                        response = client.chat.completions.create(
+                            model=model,  # Use the selected model here too
+                            messages=[
+                                {"role": "system", "content": "You are an expert job posting analyzer."},
+                                {"role": "user", "content": explicit_prompt},
+                            ],
+                            response_format={"type": "json_object"},
+                        )
+                        
+                        ai_json = json.loads(response.choices[0].message.content)
+                        print("Got structured data from explicit prompt")
+                        
+                        # Fill in missing data
+                        for key in ai_json:
+                            if key in job_data:
+                                if isinstance(job_data[key], list) and len(job_data[key]) == 0:
+                                    job_data[key] = ai_json[key]
+                                elif isinstance(job_data[key], str) and (not job_data[key] or job_data[key] in ["Unknown Title", "Unknown Company", "Unknown Location", "Not specified"]):
+                                    job_data[key] = ai_json[key]
+                    except Exception as e2:
+                        print(f"Error in secondary AI attempt: {str(e2)}")
+        
+        # Final verification to ensure we have some minimum data
+        if not job_data.get("requirements") or len(job_data["requirements"]) == 0:
+            job_data["requirements"] = ["No specific requirements found. Please review the full job description."]
+        
+        if not job_data.get("responsibilities") or len(job_data["responsibilities"]) == 0:
+            job_data["responsibilities"] = ["No specific responsibilities found. Please review the full job description."]
+        
+        if not job_data.get("keywords") or len(job_data["keywords"]) == 0:
+            job_data["keywords"] = ["Skills", "Experience", "Communication"]
+        
+        # Add source URL to the job data
+        job_data["url"] = url
+        scrape_cache.put_merged(url, model, job_data)
+        report("enriched")
+        
+        print("Job analysis complete, returning data")
+        return job_data
+    except Exception as scrape_error:
+        print(f"Error during scraping process: {str(scrape_error)}")
+        
+        # Try a direct AI analysis as a last resort
+        try:
+            from aiSummary import client
+            
+            print(f"Attempting direct URL analysis with {model}")
+            response = client.chat.completions.create(
+                model=model,  # Use the selected model
+                messages=[
+                    {"role": "system", "content": "You are an expert job posting analyzer."},
+                    {"role": "user", "content": f"Analyze this job posting URL: {url}\n\nExtract and return a JSON object with these keys: title, company, requirements (array), responsibilities (array), keywords (array), location, salary. If you can't access the URL directly, make educated guesses based on the URL itself."},
+                ],
+                response_format={"type": "json_object"},
+            )
+            
+            result = json.loads(response.choices[0].message.content)
+            # Add source URL to the result
+            result["url"] = url
+            print("Successfully got direct analysis")
+            report("enriched")
+            return result
+        except Exception as ai_error:
+            print(f"Final fallback also failed: {str(ai_error)}")
+            raise Exception(f'Failed to scrape job posting: {str(scrape_error)}. Additional error: {str(ai_error)}')
@@ -0,0 +1,259 @@
+"""
+Job Ranker
+
+Ranks every saved job against one resume in a single sparse matrix-vector
+product instead of one LLM call per job.
+
+Each job becomes a row of a SciPy CSR job-term matrix of term counts over
+its title, keywords, requirements, responsibilities and description,
+normalized the same way as the resume matcher. The resume is vectorized
+once and jobs are scored by BM25 (default) or TF-IDF cosine similarity;
+the top K are explained with the job keywords the resume does and does not
+contain.
+
+The matrix is kept up to date incrementally: before each ranking the
+ranker pulls only the jobs saved or changed since its last sync (including
+saves made by other worker processes) and appends their rows. A changed
+job's old row is zeroed in place and left as a tombstone; the rows are
+compacted once tombstones make up a quarter of the matrix.
+"""
+
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from jobStore import job_store
+from resumeMatcher import ResumeProfile, content_terms, job_keywords, normalize
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Re-read changes this many seconds before the last sync to absorb clock skew between workers
+SYNC_OVERLAP = 5.0
+
+# Drop replaced rows once there are more than this many and they are this share of all rows
+COMPACT_MIN_TOMBSTONES = 64
+COMPACT_RATIO = 0.25
+
+
+def job_terms(job):
+    """Normalized terms describing a job; the title and keywords count twice"""
+    parts = [job.get("title") or ""] * 2
+    parts += [keyword for keyword in job.get("keywords") or [] if isinstance(keyword, str)] * 2
+    for field in ("requirements", "responsibilities"):
+        parts += [item for item in job.get(field) or [] if isinstance(item, str)]
+    parts.append(job.get("description") or "")
+    return content_terms("\n".join(parts))
+
+
+class JobRanker:
+    """
+    Parameters:
+        store: JobStore to index
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._vocabulary = {}
+        self._document_frequency = []
+        self._row_of = {}        # job id -> row index
+        self._rows = []          # row index -> (column array, count array); None for replaced rows
+        self._jobs = []          # row index -> summary used in results
+        self._updated_at = {}    # job id -> updated_at of the indexed version
+        self._synced_at = 0.0
+        self._matrix = None      # CSR term counts, rebuilt lazily
+        self._weights = {}       # method -> weighted matrix for the current _matrix
+        self._pending = 0        # rows appended since the matrix was built
+        self._replaced = []      # rows replaced since the matrix was built, to zero in place
+        self._tombstones = 0     # None entries in _rows
+
+    def _column(self, term):
+        column = self._vocabulary.get(term)
+        if column is None:
+            column = len(self._vocabulary)
+            self._vocabulary[term] = column
+            self._document_frequency.append(0)
+        return column
+
+    def _index_job(self, job):
+        """Add or replace one job's row (caller holds the lock)"""
+        counts = {}
+        for term in job_terms(job):
+            column = self._column(term)
+            counts[column] = counts.get(column, 0) + 1
+        columns = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+
+        previous = self._row_of.get(job["id"])
+        if previous is not None:
+            for column in self._rows[previous][0]:
+                self._document_frequency[column] -= 1
+            self._rows[previous] = None
+            self._jobs[previous] = None
+            self._replaced.append(previous)
+            self._tombstones += 1
+
+        for column in columns:
+            self._document_frequency[column] += 1
+        self._row_of[job["id"]] = len(self._rows)
+        self._rows.append((columns, values))
+        self._jobs.append({
+            "id": job["id"],
+            "title": job.get("title"),
+            "company": job.get("company"),
+            "keywords": job_keywords(job),
+        })
+        self._pending += 1
+
+    def sync(self):
+        """Index jobs saved or updated since the last sync; returns how many changed"""
+        with self._lock:
+            since = max(0.0, self._synced_at - SYNC_OVERLAP)
+            changes = {
+                job_id: updated_at
+                for job_id, updated_at in self.store.updated_since(since)
+                if self._updated_at.get(job_id) != updated_at
+            }
+            for job in self.store.get_many(changes):
+                self._index_job(job)
+            for job_id, updated_at in changes.items():
+                self._updated_at[job_id] = updated_at
+                self._synced_at = max(self._synced_at, updated_at)
+            return len(changes)
+
+    def _build_row_block(self, start):
+        """CSR matrix of the rows from `start` on; replaced rows stay as empty rows"""
+        rows = self._rows[start:]
+        lengths = [0 if row is None else len(row[0]) for row in rows]
+        live = [row for row in rows if row is not None]
+        return sparse.csr_matrix(
+            (
+                np.concatenate([row[1] for row in live]) if live else np.zeros(0, dtype=np.float32),
+                np.concatenate([row[0] for row in live]) if live else np.zeros(0, dtype=np.int32),
+                np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            ),
+            shape=(len(rows), len(self._vocabulary)),
+        )
+
+    def _compact(self):
+        """Drop replaced rows and renumber the rest (caller holds the lock)"""
+        self._rows = [row for row in self._rows if row is not None]
+        self._jobs = [job for job in self._jobs if job is not None]
+        self._row_of = {job["id"]: row for row, job in enumerate(self._jobs)}
+        self._tombstones = 0
+        self._matrix = None
+
+    def _current_matrix(self):
+        """The term-count matrix, zeroing replaced rows and appending new ones (caller holds the lock)"""
+        if self._tombstones > max(COMPACT_MIN_TOMBSTONES, COMPACT_RATIO * len(self._rows)):
+            self._compact()
+        if self._matrix is None:
+            self._matrix = self._build_row_block(0)
+        elif self._pending or self._replaced:
+            base = self._matrix
+            for row in self._replaced:
+                if row < base.shape[0]:  # rows not in the matrix yet are built empty
+                    base.data[base.indptr[row]:base.indptr[row + 1]] = 0
+            if self._pending:
+                base.resize((base.shape[0], len(self._vocabulary)))
+                self._matrix = sparse.vstack([base, self._build_row_block(base.shape[0])], format="csr")
+        else:
+            return self._matrix
+        self._pending = 0
+        self._replaced = []
+        self._weights = {}
+        return self._matrix
+
+    def _idf(self):
+        n = max(len(self._row_of), 1)
+        df = np.asarray(self._document_frequency, dtype=np.float32)
+        return np.log(1 + (n - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    def _weighted(self, method):
+        """Cached document weights for the current matrix: BM25 term saturation or L2-normalized TF-IDF"""
+        weights = self._weights.get(method)
+        if weights is not None:
+            return weights
+
+        matrix = self._matrix
+        lengths = np.asarray(matrix.sum(axis=1)).ravel()
+        if method == "bm25":
+            live = lengths[lengths > 0]
+            average = live.mean() if live.size else 1.0
+            row_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average)
+            row_of_value = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+            tf = matrix.data
+            data = tf * (BM25_K1 + 1) / (tf + row_norm[row_of_value])
+            weights = sparse.csr_matrix((data.astype(np.float32), matrix.indices, matrix.indptr), shape=matrix.shape)
+        else:
+            weights = matrix.multiply(self._idf()).tocsr()
+            norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+            norms[norms == 0] = 1.0
+            weights = sparse.diags(1 / norms).dot(weights).tocsr()
+        self._weights[method] = weights
+        return weights
+
+    def rank(self, resume_text, top_k=10, method="bm25"):
+        """
+        The `top_k` saved jobs that best fit the resume.
+
+        Returns {"results": [...], "jobs_ranked": n} where each result has
+        the job's id, title, company, score and matched/missing keywords.
+        """
+        if method not in ("bm25", "cosine"):
+            raise ValueError("method must be 'bm25' or 'cosine'")
+        self.sync()
+
+        resume = ResumeProfile(resume_text)
+        with self._lock:
+            matrix = self._current_matrix()
+            if matrix.shape[0] == 0:
+                return {"results": [], "jobs_ranked": 0}
+            weights = self._weighted(method)
+            idf = self._idf()
+            jobs = list(self._jobs)
+
+            terms = set(normalize(resume_text))
+            columns = [self._vocabulary[term] for term in terms if term in self._vocabulary]
+            query = np.zeros(matrix.shape[1], dtype=np.float32)
+            query[columns] = idf[columns]
+            if method == "cosine":
+                norm = np.linalg.norm(query)
+                query = query / norm if norm else query
+
+        scores = weights.dot(query)
+        live = np.array([job is not None for job in jobs])
+        scores = np.where(live, scores, -np.inf)
+
+        top_k = max(1, min(int(top_k), int(live.sum())))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for row in top:
+            job = jobs[row]
+            matched = [keyword for keyword in job["keywords"] if resume.contains_phrase(normalize(keyword))]
+            results.append({
+                "id": job["id"],
+                "title": job["title"],
+                "company": job["company"],
+                "score": round(float(scores[row]), 4),
+                "matchedKeywords": matched,
+                "missingKeywords": [keyword for keyword in job["keywords"] if keyword not in matched],
+            })
+        return {"results": results, "jobs_ranked": int(live.sum())}
+
+    def stats(self):
+        with self._lock:
+            return {
+                "jobs": len(self._row_of),
+                "terms": len(self._vocabulary),
+                "rows": len(self._rows),
+                "tombstones": self._tombstones,
+                "synced_at": self._synced_at,
+            }
+
+
+job_ranker = JobRanker(job_store)
@@ -0,0 +1,77 @@
+"""
+Job Board Site Profiles
+
+CSS selectors for the fields we extract from job postings, plus per-domain
+settings (which elements mean the page is ready, how long to wait for them).
+The scraper and the page readiness checks share these so a selector only
+has to be updated in one place when a job board changes its markup.
+"""
+
+from urllib.parse import urlparse
+
+# Candidate selectors, in priority order
+TITLE_SELECTORS = [
+    'h1[data-testid="jobsearch-JobInfoHeader-title"]',  # Indeed
+    'h1.top-card-layout__title',  # LinkedIn
+    'h1.jobsearch-JobInfoHeader-title',  # Indeed alternative
+    'h1',  # Generic fallback
+]
+
+COMPANY_SELECTORS = [
+    'div[data-testid="inlineHeader-companyName"]',  # Indeed
+    'a.topcard__org-name-link',  # LinkedIn
+    'div.company-name',  # Generic
+    'div.JobInfoHeader-company-location',  # Alternative
+]
+
+LOCATION_SELECTORS = [
+    'div[data-testid="inlineHeader-companyLocation"]',  # Indeed
+    'span.topcard__flavor--bullet',  # LinkedIn
+    'div.location',  # Generic
+]
+
+DESCRIPTION_SELECTORS = [
+    'div#jobDescriptionText',  # Indeed
+    'div.description__text',  # LinkedIn
+    'div.jobDetailsHeader-descriptionDetails',  # Other
+    'div.job__description',  # Greenhouse
+    'div[data-qa="job-description"]',  # Lever
+]
+
+# Per-domain settings. `ready_selectors` are the elements whose appearance
+# means the posting has rendered; `timeout` is the total wait budget in seconds;
+# `requires_js` sends the domain straight to the browser instead of trying HTTP.
+SITE_PROFILES = {
+    "indeed.com": {
+        "ready_selectors": ['div#jobDescriptionText'],
+        "timeout": 8,
+        "network_idle_ms": 500,
+        "requires_js": True,
+    },
+    "linkedin.com": {
+        "ready_selectors": ['div.description__text'],
+        "timeout": 8,
+        "network_idle_ms": 500,
+    },
+}
+
+DEFAULT_PROFILE = {
+    "ready_selectors": DESCRIPTION_SELECTORS,
+    "timeout": 6,
+    "network_idle_ms": 500,
+}
+
+
+def get_domain(url):
+    """Return the lowercase host of a URL without a leading www."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def get_site_profile(url):
+    """Return the settings for the job board a URL belongs to (subdomains included)"""
+    domain = get_domain(url)
+    for site, profile in SITE_PROFILES.items():
+        if domain == site or domain.endswith("." + site):
+            return profile
+    return DEFAULT_PROFILE
@@ -0,0 +1,603 @@
+"""
+Job Store
+
+Persistent storage for saved job postings, replacing the in-memory list in
+server.py. The default backend is SQLite in WAL mode, which lets several
+Gunicorn workers read concurrently while writes are serialized by SQLite's
+own file lock (each write runs in a BEGIN IMMEDIATE transaction, and
+connections wait up to JOB_STORE_BUSY_TIMEOUT ms for the lock).
+
+Jobs are keyed on their normalized URL, so saving the same posting twice
+updates the existing row instead of adding a duplicate. Requirements,
+responsibilities and keywords are stored in their own tables as well as in
+the job's JSON so they can be filtered and indexed.
+
+Backends are pluggable: subclass JobStore and register it in BACKENDS, then
+select it with JOB_STORE_BACKEND.
+
+When the SQLite build has FTS5, jobs are also indexed for full-text search
+(title, company, description, requirements and keywords) as they are saved;
+search() ranks matches with BM25 and returns highlights and keyword facets.
+
+Import an existing JSON dump (e.g. saved from /get_saved_jobs) with:
+    python jobStore.py import saved_jobs.json
+"""
+
+import base64
+import html
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from scrapeCache import DATA_DIR, normalize_url
+
+# Columns copied out of the job JSON so they can be indexed
+JOB_COLUMNS = ["url", "title", "company", "location", "salary", "description"]
+
+# Columns list views can ask for without loading the job JSON
+SUMMARY_COLUMNS = ["id", "timestamp", "url", "title", "company", "location", "salary"]
+
+# Allowed sort keys and the column each sorts on
+SORT_COLUMNS = {"timestamp": "timestamp", "title": "title", "company": "company", "id": "id"}
+MAX_PAGE_SIZE = 500
+
+# Full-text index columns and their BM25 weights
+FTS_COLUMNS = {"title": 5.0, "company": 3.0, "description": 1.0, "requirements": 2.0, "keywords": 3.0}
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    {', '.join(FTS_COLUMNS)},
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+FACET_SAMPLE_SIZE = 2000
+SEARCH_TERM_PATTERN = re.compile(r"\w[\w+#.-]*", re.UNICODE)
+# Private-use characters FTS5 wraps matches in; they become <mark> tags after the text is escaped
+MATCH_START, MATCH_END = "\ue000", "\ue001"
+
+# List fields stored one row per item, with the kind they are stored under
+ITEM_FIELDS = {"requirements": "requirement", "responsibilities": "responsibility"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url_key TEXT UNIQUE,
+    url TEXT,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    salary TEXT,
+    description TEXT,
+    data TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_jobs_title ON jobs (title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_jobs_timestamp ON jobs (timestamp);
+CREATE INDEX IF NOT EXISTS idx_jobs_url ON jobs (url);
+CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (updated_at);
+
+CREATE TABLE IF NOT EXISTS requirements (
+    job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_requirements_job ON requirements (job_id, kind, position);
+
+CREATE TABLE IF NOT EXISTS keywords (
+    job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    keyword TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS idx_keywords_keyword ON keywords (keyword);
+CREATE INDEX IF NOT EXISTS idx_keywords_job ON keywords (job_id);
+"""
+
+
+class JobStore(ABC):
+    """Interface every job store backend implements"""
+
+    name = None
+
+    @abstractmethod
+    def save(self, job_data):
+        """Store a job (updating the existing one with the same URL) and return its ID"""
+
+    @abstractmethod
+    def get(self, job_id):
+        """The job with this ID, or None"""
+
+    @abstractmethod
+    def list_jobs(self):
+        """Every saved job, oldest first"""
+
+    @abstractmethod
+    def updated_since(self, updated_at):
+        """
+        (job_id, updated_at) pairs for jobs saved or updated after
+        `updated_at` (a time.time() value), oldest change first. Lets
+        in-process indexes catch up with saves made by other workers.
+        """
+
+    def get_many(self, job_ids):
+        """The jobs with these IDs (missing ones are skipped)"""
+        return [job for job in (self.get(job_id) for job_id in job_ids) if job is not None]
+
+    @abstractmethod
+    def query_jobs(self, company=None, keyword=None, date_from=None, date_to=None, q=None,
+                   sort="timestamp", order="desc", limit=50, cursor=None, fields=None):
+        """
+        One page of saved jobs matching the filters.
+
+        Parameters:
+            company: Company name (case-insensitive exact match)
+            keyword: Job keyword (case-insensitive exact match)
+            date_from, date_to: Inclusive bounds on the save time ("YYYY-MM-DD" or full timestamp)
+            q: Free text matched against title, company and description
+            sort: One of SORT_COLUMNS; ties are broken by ID
+            order: "asc" or "desc"
+            limit: Page size, capped at MAX_PAGE_SIZE
+            cursor: `next_cursor` from the previous page
+            fields: Job fields to return (all when None); "id" is always included
+
+        Returns {"jobs": [...], "next_cursor": str or None}. Raises ValueError
+        for invalid arguments.
+        """
+
+    def iter_jobs(self, batch_size=500, **filters):
+        """Yield every job matching query_jobs() filters, oldest first, one page at a time"""
+        cursor = None
+        while True:
+            page = self.query_jobs(sort="id", order="asc", limit=batch_size, cursor=cursor, **filters)
+            yield from page["jobs"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+
+    @abstractmethod
+    def search(self, q, keyword=None, limit=20, offset=0, facet_limit=20):
+        """
+        Full-text search ranked by relevance. Every query term must match;
+        the last term also matches as a prefix ("pyth" finds "python").
+
+        Returns {"total", "results", "facets"} where each result carries
+        the job's summary columns, `title_highlight`, a description
+        `snippet` (both HTML-escaped, with matches wrapped in <mark>) and
+        its `score`.
+        facets["keywords"] counts keywords across the matches, or across
+        the most recent FACET_SAMPLE_SIZE of them when facets["sampled"].
+        """
+
+    @abstractmethod
+    def count(self):
+        """Number of saved jobs"""
+
+    def stats(self):
+        return {"backend": self.name, "jobs": self.count()}
+
+    def import_jobs(self, jobs):
+        """Save many jobs (e.g. from a JSON dump); returns the number stored"""
+        stored = 0
+        for job in jobs:
+            if isinstance(job, dict):
+                job = {key: value for key, value in job.items() if key != "id"}
+                self.save(job)
+                stored += 1
+        return stored
+
+    def import_json(self, path):
+        """Import a JSON file holding a list of jobs or {"jobs": [...]}"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("jobs", [])
+        return self.import_jobs(data)
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Parameters:
+        path: Database file (created if missing)
+        busy_timeout: Milliseconds a connection waits for another writer
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path, busy_timeout=5000):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            # Rank matches with column-weighted BM25
+            weights = ", ".join(str(weight) for weight in FTS_COLUMNS.values())
+            conn.execute("INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('rank', ?)", (f"bm25({weights})",))
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search disabled (SQLite lacks FTS5): {str(e)}")
+            self.fts = False
+        if self.fts:
+            self._backfill_fts()
+
+    def _connection(self):
+        """One connection per thread; sqlite3 connections must not be shared between threads"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout / 1000, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout)}")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, operation):
+        """Run operation(conn) inside a BEGIN IMMEDIATE transaction"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = operation(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def save(self, job_data):
+        url = job_data.get("url")
+        url_key = normalize_url(url) if isinstance(url, str) and url.strip() else None
+
+        def operation(conn):
+            now = time.time()  # taken under the write lock so updated_since() sees commits in order
+            existing = None
+            if url_key is not None:
+                existing = conn.execute(
+                    "SELECT id, timestamp FROM jobs WHERE url_key = ?", (url_key,)
+                ).fetchone()
+
+            timestamp = existing["timestamp"] if existing else time.strftime("%Y-%m-%d %H:%M:%S")
+            data = {key: value for key, value in job_data.items() if key not in ("id", "timestamp")}
+            # Empty strings rather than NULLs keep sorting and cursors on these columns simple
+            columns = [_as_text(job_data.get(column)) or "" for column in JOB_COLUMNS]
+
+            if existing:
+                job_id = existing["id"]
+                conn.execute(
+                    f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in JOB_COLUMNS)}, "
+                    "data = ?, updated_at = ? WHERE id = ?",
+                    columns + [json.dumps(data), now, job_id],
+                )
+                conn.execute("DELETE FROM requirements WHERE job_id = ?", (job_id,))
+                conn.execute("DELETE FROM keywords WHERE job_id = ?", (job_id,))
+            else:
+                cursor = conn.execute(
+                    f"INSERT INTO jobs (url_key, {', '.join(JOB_COLUMNS)}, data, timestamp, updated_at) "
+                    f"VALUES (?, {', '.join('?' for _ in JOB_COLUMNS)}, ?, ?, ?)",
+                    [url_key] + columns + [json.dumps(data), timestamp, now],
+                )
+                job_id = cursor.lastrowid
+
+            for field, kind in ITEM_FIELDS.items():
+                conn.executemany(
+                    "INSERT INTO requirements (job_id, kind, position, text) VALUES (?, ?, ?, ?)",
+                    [(job_id, kind, i, _as_text(item)) for i, item in enumerate(_as_list(job_data.get(field)))],
+                )
+            conn.executemany(
+                "INSERT INTO keywords (job_id, position, keyword) VALUES (?, ?, ?)",
+                [(job_id, i, _as_text(keyword)) for i, keyword in enumerate(_as_list(job_data.get("keywords")))],
+            )
+            if self.fts:
+                self._index(conn, job_id, job_data)
+            return job_id, timestamp
+
+        job_id, timestamp = self._write(operation)
+        job_data["id"] = job_id
+        job_data["timestamp"] = timestamp
+        return job_id
+
+    def _index(self, conn, job_id, job_data):
+        """Replace a job's full-text index row (caller holds the write transaction)"""
+        items = [_as_text(item) for field in ITEM_FIELDS for item in _as_list(job_data.get(field))]
+        conn.execute("DELETE FROM jobs_fts WHERE rowid = ?", (job_id,))
+        conn.execute(
+            f"INSERT INTO jobs_fts (rowid, {', '.join(FTS_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                job_id,
+                _as_text(job_data.get("title")) or "",
+                _as_text(job_data.get("company")) or "",
+                _as_text(job_data.get("description")) or "",
+                "\n".join(items),
+                "\n".join(_as_text(keyword) for keyword in _as_list(job_data.get("keywords"))),
+            ),
+        )
+
+    def _backfill_fts(self):
+        """Index jobs saved before full-text search was enabled"""
+        conn = self._connection()
+        missing = conn.execute(
+            "SELECT id, data FROM jobs WHERE id NOT IN (SELECT rowid FROM jobs_fts)"
+        ).fetchall()
+        if missing:
+            self._write(lambda conn: [self._index(conn, row["id"], json.loads(row["data"])) for row in missing])
+            print(f"Indexed {len(missing)} saved jobs for full-text search")
+
+    def _row_to_job(self, row):
+        job = json.loads(row["data"])
+        job["id"] = row["id"]
+        job["timestamp"] = row["timestamp"]
+        return job
+
+    def get(self, job_id):
+        row = self._connection().execute(
+            "SELECT id, data, timestamp FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self):
+        rows = self._connection().execute("SELECT id, data, timestamp FROM jobs ORDER BY id")
+        return [self._row_to_job(row) for row in rows]
+
+    def updated_since(self, updated_at):
+        rows = self._connection().execute(
+            "SELECT id, updated_at FROM jobs WHERE updated_at > ? ORDER BY updated_at", (updated_at,)
+        )
+        return [(row["id"], row["updated_at"]) for row in rows]
+
+    def get_many(self, job_ids, batch_size=500):
+        jobs = []
+        job_ids = list(job_ids)
+        for start in range(0, len(job_ids), batch_size):
+            batch = job_ids[start:start + batch_size]
+            rows = self._connection().execute(
+                f"SELECT id, data, timestamp FROM jobs WHERE id IN ({', '.join('?' for _ in batch)})", batch
+            )
+            jobs.extend(self._row_to_job(row) for row in rows)
+        return jobs
+
+    def query_jobs(self, company=None, keyword=None, date_from=None, date_to=None, q=None,
+                   sort="timestamp", order="desc", limit=50, cursor=None, fields=None):
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_COLUMNS)}")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be 'asc' or 'desc'")
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        where, params = [], []
+        if company:
+            where.append("company = ? COLLATE NOCASE")
+            params.append(company)
+        if keyword:
+            where.append("id IN (SELECT job_id FROM keywords WHERE keyword = ?)")
+            params.append(keyword)
+        if date_from:
+            where.append("timestamp >= ?")
+            params.append(_parse_date(date_from, end_of_day=False))
+        if date_to:
+            where.append("timestamp <= ?")
+            params.append(_parse_date(date_to, end_of_day=True))
+        if q and self.fts:
+            match = _match_expression(q)
+            if match is not None:
+                where.append("id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+                params.append(match)
+        elif q:
+            pattern = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where.append("(title LIKE ? ESCAPE '\\' OR company LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')")
+            params.extend([pattern] * 3)
+
+        # Keyset pagination: continue strictly after the last (sort value, id) of the previous page
+        column = SORT_COLUMNS[sort]
+        collate = " COLLATE NOCASE" if column in ("title", "company") else ""
+        op = "<" if order == "desc" else ">"
+        if cursor:
+            last_value, last_id = _decode_cursor(cursor)
+            if column == "id":
+                where.append(f"id {op} ?")
+                params.append(last_id)
+            else:
+                where.append(f"({column} {op} ?{collate} OR ({column} = ?{collate} AND id {op} ?))")
+                params.extend([last_value, last_value, last_id])
+
+        projection = _parse_fields(fields)
+        summary_only = projection is not None and set(projection) <= set(SUMMARY_COLUMNS)
+        selected = ", ".join(SUMMARY_COLUMNS) if summary_only else "id, data, timestamp, title, company"
+
+        sql = f"SELECT {selected} FROM jobs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        order_by = f"{column}{collate} {order.upper()}"
+        if column != "id":
+            order_by += f", id {order.upper()}"
+        sql += f" ORDER BY {order_by} LIMIT ?"
+        rows = self._connection().execute(sql, params + [limit + 1]).fetchall()
+
+        jobs = []
+        for row in rows[:limit]:
+            job = {key: row[key] for key in SUMMARY_COLUMNS} if summary_only else self._row_to_job(row)
+            if projection is not None:
+                job = {key: job[key] for key in ["id"] + projection if key in job}
+            jobs.append(job)
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = _encode_cursor(last[column], last["id"])
+        return {"jobs": jobs, "next_cursor": next_cursor}
+
+    def search(self, q, keyword=None, limit=20, offset=0, facet_limit=20):
+        if not self.fts:
+            raise ValueError("Full-text search is not available")
+        match = _match_expression(q)
+        if match is None:
+            return {"total": 0, "results": [], "facets": {"keywords": [], "sampled": False}}
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        # "+rowid" keeps SQLite from handing the keyword filter to FTS5 as a rowid
+        # constraint, which makes it re-run the MATCH once per candidate row
+        where = "jobs_fts MATCH ?"
+        params = [match]
+        if keyword:
+            where += " AND +jobs_fts.rowid IN (SELECT job_id FROM keywords WHERE keyword = ?)"
+            params.append(keyword)
+
+        conn = self._connection()
+        # ORDER BY rank lets FTS5 sort internally, so highlight() and snippet() only run for returned rows
+        rows = conn.execute(
+            f"""
+            SELECT j.id, j.timestamp, j.url, j.title, j.company, j.location, j.salary, jobs_fts.rank AS score,
+                   highlight(jobs_fts, 0, '{MATCH_START}', '{MATCH_END}') AS title_highlight,
+                   snippet(jobs_fts, 2, '{MATCH_START}', '{MATCH_END}', '…', 16) AS snippet
+            FROM jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid
+            WHERE {where}
+            ORDER BY jobs_fts.rank
+            LIMIT ? OFFSET ?
+            """,
+            params + [limit, max(0, int(offset))],
+        ).fetchall()
+
+        total = conn.execute(f"SELECT COUNT(*) FROM jobs_fts WHERE {where}", params).fetchone()[0]
+
+        # Facets are counted over the most recent FACET_SAMPLE_SIZE matches to keep broad queries fast
+        facets = conn.execute(
+            f"""
+            SELECT MIN(k.keyword) AS keyword, COUNT(DISTINCT k.job_id) AS count
+            FROM (SELECT rowid AS id FROM jobs_fts WHERE {where} ORDER BY rowid DESC LIMIT ?) m
+            JOIN keywords k ON k.job_id = m.id
+            GROUP BY k.keyword ORDER BY count DESC, keyword LIMIT ?
+            """,
+            params + [FACET_SAMPLE_SIZE, facet_limit],
+        ).fetchall()
+
+        results = []
+        for row in rows:
+            result = {key: row[key] for key in SUMMARY_COLUMNS}
+            result["title_highlight"] = _marked_html(row["title_highlight"])
+            result["snippet"] = _marked_html(row["snippet"])
+            result["score"] = round(-row["score"], 4)  # bm25() is lower-is-better
+            results.append(result)
+
+        return {
+            "total": total,
+            "results": results,
+            "facets": {
+                "keywords": [{"keyword": row["keyword"], "count": row["count"]} for row in facets],
+                "sampled": total > FACET_SAMPLE_SIZE,
+            },
+        }
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def stats(self):
+        stats = super().stats()
+        stats["path"] = self.path
+        stats["full_text_search"] = self.fts
+        return stats
+
+
+def _marked_html(text):
+    """Highlighted text, HTML-escaped (job text is scraped and untrusted), with matches in <mark>"""
+    if text is None:
+        return None
+    return html.escape(text).replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
+
+
+def _match_expression(q):
+    """
+    Turn free text into an FTS5 query: every term quoted (so user input
+    cannot inject FTS syntax) and ANDed, the last one as a prefix.
+    Returns None if the text has no searchable terms.
+    """
+    terms = SEARCH_TERM_PATTERN.findall(q or "")
+    if not terms:
+        return None
+    quoted = ['"' + term.replace('"', '""') + '"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _parse_date(value, end_of_day):
+    """Accept "YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS" and return a comparable timestamp string"""
+    value = value.strip().replace("T", " ")
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            parsed = time.strptime(value, fmt)
+        except ValueError:
+            continue
+        if fmt == "%Y-%m-%d":
+            return value + (" 23:59:59" if end_of_day else " 00:00:00")
+        return time.strftime("%Y-%m-%d %H:%M:%S", parsed)
+    raise ValueError(f"Invalid date: {value}")
+
+
+def _parse_fields(fields):
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    return [field.strip() for field in fields if field.strip() and field.strip() != "id"]
+
+
+def _encode_cursor(value, job_id):
+    return base64.urlsafe_b64encode(json.dumps([value, job_id]).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    try:
+        value, job_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return value, int(job_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def _as_list(value):
+    if isinstance(value, list):
+        return [item for item in value if item not in (None, "")]
+    return []
+
+
+def _as_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+
+
+BACKENDS = {"sqlite": SQLiteJobStore}
+
+
+def create_job_store(kind=None):
+    """Build the job store selected by JOB_STORE_BACKEND (default "sqlite")"""
+    kind = (kind or os.getenv("JOB_STORE_BACKEND", "sqlite")).lower()
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown job store backend: {kind}")
+    if kind == "sqlite":
+        return SQLiteJobStore(
+            os.getenv("JOB_STORE_PATH", os.path.join(DATA_DIR, "jobs.db")),
+            busy_timeout=int(os.getenv("JOB_STORE_BUSY_TIMEOUT", "5000")),
+        )
+    return BACKENDS[kind]()
+
+
+job_store = create_job_store()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3 or sys.argv[1] != "import":
+        print("Usage: python jobStore.py import <saved_jobs.json>")
+        sys.exit(1)
+
+    imported = job_store.import_json(sys.argv[2])
+    print(f"Imported {imported} jobs; the store now holds {job_store.count()}")
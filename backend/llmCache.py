@@ -0,0 +1,252 @@
+"""
+LLM Response Cache
+
+Caches model answers keyed on a SHA-256 of (model, messages, response_format)
+so identical prompts (same job description, same resume, same model) are
+answered without another OpenRouter round trip. Streamed answers are stored
+as their original deltas and replayed as stream chunks, so callers that
+iterate `chunk.choices[0].delta.content` behave the same on a hit.
+
+Backends are pluggable: an in-memory LRU, an on-disk SQLite store, or both
+layered (the default). Set LLM_CACHE_BACKEND to "memory", "disk", "tiered"
+or "off".
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+class MemoryBackend:
+    """Bounded in-process LRU"""
+
+    name = "memory"
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class DiskBackend:
+    """SQLite store that survives restarts; entries expire after `ttl` seconds"""
+
+    name = "disk"
+
+    def __init__(self, path, ttl=7 * 86400, max_entries=5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] >= self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._conn.execute("""
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class TieredBackend:
+    """Memory in front of disk; disk hits are promoted into memory"""
+
+    name = "tiered"
+
+    def __init__(self, memory, disk):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def __len__(self):
+        return len(self.disk)
+
+
+class LLMResponseCache:
+    """Content-hash cache in front of chat completion calls"""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "bypassed": 0, "stores": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    @staticmethod
+    def make_key(model, messages, response_format=None):
+        """SHA-256 over everything that determines the model's answer"""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "response_format": response_format},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key, use_cache):
+        if self.backend is None or not use_cache:
+            self._count("bypassed")
+            return None
+        value = self.backend.get(key)
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def _store(self, key, value):
+        if self.backend is not None:
+            self.backend.set(key, value)
+            self._count("stores")
+
+    def complete(self, client, model, messages, response_format=None, use_cache=True):
+        """
+        Non-streaming completion. Returns the message content string,
+        from the cache when possible.
+        """
+        key = self.make_key(model, messages, response_format)
+        cached = self._lookup(key, use_cache)
+        if cached is not None:
+            return cached["content"]
+
+        kwargs = {"model": model, "messages": messages}
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+        response = client.chat.completions.create(**kwargs)
+        content = response.choices[0].message.content
+
+        if use_cache and content:
+            self._store(key, {"content": content})
+        return content
+
+    def stream(self, client, model, messages, use_cache=True):
+        """
+        Streaming completion. Returns an iterator of chunks shaped like the
+        OpenAI stream (chunk.choices[0].delta.content), replayed from the cache
+        on a hit. A miss is stored only once the stream has been fully consumed.
+        """
+        key = self.make_key(model, messages)
+        cached = self._lookup(key, use_cache)
+        if cached is not None:
+            return _replay(cached["chunks"])
+
+        response = client.chat.completions.create(model=model, messages=messages, stream=True)
+        if not use_cache:
+            return response
+        return self._record(key, response)
+
+    def _record(self, key, response):
+        chunks = []
+        for chunk in response:
+            if chunk.choices and getattr(chunk.choices[0].delta, "content", None):
+                chunks.append(chunk.choices[0].delta.content)
+            yield chunk
+        if chunks:
+            self._store(key, {"chunks": chunks})
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["backend"] = self.backend.name if self.backend is not None else "off"
+        stats["entries"] = len(self.backend) if self.backend is not None else 0
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+def _replay(chunks):
+    """Yield cached deltas as minimal stream chunk objects"""
+    for content in chunks:
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+def _build_backend(kind):
+    if kind == "off":
+        return None
+
+    memory = MemoryBackend(int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512")))
+    if kind == "memory":
+        return memory
+
+    disk = DiskBackend(
+        os.getenv("LLM_CACHE_PATH", os.path.join(DATA_DIR, "llm_cache.db")),
+        ttl=int(os.getenv("LLM_CACHE_TTL", str(7 * 86400))),
+        max_entries=int(os.getenv("LLM_CACHE_DISK_ENTRIES", "5000")),
+    )
+    if kind == "disk":
+        return disk
+    return TieredBackend(memory, disk)
+
+
+llm_cache = LLMResponseCache(_build_backend(os.getenv("LLM_CACHE_BACKEND", "tiered").lower()))
@@ -0,0 +1,218 @@
+"""
+LLM Gateway
+
+A single asynchronous OpenRouter client shared by every route. Requests run
+on one background event loop over a pooled (HTTP/2 when `h2` is installed)
+keep-alive connection pool, limited by a global semaphore and a per-model
+semaphore, with a timeout and retry-with-jittered-backoff on 429/5xx and
+connection errors.
+
+`LLMGateway.sync_client` mimics the OpenAI client's
+`client.chat.completions.create(...)` so existing synchronous call sites
+keep working unchanged; async code can await `complete()` or iterate
+`stream()` directly.
+"""
+
+import asyncio
+import queue
+import random
+import threading
+from types import SimpleNamespace
+
+import httpx
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, APITimeoutError
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def _is_retryable(error):
+    if isinstance(error, (APIConnectionError, APITimeoutError, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code in RETRYABLE_STATUS
+
+
+def _retry_delay(error, attempt, base=0.5, cap=20.0):
+    """Honour Retry-After when the server sends it, otherwise full-jitter exponential backoff"""
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            return min(float(response.headers.get("retry-after")), cap)
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def parse_model_limits(spec):
+    """Parse "model-a=2,model-b=8" into {"model-a": 2, "model-b": 8}"""
+    limits = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            model, limit = item.rsplit("=", 1)
+            limits[model.strip()] = int(limit)
+    return limits
+
+
+class LLMGateway:
+    """
+    Parameters:
+        base_url, api_key: OpenRouter endpoint and key
+        max_concurrency: Requests in flight across all models
+        model_concurrency: Default requests in flight per model
+        model_limits: Per-model overrides of model_concurrency
+        timeout: Seconds allowed for one attempt of a non-streaming call
+        max_retries: Extra attempts after a retryable failure
+    """
+
+    def __init__(self, base_url, api_key, max_concurrency=16, model_concurrency=4,
+                 model_limits=None, timeout=60.0, max_retries=4):
+        self.max_concurrency = max_concurrency
+        self.model_concurrency = model_concurrency
+        self.model_limits = model_limits or {}
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+
+        self._client = AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            max_retries=0,  # retries are handled here, with jitter and per-model limits
+            http_client=httpx.AsyncClient(
+                http2=http2,
+                timeout=httpx.Timeout(timeout, connect=10.0),
+                limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            ),
+        )
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._models = {}
+        self._stats_lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "failures": 0, "in_flight": 0}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-gateway", daemon=True)
+        self._thread.start()
+
+        self.sync_client = SimpleNamespace(chat=SimpleNamespace(completions=_SyncCompletions(self)))
+
+    def _count(self, key, delta=1):
+        with self._stats_lock:
+            self._counters[key] += delta
+
+    def _model_semaphore(self, model):
+        semaphore = self._models.get(model)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.model_limits.get(model, self.model_concurrency))
+            self._models[model] = semaphore
+        return semaphore
+
+    async def _create(self, kwargs, timeout):
+        """Call the API, retrying retryable failures (caller holds the semaphores)"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await asyncio.wait_for(self._client.chat.completions.create(**kwargs), timeout)
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                delay = _retry_delay(e, attempt)
+                print(f"LLM request to {kwargs.get('model')} failed ({str(e)}), retrying in {delay:.1f}s")
+                self._count("retries")
+                await asyncio.sleep(delay)
+
+    async def complete(self, **kwargs):
+        """Non-streaming chat completion"""
+        model = kwargs.get("model")
+        self._count("requests")
+        try:
+            async with self._global, self._model_semaphore(model):
+                self._count("in_flight")
+                try:
+                    return await self._create(kwargs, self.timeout)
+                finally:
+                    self._count("in_flight", -1)
+        except Exception:
+            self._count("failures")
+            raise
+
+    async def stream(self, **kwargs):
+        """Streaming chat completion; yields chunks. Only the initial request is retried."""
+        kwargs["stream"] = True
+        model = kwargs.get("model")
+        self._count("requests")
+        try:
+            async with self._global, self._model_semaphore(model):
+                self._count("in_flight")
+                try:
+                    response = await self._create(kwargs, self.timeout)
+                    async for chunk in response:
+                        yield chunk
+                finally:
+                    self._count("in_flight", -1)
+        except Exception:
+            self._count("failures")
+            raise
+
+    def run(self, coroutine):
+        """Run a coroutine on the gateway loop from any thread and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._counters)
+        stats["max_concurrency"] = self.max_concurrency
+        stats["model_concurrency"] = self.model_concurrency
+        return stats
+
+
+class _SyncStream:
+    """Blocking iterator over a stream running on the gateway loop"""
+
+    _END = object()
+
+    def __init__(self, gateway, kwargs):
+        self._queue = queue.Queue()
+        self._future = asyncio.run_coroutine_threadsafe(self._pump(gateway, kwargs), gateway._loop)
+
+    async def _pump(self, gateway, kwargs):
+        try:
+            async for chunk in gateway.stream(**kwargs):
+                self._queue.put(chunk)
+        except BaseException as e:
+            self._queue.put(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        else:
+            self._queue.put(self._END)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = self._queue.get()
+        if item is self._END:
+            raise StopIteration
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def close(self):
+        """Stop the underlying request if the caller stops reading early"""
+        self._future.cancel()
+
+    def __del__(self):
+        self._future.cancel()
+
+
+class _SyncCompletions:
+    """Drop-in for the OpenAI client's chat.completions namespace"""
+
+    def __init__(self, gateway):
+        self._gateway = gateway
+
+    def create(self, **kwargs):
+        if kwargs.pop("stream", False):
+            return _SyncStream(self._gateway, kwargs)
+        return self._gateway.run(self._gateway.complete(**kwargs))
@@ -0,0 +1,78 @@
+"""
+Page Readiness Checks
+
+Replaces a fixed sleep after driver.get() with a poll that returns as soon as
+the job description has rendered, or once the document has finished loading
+and the network has gone quiet, whichever comes first. Each job board gets
+its own timeout budget from jobSites.SITE_PROFILES.
+"""
+
+import time
+
+from jobSites import get_site_profile
+
+POLL_INTERVAL = 0.1
+
+# One round trip per poll: the first ready selector with text, the document
+# state and how many resources have finished loading so far.
+READINESS_SCRIPT = """
+var selectors = arguments[0];
+var found = null;
+for (var i = 0; i < selectors.length; i++) {
+    var el = document.querySelector(selectors[i]);
+    if (el && el.textContent.trim().length > 0) {
+        found = selectors[i];
+        break;
+    }
+}
+var resources = window.performance ? performance.getEntriesByType('resource').length : 0;
+return {found: found, readyState: document.readyState, resources: resources};
+"""
+
+
+def wait_for_page(driver, url):
+    """
+    Block until the page at `url` is usable.
+
+    Returns a dictionary describing why the wait ended ("selector",
+    "network_idle" or "timeout") and how long it took in milliseconds.
+    """
+    profile = get_site_profile(url)
+    selectors = profile["ready_selectors"]
+    idle_window = profile["network_idle_ms"] / 1000
+    start = time.monotonic()
+    deadline = start + profile["timeout"]
+
+    last_resources = -1
+    idle_since = None
+    reason = "timeout"
+
+    while True:
+        now = time.monotonic()
+        try:
+            state = driver.execute_script(READINESS_SCRIPT, selectors)
+        except Exception as e:
+            # The page may be mid-navigation; try again on the next poll
+            print(f"Readiness check failed: {str(e)}")
+            state = None
+
+        if state:
+            if state.get("found"):
+                reason = "selector"
+                break
+
+            if state.get("readyState") == "complete":
+                if state.get("resources") != last_resources:
+                    last_resources = state.get("resources")
+                    idle_since = now
+                elif now - idle_since >= idle_window:
+                    reason = "network_idle"
+                    break
+
+        if now >= deadline:
+            break
+        time.sleep(POLL_INTERVAL)
+
+    elapsed_ms = round((time.monotonic() - start) * 1000)
+    print(f"Page ready ({reason}) after {elapsed_ms} ms")
+    return {"reason": reason, "elapsed_ms": elapsed_ms}
@@ -0,0 +1,289 @@
+"""
+Parsed Page
+
+Parses a fetched job posting exactly once and answers everything the
+scraper needs from it: the page text (computed once and memoized), the
+title/company/location/description candidates from jobSites (resolved in a
+single walk over the tree) and any embedded JSON-LD JobPosting.
+
+The fastest installed backend is used: selectolax, then BeautifulSoup with
+lxml, then BeautifulSoup with the built-in html.parser.
+
+Run `python parsedPage.py <dir of saved .html pages>` to compare parse time
+and peak memory against the previous BeautifulSoup code path.
+"""
+
+import json
+import re
+
+from bs4 import BeautifulSoup
+
+from jobSites import TITLE_SELECTORS, COMPANY_SELECTORS, LOCATION_SELECTORS, DESCRIPTION_SELECTORS
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401
+    BS4_FEATURES = "lxml"
+except ImportError:
+    BS4_FEATURES = "html.parser"
+
+FIELD_SELECTORS = {
+    "title": TITLE_SELECTORS,
+    "company": COMPANY_SELECTORS,
+    "location": LOCATION_SELECTORS,
+    "description": DESCRIPTION_SELECTORS,
+}
+
+# Tags whose contents are not page text
+NON_TEXT_TAGS = ["script", "style", "template"]
+
+# The selector forms used in jobSites: tag, tag.class, tag#id, tag[attr="value"]
+SELECTOR_PATTERN = re.compile(r'^([\w-]+)(?:\.([\w-]+)|#([\w-]+)|\[([\w-]+)="([^"]*)"\])?$')
+
+
+def compile_selector(selector):
+    """Turn a simple CSS selector into a (tag, attribute, value) triple"""
+    match = SELECTOR_PATTERN.match(selector)
+    if not match:
+        raise ValueError(f"Unsupported selector: {selector}")
+    tag, class_name, element_id, attr, value = match.groups()
+    if class_name:
+        return tag, "class", class_name
+    if element_id:
+        return tag, "id", element_id
+    return tag, attr, value
+
+
+def _build_matchers():
+    """Index every candidate selector by tag: tag -> [(field, priority, attribute, value)]"""
+    matchers = {}
+    for field, selectors in FIELD_SELECTORS.items():
+        for priority, selector in enumerate(selectors):
+            tag, attr, value = compile_selector(selector)
+            matchers.setdefault(tag, []).append((field, priority, attr, value))
+    return matchers
+
+
+MATCHERS = _build_matchers()
+SLOT_COUNT = sum(len(selectors) for selectors in FIELD_SELECTORS.values())
+
+
+def _attr_matches(attrs, attr, value):
+    if attr is None:
+        return True
+    actual = attrs.get(attr)
+    if actual is None:
+        return False
+    if attr == "class":
+        return value in actual.split()
+    return actual == value
+
+
+class ParsedPage:
+    """A job posting parsed once, with memoized derived values"""
+
+    def __init__(self, html, backend=None):
+        self.html = html
+        self.backend = backend or ("selectolax" if SelectolaxParser is not None else "bs4")
+        self._text = None
+        self._candidates = None
+        self._fields = None
+
+        if self.backend == "selectolax":
+            self._tree = SelectolaxParser(html)
+            # Keep JSON-LD before dropping script contents from the text
+            self._json_ld = [node.text() for node in self._tree.css('script[type="application/ld+json"]')]
+            self._tree.strip_tags(NON_TEXT_TAGS)
+        else:
+            self._tree = BeautifulSoup(html, BS4_FEATURES)
+            self._json_ld = [
+                script.string or ""
+                for script in self._tree.find_all('script', {'type': 'application/ld+json'})
+            ]
+
+    @property
+    def text(self):
+        """Full page text, computed on first use"""
+        if self._text is None:
+            if self.backend == "selectolax":
+                self._text = self._tree.text(separator="") if self._tree.root else ""
+            else:
+                self._text = self._tree.get_text()
+        return self._text
+
+    def _iter_elements(self):
+        """Yield (tag, attributes, node) for every element in document order"""
+        if self.backend == "selectolax":
+            if self._tree.root is None:
+                return
+            for node in self._tree.root.traverse():
+                yield node.tag, node.attributes, node
+        else:
+            for node in self._tree.find_all(True):
+                attrs = node.attrs
+                if isinstance(attrs.get("class"), list):
+                    attrs = dict(attrs, **{"class": " ".join(attrs["class"])})
+                yield node.name, attrs, node
+
+    def candidates(self):
+        """
+        For every field, the first element matching each of its selectors
+        (None where nothing matched), found in one walk over the tree.
+        """
+        if self._candidates is None:
+            candidates = {field: [None] * len(selectors) for field, selectors in FIELD_SELECTORS.items()}
+            remaining = SLOT_COUNT
+            for tag, attrs, node in self._iter_elements():
+                for field, priority, attr, value in MATCHERS.get(tag, ()):
+                    if candidates[field][priority] is None and _attr_matches(attrs, attr, value):
+                        candidates[field][priority] = node
+                        remaining -= 1
+                if not remaining:
+                    break
+            self._candidates = candidates
+        return self._candidates
+
+    def node_text(self, node, strip=False):
+        """Text of an element; strip=True strips and joins its text pieces like get_text(strip=True)"""
+        if self.backend == "selectolax":
+            return node.text(deep=True, separator="", strip=strip)
+        return node.get_text(strip=True) if strip else node.get_text()
+
+    def _first_link(self, node):
+        return node.css_first("a") if self.backend == "selectolax" else node.find("a")
+
+    def fields(self):
+        """
+        Title, company, location and description from the first usable
+        candidate of each. Fields with no usable candidate are omitted.
+        """
+        if self._fields is not None:
+            return self._fields
+
+        candidates = self.candidates()
+        fields = {}
+
+        for field in ("title", "location"):
+            for candidate in candidates[field]:
+                if candidate is not None and self.node_text(candidate).strip():
+                    fields[field] = self.node_text(candidate).strip()
+                    break
+
+        for candidate in candidates["company"]:
+            if candidate is not None:
+                link = self._first_link(candidate)
+                if link is not None:
+                    fields["company"] = self.node_text(link, strip=True)
+                    break
+                elif self.node_text(candidate).strip():
+                    fields["company"] = self.node_text(candidate).strip()
+                    break
+
+        for candidate in candidates["description"]:
+            if candidate is not None:
+                description_text = self.node_text(candidate, strip=True)
+                if description_text:
+                    fields["description"] = description_text
+                    break
+
+        self._fields = fields
+        return fields
+
+    def json_ld_job(self):
+        """Return the schema.org JobPosting embedded in the page as JSON-LD, if any"""
+        for raw in self._json_ld:
+            try:
+                data = json.loads(raw)
+            except (json.JSONDecodeError, TypeError):
+                continue
+
+            if isinstance(data, dict):
+                data = data.get("@graph", [data])
+            if not isinstance(data, list):
+                continue
+
+            for item in data:
+                if isinstance(item, dict) and item.get("@type") == "JobPosting":
+                    return item
+        return None
+
+
+def html_to_text(html):
+    """Plain text of an HTML fragment (e.g. a JSON-LD description)"""
+    page = ParsedPage(html)
+    return page.text.strip()
+
+
+def _legacy_parse(html):
+    """The scraper's parsing before ParsedPage, kept for the benchmark"""
+    soup = BeautifulSoup(html, "html.parser")
+    soup.get_text()
+    for selectors in FIELD_SELECTORS.values():
+        for selector in selectors:
+            soup.select_one(selector)
+    str(soup)
+    soup.get_text()
+
+
+def _parsed_page(html):
+    page = ParsedPage(html)
+    page.fields()
+    page.text
+    page.json_ld_job()
+
+
+def benchmark(paths, repeat=3):
+    """Average parse time and peak traced memory per page for both code paths"""
+    import time
+    import tracemalloc
+
+    pages = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+
+    results = {}
+    for name, parse in (("legacy", _legacy_parse), ("parsed_page", _parsed_page)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for html in pages:
+                parse(html)
+        elapsed = time.perf_counter() - start
+
+        peak = 0
+        for html in pages:
+            tracemalloc.start()
+            parse(html)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        results[name] = {
+            "avg_ms": round(elapsed / (repeat * len(pages)) * 1000, 2),
+            "peak_kb": round(peak / 1024, 1),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    import glob
+    import os
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Usage: python parsedPage.py <directory of saved job pages>")
+        sys.exit(1)
+
+    paths = sorted(glob.glob(os.path.join(sys.argv[1], "*.htm*")))
+    if not paths:
+        print("No .html files found")
+        sys.exit(1)
+
+    backend = "selectolax" if SelectolaxParser is not None else f"bs4/{BS4_FEATURES}"
+    print(f"{len(paths)} pages, ParsedPage backend: {backend}")
+    print("(peak memory is Python allocations only; selectolax's C heap is not traced)")
+    for name, result in benchmark(paths).items():
+        print(f"{name:12} {result['avg_ms']:8.2f} ms/page  peak {result['peak_kb']:10.1f} KB")
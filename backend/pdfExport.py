@@ -0,0 +1,192 @@
+"""
+PDF Export
+
+Lays out the resume editor's HTML as a PDF with ReportLab, from the same
+blocks htmlBlocks produces for the DOCX export.
+
+Fonts are registered and paragraph/table styles are built once at import
+(PDF_FONT_DIR may point at a directory holding Regular/Bold/Italic/
+BoldItalic TTF files; the built-in Helvetica family is used otherwise), so
+an export only parses the markup and lays out pages. A two-page resume
+renders in a few tens of milliseconds, so /export_resume can answer
+synchronously.
+
+Command line:
+    python pdfExport.py bench [resume.html]   # ms per export
+"""
+
+import io
+import os
+import re
+import time
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_LEFT
+from reportlab.lib.pagesizes import LETTER
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from htmlBlocks import SAMPLE_RESUME_HTML, iter_blocks
+
+FONT_DIR = os.getenv("PDF_FONT_DIR")
+FONT_VARIANTS = ("Regular", "Bold", "Italic", "BoldItalic")
+
+BODY_SIZE = 10
+HEADING_SIZES = {1: 18, 2: 13, 3: 11.5, 4: 10.5, 5: 10, 6: 10}
+ACCENT = colors.HexColor("#1F3A5F")
+LINK_COLOR = "#0563C1"
+LIST_INDENT = 14
+MARGINS = {"left": 0.8 * inch, "right": 0.8 * inch, "top": 0.7 * inch, "bottom": 0.7 * inch}
+
+
+def _register_fonts():
+    """Register the TTF family from PDF_FONT_DIR once; returns the family name to use"""
+    if not FONT_DIR:
+        return "Helvetica"
+    family = os.path.basename(os.path.normpath(FONT_DIR))
+    paths = {variant: os.path.join(FONT_DIR, f"{family}-{variant}.ttf") for variant in FONT_VARIANTS}
+    if not os.path.exists(paths["Regular"]):
+        print(f"No {family}-Regular.ttf in {FONT_DIR}, using Helvetica for PDF export")
+        return "Helvetica"
+    names = {}
+    for variant, path in paths.items():
+        name = f"{family}-{variant}"
+        pdfmetrics.registerFont(TTFont(name, path if os.path.exists(path) else paths["Regular"]))
+        names[variant] = name
+    pdfmetrics.registerFontFamily(
+        family, normal=names["Regular"], bold=names["Bold"], italic=names["Italic"], boldItalic=names["BoldItalic"]
+    )
+    return names["Regular"]
+
+
+def _build_styles(font):
+    base = ParagraphStyle("Body", fontName=font, fontSize=BODY_SIZE, leading=BODY_SIZE * 1.3,
+                          spaceAfter=3, alignment=TA_LEFT)
+    styles = {"paragraph": base, "cell": ParagraphStyle("Cell", parent=base, spaceAfter=0)}
+    for level, size in HEADING_SIZES.items():
+        styles[f"heading{level}"] = ParagraphStyle(
+            f"Heading{level}", parent=base, fontSize=size, leading=size * 1.25, textColor=ACCENT,
+            spaceBefore=0 if level == 1 else 8, spaceAfter=3,
+        )
+    for depth in range(3):
+        styles[f"list{depth}"] = ParagraphStyle(
+            f"List{depth}", parent=base, leftIndent=LIST_INDENT * (depth + 1), bulletIndent=LIST_INDENT * depth + 2,
+            spaceAfter=1,
+        )
+    return styles
+
+
+FONT = _register_fonts()
+STYLES = _build_styles(FONT)
+TABLE_STYLE = TableStyle([
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("TOPPADDING", (0, 0), (-1, -1), 3),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+])
+
+
+def runs_markup(runs, bold=False):
+    """ReportLab paragraph markup for htmlBlocks runs"""
+    parts = []
+    for run in runs:
+        text = escape(run["text"]).replace("\n", "<br/>")
+        if run["bold"] or bold:
+            text = f"<b>{text}</b>"
+        if run["italic"]:
+            text = f"<i>{text}</i>"
+        if run["underline"]:
+            text = f"<u>{text}</u>"
+        if run["href"]:
+            text = f'<a href="{escape(run["href"], {chr(34): "&quot;"})}" color="{LINK_COLOR}">{text}</a>'
+        parts.append(text)
+    return "".join(parts)
+
+
+def _bullet(block, counters):
+    """Bullet text of a list item, numbering ordered lists per nesting depth"""
+    depth = min(block["depth"], 2)
+    del counters[depth + 1:]
+    while len(counters) <= depth:
+        counters.append(0)
+    if not block["ordered"]:
+        return "•" if depth == 0 else "–" if depth == 1 else "·"
+    counters[depth] += 1
+    return f"{counters[depth]}."
+
+
+def blocks_to_flowables(blocks):
+    flowables = []
+    counters = []  # ordered-list numbers per depth, reset outside lists
+    for block in blocks:
+        kind = block["type"]
+        if kind != "list_item":
+            counters = []
+        if kind == "heading":
+            flowables.append(Paragraph(runs_markup(block["runs"]), STYLES[f"heading{block['level']}"]))
+        elif kind == "paragraph":
+            flowables.append(Paragraph(runs_markup(block["runs"]), STYLES["paragraph"]))
+        elif kind == "list_item":
+            bullet = _bullet(block, counters)
+            style = STYLES[f"list{min(block['depth'], 2)}"]
+            flowables.append(Paragraph(runs_markup(block["runs"]), style, bulletText=bullet))
+        elif kind == "table" and block["rows"]:
+            columns = max(len(row) for row in block["rows"])
+            data = [
+                [Paragraph(runs_markup(cell["runs"], bold=cell["header"]), STYLES["cell"]) for cell in row]
+                + [""] * (columns - len(row))
+                for row in block["rows"]
+            ]
+            flowables.append(Table(data, style=TABLE_STYLE, hAlign="LEFT"))
+            flowables.append(Spacer(1, 4))
+        elif kind == "rule":
+            flowables.append(HRFlowable(width="100%", thickness=0.5, color=colors.grey, spaceBefore=2, spaceAfter=4))
+    return flowables
+
+
+def html_to_pdf(html, output=None):
+    """
+    Render the resume HTML as a PDF into `output` (a binary file object;
+    a new BytesIO by default). Returns `output`, rewound when it is a BytesIO.
+    """
+    output = io.BytesIO() if output is None else output
+    doc = SimpleDocTemplate(
+        output, pagesize=LETTER, title="Resume",
+        leftMargin=MARGINS["left"], rightMargin=MARGINS["right"],
+        topMargin=MARGINS["top"], bottomMargin=MARGINS["bottom"],
+    )
+    doc.build(blocks_to_flowables(iter_blocks(html)))
+    if isinstance(output, io.BytesIO):
+        output.seek(0)
+    return output
+
+
+def benchmark(html=SAMPLE_RESUME_HTML, exports=50):
+    """Milliseconds per export, and the number of pages produced"""
+    html_to_pdf(html)  # the first export pays one-time font metric lookups
+    start = time.perf_counter()
+    for _ in range(exports):
+        pdf = html_to_pdf(html)
+    elapsed_ms = (time.perf_counter() - start) / exports * 1000
+    pages = len(re.findall(rb"/Type /Page\b(?!s)", pdf.getvalue()))
+    return {"ms_per_export": round(elapsed_ms, 1), "bytes": len(pdf.getbuffer()), "pages": pages}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HTML to PDF export")
+    parser.add_argument("command", choices=["bench"])
+    parser.add_argument("path", nargs="?", help="HTML file (defaults to a built-in two-page resume)")
+    parser.add_argument("--exports", type=int, default=50)
+    args = parser.parse_args()
+
+    source = SAMPLE_RESUME_HTML
+    if args.path:
+        with open(args.path, encoding="utf-8") as f:
+            source = f.read()
+    print(benchmark(source, args.exports))
@@ -0,0 +1,365 @@
+"""
+PDF Extraction
+
+Page-level text extraction for resumes and long CVs (academic CVs and
+portfolios run to 20-60 pages):
+
+- Pages are extracted in contiguous ranges on a shared pool of worker
+  processes (this file run as `pdfExtraction.py worker`) once a PDF has at
+  least PARALLEL_MIN_PAGES pages; shorter files are read inline,
+  where starting work on the pool would cost more than it saves.
+- Page texts are collected in order and joined once.
+- Extraction stops as soon as a character budget is reached (the prompt
+  cannot use more than that anyway); remaining ranges are cancelled.
+- pypdfium2 is used when installed, as it is several times faster than
+  PyPDF2; pdfminer.six can be selected with PDF_BACKEND=pdfminer. PyPDF2 is
+  the fallback.
+
+Command line:
+    python pdfExtraction.py bench resume.pdf   # pages/sec per backend and mode
+"""
+
+import io
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+MAX_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+CHAR_BUDGET = int(os.getenv("PDF_CHAR_BUDGET", "100000"))
+
+
+def _pypdfium2_pages(data, start=0, end=None):
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(data)
+    try:
+        end = len(pdf) if end is None else min(end, len(pdf))
+        texts = []
+        for i in range(start, end):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return texts
+    finally:
+        pdf.close()
+
+
+def _pypdfium2_count(data):
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(data)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _pdfminer_pages(data, start=0, end=None):
+    from pdfminer.high_level import extract_text
+
+    end = _pypdf2_count(data) if end is None else end
+    # pdfminer ends every page with a form feed
+    text = extract_text(io.BytesIO(data), page_numbers=list(range(start, end)))
+    return text.split("\f")[:end - start]
+
+
+def _pypdf2_pages(data, start=0, end=None):
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    end = len(reader.pages) if end is None else min(end, len(reader.pages))
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _pypdf2_count(data):
+    from PyPDF2 import PdfReader
+
+    return len(PdfReader(io.BytesIO(data)).pages)
+
+
+# name -> (module to probe, page extractor, page counter)
+BACKENDS = {
+    "pypdfium2": ("pypdfium2", _pypdfium2_pages, _pypdfium2_count),
+    "pdfminer": ("pdfminer.high_level", _pdfminer_pages, _pypdf2_count),
+    "pypdf2": ("PyPDF2", _pypdf2_pages, _pypdf2_count),
+}
+AUTO_ORDER = ("pypdfium2", "pypdf2")
+
+
+def _installed(module):
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def available_backends():
+    return [name for name, (module, _, _) in BACKENDS.items() if _installed(module)]
+
+
+def default_backend():
+    configured = os.getenv("PDF_BACKEND")
+    if configured:
+        if configured not in BACKENDS:
+            raise ValueError(f"Unknown PDF_BACKEND {configured!r}; expected one of: {', '.join(BACKENDS)}")
+        return configured
+    for name in AUTO_ORDER:
+        if _installed(BACKENDS[name][0]):
+            return name
+    return "pypdf2"
+
+
+def _extract_range(backend, data, start, end):
+    """Worker entry point: texts of pages [start, end)"""
+    return BACKENDS[backend][1](data, start, end)
+
+
+class _Worker:
+    """A `python pdfExtraction.py worker` process answering page-range requests over its pipes"""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def extract(self, backend, data, start, end):
+        try:
+            pickle.dump((backend, data, start, end), self.process.stdin)
+            self.process.stdin.flush()
+            ok, result = pickle.load(self.process.stdout)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            self.close()
+            raise BrokenProcessPool(f"PDF worker {self.process.pid} died") from e
+        if not ok:
+            raise result
+        return result
+
+    def close(self):
+        self.process.kill()
+        self.process.wait()
+
+
+class WorkerPool:
+    """
+    Up to `size` worker processes, each extracting one page range at a time.
+
+    Workers are started with subprocess rather than multiprocessing: spawn and
+    forkserver children re-import the parent's main module (server.py, with
+    its gateway thread, stores and model warm-up), and fork is unsafe inside
+    the multithreaded server. A worker that dies is dropped and replaced on
+    the next request.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._workers = []
+        self._idle = []
+        self._lock = threading.Lock()
+        self._threads = ThreadPoolExecutor(max_workers=size, thread_name_prefix="pdf-worker")
+
+    def submit(self, backend, data, start, end):
+        return self._threads.submit(self._run, backend, data, start, end)
+
+    def warm(self):
+        """Start every worker now instead of on first use"""
+        with self._lock:
+            while len(self._workers) < self.size:
+                worker = _Worker()
+                self._workers.append(worker)
+                self._idle.append(worker)
+
+    def shutdown(self):
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for worker in self._workers:
+                worker.close()
+            self._workers, self._idle = [], []
+
+    def _run(self, backend, data, start, end):
+        # At most `size` of these run at once, so there is always an idle worker or room for one
+        with self._lock:
+            if self._idle:
+                worker = self._idle.pop()
+            else:
+                worker = _Worker()
+                self._workers.append(worker)
+        broken = False
+        try:
+            return worker.extract(backend, data, start, end)
+        except BrokenProcessPool:
+            broken = True
+            raise
+        finally:
+            with self._lock:
+                if broken:
+                    if worker in self._workers:
+                        self._workers.remove(worker)
+                elif worker in self._workers:
+                    self._idle.append(worker)
+
+
+def _serve():
+    """Worker loop: answer pickled page-range requests on stdin until it is closed"""
+    requests = sys.stdin.buffer
+    # Replies get their own copy of stdout; anything the PDF libraries print goes to stderr
+    replies = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    while True:
+        try:
+            backend, data, start, end = pickle.load(requests)
+        except EOFError:
+            return
+        try:
+            reply = (True, _extract_range(backend, data, start, end))
+        except Exception as e:
+            reply = (False, RuntimeError(f"{type(e).__name__}: {e}"))
+        pickle.dump(reply, replies)
+        replies.flush()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(MAX_WORKERS)
+        return _pool
+
+
+def _collect(page_texts, max_chars):
+    """Append page texts until the budget is reached; returns (texts, truncated)"""
+    texts, total = [], 0
+    for text in page_texts:
+        if max_chars is not None and total + len(text) > max_chars:
+            texts.append(text[:max_chars - total])
+            return texts, True
+        texts.append(text)
+        total += len(text) + 1
+    return texts, False
+
+
+def _sequential_pages(backend, data, count):
+    extract = BACKENDS[backend][1]
+    for start in range(0, count, PAGES_PER_TASK):
+        yield from extract(data, start, min(start + PAGES_PER_TASK, count))
+
+
+def _parallel_pages(backend, data, count):
+    pool = _get_pool()
+    futures = [
+        pool.submit(backend, data, start, min(start + PAGES_PER_TASK, count))
+        for start in range(0, count, PAGES_PER_TASK)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Runs when the budget is reached and the caller stops iterating
+        for future in futures:
+            future.cancel()
+
+
+def extract_pdf(data, max_chars=CHAR_BUDGET, backend=None, parallel=None):
+    """
+    Text of a PDF given as bytes.
+
+    Parameters:
+        max_chars: Stop once this many characters have been extracted (None for no limit)
+        backend: One of BACKENDS; defaults to the fastest one installed
+        parallel: Force (True) or disable (False) the worker pool; by default
+            it is used for PDFs with at least PARALLEL_MIN_PAGES pages
+
+    Returns {"text", "pages", "pages_read", "truncated", "backend"}.
+    """
+    backend = backend or default_backend()
+    count = BACKENDS[backend][2](data)
+    if parallel is None:
+        parallel = count >= PARALLEL_MIN_PAGES and MAX_WORKERS > 1
+
+    pages = _parallel_pages(backend, data, count) if parallel else _sequential_pages(backend, data, count)
+    try:
+        texts, truncated = _collect(pages, max_chars)
+    except BrokenProcessPool:
+        print("PDF extraction worker died, extracting inline")
+        texts, truncated = _collect(_sequential_pages(backend, data, count), max_chars)
+    finally:
+        pages.close()  # cancels pooled ranges that were not needed
+
+    return {
+        "text": "\n".join(texts),
+        "pages": count,
+        "pages_read": len(texts),
+        "truncated": truncated,
+        "backend": backend,
+    }
+
+
+def benchmark(data, repeat=3):
+    """Pages/sec of the old PyPDF2 concatenation loop and each installed backend, inline and pooled"""
+
+    def legacy():
+        from PyPDF2 import PdfReader
+
+        reader = PdfReader(io.BytesIO(data))
+        extracted_text = ""
+        for page in reader.pages:
+            extracted_text += page.extract_text()
+        return extracted_text
+
+    runs = []
+    if _installed("PyPDF2"):
+        runs.append(("pypdf2 (old loop)", legacy))
+    for name in available_backends():
+        runs.append((f"{name} inline", lambda name=name: extract_pdf(data, None, name, parallel=False)))
+        runs.append((f"{name} pooled", lambda name=name: extract_pdf(data, None, name, parallel=True)))
+
+    pages = BACKENDS[default_backend()][2](data)
+    if any(mode.endswith("pooled") for mode, _ in runs):
+        _get_pool().warm()  # start the workers outside the timings
+
+    results = []
+    for mode, run in runs:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        results.append({"mode": mode, "seconds": round(best, 3), "pages_per_sec": round(pages / best, 1)})
+    return pages, results
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["worker"]:
+        _serve()
+        sys.exit()
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PDF text extraction")
+    parser.add_argument("command", choices=["bench"])
+    parser.add_argument("path")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.path, "rb") as f:
+        pdf_bytes = f.read()
+    page_count, results = benchmark(pdf_bytes, args.repeat)
+    print(f"{args.path}: {page_count} pages, {MAX_WORKERS} workers")
+    for result in results:
+        print(f"{result['mode']:>20}  {result['seconds']:>7}s  {result['pages_per_sec']:>8} pages/s")
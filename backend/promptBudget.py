@@ -0,0 +1,247 @@
+"""
+Prompt Budget
+
+Pre-processing for text that goes into a model prompt (job descriptions and
+page text, resumes):
+
+1. Boilerplate is stripped from job pages: navigation runs, cookie/privacy
+   banners, share and apply buttons, equal-opportunity and other legal
+   disclaimers, and lines repeated on the page.
+2. Whitespace is collapsed and blank-line runs are squeezed.
+3. The text is fitted to a per-model token budget. Sections under the
+   headings that matter (requirements and responsibilities for a job;
+   experience and skills for a resume) are kept first, then the opening
+   lines, then everything else in document order.
+
+Tokens are counted with tiktoken's cl100k_base encoding when it is
+installed, otherwise estimated from word and punctuation counts. Budgets
+can be overridden with PROMPT_BUDGETS="model-a=3000,model-b=12000". Every
+call logs the token counts before and after.
+"""
+
+import os
+import re
+
+from llmGateway import parse_model_limits
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Input tokens allowed for the variable part of a prompt (the description or resume)
+DEFAULT_BUDGET = 3000
+MODEL_BUDGETS = {
+    "mistralai/mixtral-8x7b-instruct": 3000,
+    "google/gemini-2.0-flash-lite-001": 6000,
+    "google/gemini-2.0-pro-001": 8000,
+    "anthropic/claude-3-5-sonnet": 6000,
+    **parse_model_limits(os.getenv("PROMPT_BUDGETS")),
+}
+
+# Opening lines kept right after the priority sections (title, company, summary)
+INTRO_LINES = 8
+
+PRIORITY_HEADINGS = {
+    "job": re.compile(
+        r"\b(requirements?|qualifications?|what you.ll (need|bring|do)|skills|responsibilities|duties|"
+        r"the role|about the role|must.haves?|nice.to.haves?|preferred|you have|you will|tech(nology)? stack|"
+        r"technologies|tools)\b",
+        re.IGNORECASE,
+    ),
+    "resume": re.compile(r"\b(experience|employment|skills|projects|summary|profile)\b", re.IGNORECASE),
+}
+HEADING_MAX_WORDS = 6
+
+# Whole lines that are page chrome wherever they appear
+CHROME_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"^(skip to (main )?content|sign in|log ?in|sign up|register|menu|home|search( jobs)?|back to (jobs|search))$",
+    r"^(apply( now| for this job)?|save( job)?|share( this job)?|report( this)? job|easy apply)$",
+    r"^(facebook|twitter|linkedin|instagram|youtube|glassdoor|x)$",
+)]
+
+# Banners and legal text, matched anywhere in a line outside the protected sections
+BOILERPLATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"\bcookies?\b",
+    r"\bprivacy (policy|notice|statement)\b",
+    r"\bterms (of use|of service|and conditions)\b",
+    r"\ball rights reserved\b|©|\(c\) \d{4}",
+    r"\bequal (employment )?opportunity\b|\bwithout regard to\b|\breasonable accommodations?\b|\be-verify\b",
+    r"\baffirmative action\b|\bprotected veteran\b|\bpay transparency\b",
+    r"\bjavascript (is )?(disabled|required)\b|\benable javascript\b",
+)]
+
+# A run of at least this many consecutive short, unpunctuated lines is treated as navigation
+NAV_RUN = 8
+NAV_MAX_WORDS = 3
+
+WHITESPACE = re.compile(r"[ \t\u00a0\u200b]+")
+BULLET = re.compile(r"^([-*\u2022\u00b7\u2013]|\d+[.)])\s")
+ESTIMATE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+_encoding = None
+
+
+def count_tokens(text):
+    """Tokens in the text (cl100k_base when tiktoken is installed, otherwise an estimate)"""
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        return len(_encoding.encode(text, disallowed_special=()))
+    # Roughly one token per short word or symbol, more for long words
+    return sum(1 + len(piece) // 8 for piece in ESTIMATE_PATTERN.findall(text))
+
+
+def budget_for(model):
+    return MODEL_BUDGETS.get(model, DEFAULT_BUDGET)
+
+
+def _sections(lines, kind):
+    """Split lines into (priority, lines) sections: 0 under a priority heading, 2 otherwise"""
+    pattern = PRIORITY_HEADINGS[kind]
+    sections = []
+    priority = 2
+    current = []
+    for line in lines:
+        if line and len(line.split()) <= HEADING_MAX_WORDS and pattern.search(line):
+            if current:
+                sections.append((priority, current))
+            priority, current = 0, [line]
+        elif line and len(line.split()) <= HEADING_MAX_WORDS and line.rstrip().endswith(":"):
+            # Any other heading ends a priority section
+            if current:
+                sections.append((priority, current))
+            priority, current = 2, [line]
+        else:
+            current.append(line)
+    if current:
+        sections.append((priority, current))
+    return sections
+
+
+def _line_priorities(lines, kind):
+    priorities = [priority for priority, section in _sections(lines, kind) for _ in section]
+    for i in range(min(INTRO_LINES, len(lines))):
+        priorities[i] = min(priorities[i], 1)
+    return priorities
+
+
+def _is_boilerplate(line):
+    return any(pattern.search(line) for pattern in BOILERPLATE_PATTERNS)
+
+
+def _is_nav(line):
+    """A short, unpunctuated line or a known menu entry"""
+    if any(pattern.search(line) for pattern in CHROME_PATTERNS):
+        return True
+    return len(line.split()) <= NAV_MAX_WORDS and not re.search(r"[.:;!?]$", line) and not BULLET.match(line)
+
+
+def strip_boilerplate(text, kind="job"):
+    """
+    The text with whitespace collapsed and, for job pages, without
+    boilerplate, navigation or repeated lines. Resumes only get the
+    whitespace pass: their short skill lines and repeated titles are content.
+
+    Lines under a requirement/responsibility heading are not treated as
+    navigation or banners ("Experience with HTTP cookies" is a requirement
+    there), and neither are the lines of a list introduced by a heading
+    ending in ":".
+    """
+    lines = [WHITESPACE.sub(" ", line).strip() for line in text.splitlines()]
+    if kind != "job":
+        result = []
+        for line in lines:
+            if line or (result and result[-1]):
+                result.append(line)
+        return "\n".join(result).strip()
+
+    # Requirement/responsibility sections are protected up to the page footer:
+    # banner or legal text starting a paragraph after the last list
+    in_priority = []
+    for priority, section in _sections(lines, kind):
+        footer = False
+        for j, line in enumerate(section):
+            if j and not section[j - 1] and line and not BULLET.match(line) and _is_boilerplate(line):
+                footer = True
+            in_priority.append(priority == 0 and not footer)
+    listed = [False] * len(lines)  # under a heading ending in ":", up to the next blank line
+    for i in range(1, len(lines)):
+        if lines[i] and lines[i - 1]:
+            listed[i] = listed[i - 1] or lines[i - 1].endswith(":")
+    protected = [a or b for a, b in zip(in_priority, listed)]
+
+    # Navigation menus: long runs of short, unpunctuated, unprotected lines
+    keep = [True] * len(lines)
+    run_start = None
+    for i, line in enumerate(lines + [""]):
+        if line and _is_nav(line) and not protected[i]:
+            if run_start is None:
+                run_start = i
+            continue
+        if run_start is not None and i - run_start >= NAV_RUN:
+            for j in range(run_start, i):
+                keep[j] = False
+        run_start = None
+
+    result = []
+    seen = set()
+    for i, line in enumerate(lines):
+        if not line:
+            if result and result[-1]:
+                result.append("")
+            continue
+        if not keep[i]:
+            continue
+        if any(pattern.search(line) for pattern in CHROME_PATTERNS):
+            continue
+        if not protected[i] and _is_boilerplate(line):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue  # repeated headers, footers and "Apply" blocks
+        seen.add(key)
+        result.append(line)
+    return "\n".join(result).strip()
+
+
+def fit_to_budget(text, max_tokens, kind="job"):
+    """
+    Keep whole lines of the text, in their original order, until the
+    budget is spent: priority sections first, then the intro, then the rest.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    lines = text.splitlines()
+    priorities = _line_priorities(lines, kind)
+
+    chosen = set()
+    spent = 0
+    for level in (0, 1, 2):
+        for i, line in enumerate(lines):
+            if priorities[i] != level or i in chosen:
+                continue
+            cost = count_tokens(line) + 1
+            if spent + cost > max_tokens:
+                continue  # a shorter line further on may still fit
+            chosen.add(i)
+            spent += cost
+    return "\n".join(lines[i] for i in sorted(chosen))
+
+
+def prepare(text, model=None, kind="job", max_tokens=None, label=None):
+    """
+    Strip boilerplate and fit the text to the model's budget (or
+    `max_tokens`), logging the token counts before and after.
+    """
+    if not text:
+        return text
+    max_tokens = max_tokens or budget_for(model)
+    before = count_tokens(text)
+    prepared = fit_to_budget(strip_boilerplate(text, kind), max_tokens, kind)
+    after = count_tokens(prepared)
+    saved = 100 * (before - after) / before if before else 0
+    print(f"Prompt budget [{label or kind}] {model or 'default'}: {before} -> {after} tokens ({saved:.0f}% saved)")
+    return prepared
@@ -5,32 +5,30 @@ This file contains the backend routes and functionality for the resume editor fe
 It handles DOCX parsing, AI suggestion generation, and document export.
 """
 
-import os
-import io
 import json
-from flask import request, jsonify, send_file
-from docx import Document
-import mammoth
-from PyPDF2 import PdfReader
-from aiSummary import client
+import time
+from flask import request, jsonify, send_file, Response
+from docxExport import html_to_docx
+from pdfExport import html_to_pdf
+from resumeExtraction import resume_extractor
+from resumeSections import DEFAULT_MODEL, suggest as suggest_for_sections, stream_suggestions
 
 # Add these routes to your Flask app in server.py
 
-def parse_docx_content(file_data):
+def parse_docx_content(file_data, filename="resume.docx"):
     """
-    Parse a DOCX file and return its content as HTML
+    Parse a DOCX file and return its content as HTML.
+    Parses are cached by content, so re-uploading the same file is free.
     """
     try:
-        # Parse DOCX content
-        result = mammoth.convert_to_html(file_data)
-        html = result.value
-        
-        # You may want to apply additional transformations to the HTML here
+        if hasattr(file_data, "read"):
+            file_data = file_data.read()
+        result = resume_extractor.extract(file_data, filename)
         
         return {
             "success": True,
-            "html": html,
-            "messages": result.messages
+            "html": result["html"],
+            "messages": result["messages"]
         }
     except Exception as e:
         print(f"Error parsing DOCX: {str(e)}")
@@ -39,57 +37,18 @@ def parse_docx_content(file_data):
             "error": f"Failed to parse DOCX: {str(e)}"
         }
 
-def generate_suggestions(resume_html, job_data=None):
+def generate_suggestions(resume_html, job_data=None, model=DEFAULT_MODEL, use_cache=True):
     """
-    Generate AI-powered suggestions for the resume based on the job data
+    Generate AI-powered suggestions for the resume based on the job data.
+    Each section's text is analysed separately and in parallel; sections
+    unchanged since an earlier request reuse its suggestions.
     """
     try:
-        # Create a prompt for the AI
-        prompt = f"""
-        Analyze this resume content and provide specific improvement suggestions:
-        
-        {resume_html}
-        """
-        
-        # Add job data if provided
-        if job_data:
-            prompt += f"""
-            The resume should be optimized for this job:
-            Title: {job_data.get('title', 'Not specified')}
-            Requirements: {', '.join(job_data.get('requirements', []))}
-            Keywords: {', '.join(job_data.get('keywords', []))}
-            """
-        
-        # Call the AI service
-        response = client.chat.completions.create(
-            model="mistralai/mixtral-8x7b-instruct",  # Use default model
-            messages=[
-                {"role": "system", "content": "You are an expert resume reviewer. Provide specific, actionable suggestions to improve the resume content. Focus on identifying weak phrases, missing keywords, and opportunities to quantify achievements."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
-        
-        # Process response
-        suggestions_json = json.loads(response.choices[0].message.content)
-        
-        # Format suggestions in a structured way for the frontend
-        formatted_suggestions = []
-        
-        for suggestion in suggestions_json.get("suggestions", []):
-            formatted_suggestions.append({
-                "id": len(formatted_suggestions) + 1,
-                "type": suggestion.get("type", "improvement"),
-                "section": suggestion.get("section", "general"),
-                "original": suggestion.get("original", ""),
-                "suggestion": suggestion.get("suggestion", ""),
-                "position": suggestion.get("position", {"line": 0, "ch": 0}),
-                "applied": False
-            })
-        
+        result = suggest_for_sections(resume_html, job_data, model=model, use_cache=use_cache)
         return {
             "success": True,
-            "suggestions": formatted_suggestions
+            "suggestions": result["suggestions"],
+            "sections": result["sections"]
         }
     except Exception as e:
         print(f"Error generating suggestions: {str(e)}")
@@ -103,26 +62,21 @@ def generate_docx_from_html(html_content):
     Generate a DOCX file from HTML content
     """
     try:
-        # Create a new document
-        doc = Document()
-        
-        # This is where you would convert the HTML back to DOCX
-        # This is a simplified example and would need proper HTML parsing
-        # and conversion to DOCX elements with styles
-        
-        # Add a sample paragraph (you would replace this with HTML conversion)
-        doc.add_paragraph(html_content)
-        
-        # Save to a BytesIO object
-        output = io.BytesIO()
-        doc.save(output)
-        output.seek(0)
-        
-        return output
+        return html_to_docx(html_content)
     except Exception as e:
         print(f"Error generating DOCX: {str(e)}")
         return None
 
+def generate_pdf_from_html(html_content):
+    """
+    Generate a PDF file from HTML content
+    """
+    try:
+        return html_to_pdf(html_content)
+    except Exception as e:
+        print(f"Error generating PDF: {str(e)}")
+        return None
+
 # Routes to add to your Flask app
 
 def route_parse_resume():
@@ -141,7 +95,7 @@ def route_parse_resume():
             return jsonify({"error": "No file selected"}), 400
         
         if file and file.filename.endswith('.docx'):
-            result = parse_docx_content(file)
+            result = parse_docx_content(file, file.filename)
             if result["success"]:
                 return jsonify({
                     "html": result["html"],
@@ -168,16 +122,70 @@ def route_generate_suggestions():
         
         resume_html = data['resumeHtml']
         job_data = data.get('jobData')
+        model = data.get('model', DEFAULT_MODEL)
+        use_cache = not data.get('no_cache', False)
         
-        result = generate_suggestions(resume_html, job_data)
+        result = generate_suggestions(resume_html, job_data, model=model, use_cache=use_cache)
         
         if result["success"]:
-            return jsonify({"suggestions": result["suggestions"]}), 200
+            return jsonify({"suggestions": result["suggestions"], "sections": result["sections"]}), 200
         else:
             return jsonify({"error": result["error"]}), 500
     except Exception as e:
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
+def route_generate_suggestions_stream():
+    """
+    Route: /generate_resume_suggestions_stream
+    Method: POST
+    Server-sent events version of /generate_resume_suggestions: each
+    suggestion is sent as an `event: suggestion` as soon as the model has
+    written it, with `event: section` as each section finishes, then a
+    final data message with every suggestion in document order.
+    """
+    data = request.json
+    
+    if not data or 'resumeHtml' not in data:
+        return jsonify({"error": "Resume HTML content is required"}), 400
+    
+    resume_html = data['resumeHtml']
+    job_data = data.get('jobData')
+    model = data.get('model', DEFAULT_MODEL)
+    use_cache = not data.get('no_cache', False)
+    
+    def generate():
+        start = time.monotonic()
+        first_suggestion_ms = None
+        suggestions = []
+        sections = {"total": 0, "analysed": 0, "reused": 0}
+        
+        yield f"data: {json.dumps({'text': f'Reviewing resume sections with {model}...', 'complete': False})}\n\n"
+        
+        try:
+            for kind, payload in stream_suggestions(resume_html, job_data, model=model, use_cache=use_cache):
+                if kind == "suggestion":
+                    if first_suggestion_ms is None:
+                        first_suggestion_ms = round((time.monotonic() - start) * 1000)
+                    suggestions.append(payload)
+                else:
+                    sections["total"] += 1
+                    sections["reused" if payload["reused"] else "analysed"] += 1
+                yield f"event: {kind}\ndata: {json.dumps(payload)}\n\n"
+            
+            total_ms = round((time.monotonic() - start) * 1000)
+            print(f"Suggestions streamed in {total_ms}ms, first suggestion after {first_suggestion_ms}ms")
+            suggestions.sort(key=lambda s: s["offset"]["start"])
+            yield f"data: {json.dumps({'text': '', 'suggestions': suggestions, 'sections': sections, 'firstSuggestionMs': first_suggestion_ms, 'totalMs': total_ms, 'complete': True})}\n\n"
+        except Exception as e:
+            print(f"Error streaming suggestions: {str(e)}")
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+    
+    return Response(generate(), content_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+        'Connection': 'keep-alive'
+    })
+
 def route_export_resume():
     """
     Route: /export_resume
@@ -203,9 +211,15 @@ def route_export_resume():
                     download_name='resume.docx'
                 )
         elif export_format == 'pdf':
-            # PDF export would require additional libraries like ReportLab
-            # This is a placeholder for PDF generation functionality
-            return jsonify({"error": "PDF export not yet implemented"}), 501
+            output = generate_pdf_from_html(resume_html)
+            if output:
+                # send_file streams straight from the render buffer, without another copy
+                return send_file(
+                    output,
+                    mimetype='application/pdf',
+                    as_attachment=True,
+                    download_name='resume.pdf'
+                )
         else:
             return jsonify({"error": "Unsupported export format"}), 400
             
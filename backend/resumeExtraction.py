@@ -0,0 +1,237 @@
+"""
+Resume Extraction
+
+Turns an uploaded resume (DOCX or PDF) into plain text, HTML and a list of
+sections, caching the result under the SHA-256 of the uploaded bytes.
+Users re-upload the same resume for every job they analyze, so repeat
+uploads skip parsing entirely, and /analyze_resume, /parse_resume and the
+matching routes all share one parse of each file.
+
+DOCX files are converted to HTML by mammoth once; the plain text is taken
+from that HTML rather than from a second pass over the document. PDFs go
+through pdfExtraction (page-parallel, stopping at a character budget).
+
+The cache is an in-process LRU bounded both by entry count and by the total
+size of the cached text and HTML. Uploads larger than MAX_UPLOAD_BYTES are
+rejected before hashing.
+"""
+
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+
+import mammoth
+
+from pdfExtraction import extract_pdf
+
+FORMATS = {".docx": "docx", ".pdf": "pdf"}
+
+# Headings that start a resume section when they appear on a line of their own
+SECTION_HEADINGS = {
+    "summary", "profile", "professional summary", "objective", "about", "about me",
+    "experience", "work experience", "professional experience", "employment", "employment history",
+    "education", "skills", "technical skills", "core competencies", "projects", "personal projects",
+    "certifications", "certificates", "awards", "honors", "publications", "volunteer",
+    "volunteer experience", "leadership", "activities", "interests", "languages", "references",
+}
+MAX_HEADING_CHARS = 40
+
+BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "tr", "table", "ul", "ol", "br"}
+
+
+class _TextExtractor(HTMLParser):
+    """Plain text of mammoth's HTML, one paragraph per block element"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self._current = []
+
+    def _end_block(self):
+        text = "".join(self._current).strip()
+        if text:
+            self.blocks.append(text)
+        self._current = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._end_block()
+
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS:
+            self._end_block()
+
+    def handle_data(self, data):
+        self._current.append(data)
+
+    def close(self):
+        super().close()
+        self._end_block()
+
+
+def html_to_text(html):
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return "\n\n".join(parser.blocks)
+
+
+def is_heading(line):
+    line = line.strip().rstrip(":")
+    if not line or len(line) > MAX_HEADING_CHARS:
+        return False
+    return line.lower() in SECTION_HEADINGS or (line.isupper() and any(c.isalpha() for c in line))
+
+
+def split_sections(text):
+    """
+    [{"title", "text"}] for each section of the resume, in order. Text before
+    the first heading (usually name and contact details) has the title "".
+    """
+    sections = []
+    title, lines = "", []
+    for line in text.splitlines():
+        if is_heading(line):
+            body = "\n".join(lines).strip()
+            if body or title:
+                sections.append({"title": title, "text": body})
+            title, lines = line.strip().rstrip(":"), []
+        else:
+            lines.append(line)
+    body = "\n".join(lines).strip()
+    if body or title:
+        sections.append({"title": title, "text": body})
+    return sections
+
+
+def _parse(data, fmt):
+    if fmt == "docx":
+        result = mammoth.convert_to_html(io.BytesIO(data))
+        html = result.value
+        text = html_to_text(html)
+        messages = [
+            {"type": getattr(message, "type", "warning"), "message": getattr(message, "message", str(message))}
+            for message in result.messages
+        ]
+    else:
+        pdf = extract_pdf(data)
+        text = pdf["text"]
+        html = None
+        messages = []
+        if pdf["truncated"]:
+            messages.append({
+                "type": "warning",
+                "message": f"Text was cut off at page {pdf['pages_read']} of {pdf['pages']} to fit the character budget",
+            })
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return {"text": text, "html": html, "sections": split_sections(text), "messages": messages}
+
+
+class ResumeExtractor:
+    """
+    Parameters:
+        max_entries: Most resumes kept in the cache
+        max_bytes: Most characters of text and HTML kept in the cache
+        max_upload_bytes: Largest accepted upload
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, max_upload_bytes=10 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_upload_bytes = max_upload_bytes
+        self._items = OrderedDict()  # sha256 -> extraction
+        self._size = 0
+        self._lock = threading.Lock()
+        self._in_flight = {}  # sha256 -> Event, so concurrent uploads of one file parse it once
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "rejected": 0}
+
+    @staticmethod
+    def _entry_size(entry):
+        return len(entry["text"]) + len(entry["html"] or "") + sum(len(s["text"]) for s in entry["sections"])
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+                self._counters["hits"] += 1
+            return entry
+
+    def _put(self, key, entry):
+        size = self._entry_size(entry)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            self._items[key] = entry
+            self._size += size
+            while len(self._items) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= self._entry_size(evicted)
+                self._counters["evictions"] += 1
+
+    def extract(self, data, filename):
+        """
+        Text, HTML and sections of a resume file.
+
+        Returns {"sha256", "format", "text", "html", "sections", "messages",
+        "cached"}; "html" is None for PDFs. Raises ValueError for unsupported
+        formats and oversized uploads.
+        """
+        fmt = FORMATS.get(os.path.splitext(filename or "")[1].lower())
+        if fmt is None:
+            raise ValueError("Unsupported file format. Please upload a PDF or DOCX file.")
+        if len(data) > self.max_upload_bytes:
+            with self._lock:
+                self._counters["rejected"] += 1
+            raise ValueError(f"Resume file is too large (limit {self.max_upload_bytes // (1024 * 1024)} MB)")
+
+        key = hashlib.sha256(data).hexdigest()
+        while True:
+            entry = self._get(key)
+            if entry is not None:
+                return dict(entry, cached=True)
+            with self._lock:
+                pending = self._in_flight.get(key)
+                if pending is None:
+                    self._in_flight[key] = threading.Event()
+                    self._counters["misses"] += 1
+                    break
+            pending.wait()
+
+        try:
+            entry = dict(_parse(data, fmt), sha256=key, format=fmt)
+            self._put(key, entry)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key).set()
+        return dict(entry, cached=False)
+
+    def extract_upload(self, resume_file):
+        """extract() for a werkzeug FileStorage upload"""
+        return self.extract(resume_file.read(), resume_file.filename)
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._items),
+                "bytes": self._size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+resume_extractor = ResumeExtractor(
+    max_entries=int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "256")),
+    max_bytes=int(os.getenv("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    max_upload_bytes=int(os.getenv("RESUME_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024))),
+)
+
+
+def extract_resume_text(resume_file):
+    """Plain text of an uploaded PDF or DOCX resume; raises ValueError for other formats"""
+    return resume_extractor.extract_upload(resume_file)["text"]
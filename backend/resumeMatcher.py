@@ -0,0 +1,173 @@
+"""
+Resume Matcher
+
+Deterministic, local scoring of a resume against an analyzed job posting,
+computed in milliseconds instead of asking the LLM for numbers that change
+on every call.
+
+Both texts are tokenized and normalized (lowercase, common suffixes
+stripped, skill aliases such as "k8s" -> "kubernetes" resolved). Then:
+
+- Each job keyword is matched as a phrase against the resume and weighted
+  by how often the job mentions it.
+- Each requirement is scored by how much of its IDF-weighted vocabulary
+  the resume covers (BM25's IDF, with requirements as the documents);
+  terms that appear in many requirements ("experience", "team") count for
+  less than distinctive ones.
+
+The compatibility score blends keyword and requirement coverage.
+"""
+
+import math
+import time
+
+from jobExtraction import tokenize, skill_matcher, SKILL_ALIASES
+
+STOPWORDS = set("""
+a about above after all also an and any are as at be been being both but by can could
+do does each etc for from has have having how if in including into is it its may more
+most must no not of on or other our over per plus preferred required should so some
+such than that the their them then there these they this those through to under up
+using via we well what when where which while who will with within would you your
+ability able strong excellent good knowledge understanding experience experienced
+years year work working skills skill proven demonstrated solid familiarity familiar
+""".split())
+
+KEYWORD_WEIGHT = 0.6
+REQUIREMENT_WEIGHT = 0.4
+
+
+def _stem(token):
+    """Strip the common English suffixes that make the same skill look different"""
+    if not token.isalpha():
+        return token  # node.js, c++, c#
+    if len(token) > 5 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 4 and token.endswith("ed"):
+        return token[:-2]
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def normalize(text, skip=()):
+    """Tokens of the text with aliases resolved and suffixes stripped, leaving out `skip` words"""
+    tokens = []
+    for token in tokenize(text):
+        if token in skip:
+            continue
+        # Jobs and resumes are both normalized here, so an alias on one side meets its canonical spelling
+        alias = SKILL_ALIASES.get(token)
+        if alias is not None:
+            tokens.extend(_stem(part) for part in alias.split())
+        else:
+            tokens.append(_stem(token))
+    return tokens
+
+
+def content_terms(text):
+    return [token for token in normalize(text, skip=STOPWORDS) if len(token) > 1]
+
+
+class ResumeProfile:
+    """A resume's normalized tokens, prepared once and matched against many jobs"""
+
+    def __init__(self, resume_text):
+        self.tokens = normalize(resume_text)
+        self.term_counts = {}
+        for token in self.tokens:
+            self.term_counts[token] = self.term_counts.get(token, 0) + 1
+        self._phrases = {}
+        for i, token in enumerate(self.tokens):
+            self._phrases.setdefault(token, []).append(i)
+
+    def contains_phrase(self, phrase):
+        if not phrase:
+            return False
+        for start in self._phrases.get(phrase[0], ()):
+            if self.tokens[start:start + len(phrase)] == phrase:
+                return True
+        return False
+
+    def has_term(self, term):
+        return term in self.term_counts
+
+
+def job_keywords(job_details):
+    """The job's keywords, or the known skills named in its requirements if it has none"""
+    keywords = [k for k in job_details.get("keywords") or [] if isinstance(k, str) and k.strip()]
+    if keywords:
+        return keywords
+    text = "\n".join(job_details.get("requirements") or []) + "\n" + (job_details.get("description") or "")
+    return skill_matcher.find(text)
+
+
+def match_resume(job_details, resume_text):
+    """
+    Score a resume against a job.
+
+    Returns {"compatibilityScore", "matchedKeywords", "missingKeywords",
+    "keywordCoverage", "requirementCoverage", "requirements", "elapsedMs"}
+    where "requirements" lists each requirement with its 0..1 coverage.
+    """
+    start = time.perf_counter()
+    resume = resume_text if isinstance(resume_text, ResumeProfile) else ResumeProfile(resume_text)
+
+    requirements = [r for r in job_details.get("requirements") or [] if isinstance(r, str) and r.strip()]
+    responsibilities = [r for r in job_details.get("responsibilities") or [] if isinstance(r, str) and r.strip()]
+    job_text_terms = normalize(" ".join(requirements + responsibilities + [job_details.get("description") or ""]))
+
+    # Keywords: phrase match, weighted by how often the job mentions them
+    matched, missing = [], []
+    matched_weight = total_weight = 0.0
+    for keyword in job_keywords(job_details):
+        phrase = normalize(keyword)
+        if not phrase:
+            continue
+        mentions = sum(1 for i in range(len(job_text_terms)) if job_text_terms[i:i + len(phrase)] == phrase)
+        weight = 1.0 + math.log1p(mentions)
+        total_weight += weight
+        if resume.contains_phrase(phrase):
+            matched.append(keyword)
+            matched_weight += weight
+        else:
+            missing.append(keyword)
+    keyword_coverage = matched_weight / total_weight if total_weight else None
+
+    # Requirements: IDF-weighted share of each requirement's distinctive terms present in the resume
+    items = [set(content_terms(text)) for text in requirements]
+    document_frequency = {}
+    for terms in items:
+        for term in terms:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+    n = len(items)
+
+    scored_requirements = []
+    for text, terms in zip(requirements, items):
+        if not terms:
+            continue
+        idf = {term: math.log(1 + (n - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5)) for term in terms}
+        total = sum(idf.values())
+        covered = sum(weight for term, weight in idf.items() if resume.has_term(term))
+        scored_requirements.append({"text": text, "coverage": round(covered / total, 3) if total else 0.0})
+    requirement_coverage = (
+        sum(item["coverage"] for item in scored_requirements) / len(scored_requirements)
+        if scored_requirements else None
+    )
+
+    if keyword_coverage is not None and requirement_coverage is not None:
+        score = KEYWORD_WEIGHT * keyword_coverage + REQUIREMENT_WEIGHT * requirement_coverage
+    else:
+        score = keyword_coverage if keyword_coverage is not None else requirement_coverage or 0.0
+
+    return {
+        "compatibilityScore": int(round(score * 100)),
+        "matchedKeywords": matched,
+        "missingKeywords": missing,
+        "keywordCoverage": None if keyword_coverage is None else round(keyword_coverage, 3),
+        "requirementCoverage": None if requirement_coverage is None else round(requirement_coverage, 3),
+        "requirements": scored_requirements,
+        "elapsedMs": round((time.perf_counter() - start) * 1000, 2),
+    }
@@ -0,0 +1,431 @@
+"""
+Resume Sections
+
+Section-aware suggestions for the resume editor.
+
+The editor HTML is parsed (via htmlBlocks) into a tree of sections, each
+holding its nodes (sub-headings, paragraphs, bullets, table rows) with
+their character offsets and line numbers in the resume's plain text. Only
+that text is sent to the model, one request per section, fanned out in
+parallel; each section's prompt numbers its own nodes so that unrelated
+edits elsewhere do not change it.
+
+Suggestions from the model name the node and the exact words to replace,
+and are anchored back to real offsets. Results are cached per section hash
+(section text + job + model), so in the edit-resubmit loop only the
+sections that changed since the last request are analysed again.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from aiSummary import client
+from htmlBlocks import block_text, iter_blocks
+from llmCache import llm_cache
+from resumeExtraction import is_heading
+from streaming import IncrementalJsonParser
+
+DEFAULT_MODEL = "mistralai/mixtral-8x7b-instruct"
+SUGGESTION_TYPES = ("improvement", "keyword", "achievement")
+
+# Sections with less text than this are not analysed, nor is the name/contact header
+MIN_SECTION_CHARS = 40
+MAX_SUGGESTIONS_PER_SECTION = 4
+
+SECTION_CONCURRENCY = int(os.getenv("RESUME_SECTION_CONCURRENCY", "6"))
+_executor = ThreadPoolExecutor(max_workers=SECTION_CONCURRENCY, thread_name_prefix="resume-section")
+
+SYSTEM_PROMPT = f"""
+You are an expert resume reviewer. You will get one section of a resume,
+one item per line, each starting with an id such as [n2]. Respond ONLY with
+a JSON object of the form
+{{"suggestions": [{{"node": "n2", "type": "improvement" | "keyword" | "achievement",
+"original": "<exact words copied from that line>", "suggestion": "<replacement for those words>"}}]}}
+Give at most {MAX_SUGGESTIONS_PER_SECTION} suggestions, only where they clearly help: weak phrasing,
+missing job keywords, or achievements that could be quantified. Return
+{{"suggestions": []}} if the section is already strong.
+"""
+
+
+def _block_kind(block):
+    return {"heading": "heading", "list_item": "bullet", "table": "table"}.get(block["type"], "paragraph")
+
+
+def _section_level(blocks):
+    """
+    Heading level that starts sections: the most common level among the
+    headings after the first block (which is usually the name). Paragraphs
+    that read as headings ("EXPERIENCE", "Skills:") count as level 7.
+    """
+    levels = Counter()
+    for block in blocks[1:]:
+        level = _heading_level(block)
+        if level is not None:
+            levels[level] += 1
+    if not levels:
+        return None
+    return min(levels, key=lambda level: (-levels[level], level))
+
+
+def _heading_level(block):
+    if block["type"] == "heading":
+        return block["level"]
+    if block["type"] == "paragraph" and is_heading(block_text(block)):
+        return 7
+    return None
+
+
+def _section_hash(title, nodes):
+    payload = json.dumps([title, [node["text"] for node in nodes]], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_resume_tree(html):
+    """
+    Section tree of the editor HTML.
+
+    Returns {"text", "sections"}: "text" is the resume's plain text, one
+    line per block, and each section is {"id", "title", "header", "hash",
+    "nodes"} ("header" marks the name/contact block before the first
+    section heading) where nodes are {"id", "kind", "text", "start", "end", "line"} with
+    offsets into "text". Node ids ("n1", "n2", ...) are local to their
+    section; the section heading itself is node "n0".
+    """
+    blocks = [block for block in iter_blocks(html) if block["type"] != "rule"]
+    section_level = _section_level(blocks)
+
+    sections = []
+    # Text before the first section heading is the header, unless the resume has no headings at all
+    current = {"title": "", "nodes": [], "header": section_level is not None}
+    offset = line = 0
+    for index, block in enumerate(blocks):
+        text = block_text(block)
+        level = _heading_level(block)
+        starts_section = level is not None and section_level is not None and level <= section_level
+        if starts_section:
+            if current["nodes"]:
+                sections.append(current)
+            # A leading heading above the section level is the candidate's name
+            current = {"title": text, "nodes": [], "header": index == 0 and level < section_level}
+
+        current["nodes"].append({
+            "id": "n0" if starts_section else f"n{len(current['nodes']) + (0 if current['title'] else 1)}",
+            "kind": "heading" if starts_section else _block_kind(block),
+            "text": text,
+            "start": offset,
+            "end": offset + len(text),
+            "line": line,
+        })
+        offset += len(text) + 1
+        line += text.count("\n") + 1
+    if current["nodes"]:
+        sections.append(current)
+
+    for i, section in enumerate(sections):
+        section["id"] = f"s{i}"
+        section["hash"] = _section_hash(section["title"], section["nodes"])
+
+    return {"text": "\n".join(block_text(block) for block in blocks), "sections": sections}
+
+
+def _job_context(job_data):
+    if not job_data:
+        return ""
+    lines = [f"Target job: {job_data.get('title') or 'Not specified'}"]
+    if job_data.get("keywords"):
+        lines.append("Keywords: " + ", ".join(job_data["keywords"]))
+    if job_data.get("requirements"):
+        lines.append("Requirements: " + "; ".join(job_data["requirements"]))
+    return "\n".join(lines)
+
+
+def section_prompt(section, job_context):
+    """The text-only user prompt for one section"""
+    body = "\n".join(
+        f"[{node['id']}] {' '.join(node['text'].split())}"
+        for node in section["nodes"] if node["kind"] != "heading"
+    )
+    title = section["title"] or "Header"
+    return f"{job_context}\n\nSECTION: {title}\n{body}".strip()
+
+
+def _is_suggestion(item):
+    return isinstance(item, dict) and isinstance(item.get("suggestion"), str) and bool(item["suggestion"].strip())
+
+
+def _parse_suggestions(content):
+    """
+    Suggestions from a model answer: the first JSON object in it with a
+    "suggestions" key, so braces quoted in surrounding prose are skipped.
+    """
+    decoder = json.JSONDecoder()
+    for start in (i for i, char in enumerate(content) if char == "{"):
+        try:
+            result, _ = decoder.raw_decode(content, start)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(result, dict) and "suggestions" in result:
+            return [item for item in result["suggestions"] or [] if _is_suggestion(item)]
+    print(f"Could not parse section suggestions: {content[:200]}")
+    return []
+
+
+def _locate(node, original):
+    """(start, end) of `original` inside the node's text, or None"""
+    if not original:
+        return None
+    index = node["text"].find(original)
+    if index < 0:
+        index = node["text"].lower().find(original.lower())
+    if index < 0:
+        return None
+    return index, index + len(original)
+
+
+def anchor(section, item):
+    """Attach a model suggestion to its node and offsets in the current resume text"""
+    nodes = {node["id"]: node for node in section["nodes"]}
+    original = (item.get("original") or "").strip()
+    node = nodes.get(str(item.get("node", "")).strip("[]"))
+    span = _locate(node, original) if node else None
+    if span is None:
+        # The model named the wrong line; look for the words anywhere in the section
+        for candidate in section["nodes"]:
+            span = _locate(candidate, original)
+            if span:
+                node = candidate
+                break
+    if node is None:
+        node = next((n for n in section["nodes"] if n["kind"] != "heading"), section["nodes"][0])
+    start, end = span or (0, len(node["text"]))
+
+    line = node["line"] + node["text"].count("\n", 0, start)
+    line_start = node["text"].rfind("\n", 0, start) + 1
+    suggestion_type = item.get("type")
+    return {
+        "type": suggestion_type if suggestion_type in SUGGESTION_TYPES else "improvement",
+        "section": section["title"] or "general",
+        "original": node["text"][start:end] if span else original,
+        "suggestion": item["suggestion"].strip(),
+        "position": {"line": line, "ch": start - line_start},
+        "offset": {"start": node["start"] + start, "end": node["start"] + end},
+        "nodeId": f"{section['id']}.{node['id']}",
+        "anchored": span is not None,
+        "applied": False,
+    }
+
+
+class SectionSuggestionCache:
+    """Bounded LRU of model suggestions per section hash"""
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"reused": 0, "analysed": 0}
+
+    def get(self, key):
+        with self._lock:
+            items = self._items.get(key)
+            if items is not None:
+                self._items.move_to_end(key)
+                self._counters["reused"] += 1
+            return items
+
+    def set(self, key, items):
+        with self._lock:
+            self._counters["analysed"] += 1
+            self._items[key] = items
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "entries": len(self._items)}
+
+
+section_cache = SectionSuggestionCache(int(os.getenv("RESUME_SECTION_CACHE_SIZE", "2048")))
+
+
+def _analysable(section):
+    if section["header"]:
+        return False
+    return sum(len(node["text"]) for node in section["nodes"] if node["kind"] != "heading") >= MIN_SECTION_CHARS
+
+
+def _messages(section, job_context):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": section_prompt(section, job_context)},
+    ]
+
+
+def _analyse(section, job_context, model, use_cache):
+    content = llm_cache.complete(
+        client,
+        model,
+        _messages(section, job_context),
+        response_format={"type": "json_object"},
+        use_cache=use_cache,
+    )
+    return _parse_suggestions(content)
+
+
+def _analyse_streaming(section, job_context, model, use_cache, events, cancelled):
+    """
+    Stream one section's answer, putting ("item", section, item) on `events`
+    for each suggestion as soon as it closes, then ("done", section, items)
+    with the complete list, or ("error", section, message).
+    """
+    parts = []
+    parser = IncrementalJsonParser(max_depth=2)
+    stream = None
+    try:
+        stream = llm_cache.stream(client, model, _messages(section, job_context), use_cache=use_cache)
+        for chunk in stream:
+            if cancelled.is_set():
+                return
+            if not chunk.choices or not getattr(chunk.choices[0].delta, "content", None):
+                continue
+            delta = chunk.choices[0].delta.content
+            parts.append(delta)
+            for path, value in parser.feed(delta):
+                if path[0] == "suggestions" and len(path) == 2 and _is_suggestion(value):
+                    events.put(("item", section, value))
+
+        if parser.done and isinstance(parser.result.get("suggestions"), list):
+            items = [item for item in parser.result["suggestions"] if _is_suggestion(item)]
+        else:
+            # The parser stopped at an object quoted in prose, or gave up
+            items = _parse_suggestions("".join(parts))
+        events.put(("done", section, items))
+    except Exception as e:
+        print(f"Error analysing section {section['title']!r}: {str(e)}")
+        events.put(("error", section, str(e)))
+    finally:
+        if stream is not None and cancelled.is_set() and hasattr(stream, "close"):
+            stream.close()
+
+
+def iter_section_suggestions(resume_html, job_data=None, model=DEFAULT_MODEL, use_cache=True):
+    """
+    Yield (section, suggestions, reused) per analysable section: sections
+    whose hash is cached first, then the others as their model calls finish.
+    Suggestions are anchored to the current resume text.
+    """
+    tree = parse_resume_tree(resume_html)
+    job_context = _job_context(job_data)
+    context_hash = hashlib.sha256(f"{model}\n{job_context}".encode("utf-8")).hexdigest()[:16]
+
+    pending = {}
+    for section in tree["sections"]:
+        if not _analysable(section):
+            continue
+        key = f"{context_hash}:{section['hash']}"
+        items = section_cache.get(key) if use_cache else None
+        if items is not None:
+            yield section, [anchor(section, item) for item in items], True
+        else:
+            future = _executor.submit(_analyse, section, job_context, model, use_cache)
+            pending[future] = (section, key)
+
+    try:
+        for future in as_completed(pending):
+            section, key = pending[future]
+            try:
+                items = future.result()
+            except Exception as e:
+                print(f"Error analysing section {section['title']!r}: {str(e)}")
+                continue
+            section_cache.set(key, items)
+            yield section, [anchor(section, item) for item in items], False
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def suggest(resume_html, job_data=None, model=DEFAULT_MODEL, use_cache=True):
+    """
+    Suggestions for the whole resume, in document order.
+
+    Returns {"suggestions": [...], "sections": {"total", "analysed", "reused"}};
+    sections whose model call failed are left out of the counts.
+    """
+    results = []
+    analysed = reused = 0
+    for _, suggestions, was_reused in iter_section_suggestions(resume_html, job_data, model, use_cache):
+        results.extend(suggestions)
+        reused += was_reused
+        analysed += not was_reused
+
+    results.sort(key=lambda s: s["offset"]["start"])
+    for i, suggestion in enumerate(results, start=1):
+        suggestion["id"] = i
+    return {
+        "suggestions": results,
+        "sections": {"total": analysed + reused, "analysed": analysed, "reused": reused},
+    }
+
+
+def stream_suggestions(resume_html, job_data=None, model=DEFAULT_MODEL, use_cache=True):
+    """
+    Yield ("suggestion", suggestion) for each suggestion as soon as the
+    model has finished writing it, and ("section", {"id", "title",
+    "reused", "suggestions"[, "error"]}) as each section completes.
+    Suggestions get ids in the order they are yielded; sections whose
+    hash is cached are replayed first.
+    """
+    tree = parse_resume_tree(resume_html)
+    job_context = _job_context(job_data)
+    context_hash = hashlib.sha256(f"{model}\n{job_context}".encode("utf-8")).hexdigest()[:16]
+    next_id = 1
+
+    def numbered(suggestion):
+        nonlocal next_id
+        suggestion["id"] = next_id
+        next_id += 1
+        return suggestion
+
+    events = queue.Queue()
+    cancelled = threading.Event()
+    pending = {}  # section id -> (cache key, suggestions streamed so far)
+    for section in tree["sections"]:
+        if not _analysable(section):
+            continue
+        key = f"{context_hash}:{section['hash']}"
+        items = section_cache.get(key) if use_cache else None
+        if items is not None:
+            for item in items:
+                yield "suggestion", numbered(anchor(section, item))
+            yield "section", {"id": section["id"], "title": section["title"], "reused": True, "suggestions": len(items)}
+        else:
+            pending[section["id"]] = (key, 0)
+            _executor.submit(_analyse_streaming, section, job_context, model, use_cache, events, cancelled)
+
+    try:
+        while pending:
+            kind, section, payload = events.get()
+            key, streamed = pending[section["id"]]
+            if kind == "item":
+                pending[section["id"]] = (key, streamed + 1)
+                yield "suggestion", numbered(anchor(section, payload))
+                continue
+
+            del pending[section["id"]]
+            summary = {"id": section["id"], "title": section["title"], "reused": False}
+            if kind == "error":
+                yield "section", dict(summary, suggestions=streamed, error=payload)
+                continue
+            section_cache.set(key, payload)
+            # Suggestions the incremental parser could not deliver (e.g. the answer was wrapped in prose)
+            for item in payload[streamed:]:
+                yield "suggestion", numbered(anchor(section, item))
+            yield "section", dict(summary, suggestions=max(streamed, len(payload)))
+    finally:
+        cancelled.set()
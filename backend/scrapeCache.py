@@ -0,0 +1,205 @@
+"""
+Scrape Result Cache
+
+Disk-backed (SQLite) cache of scraped job postings keyed on a normalized URL,
+so that pasting the same LinkedIn/Indeed link twice does not relaunch the
+browser or call the LLM again. Each entry stores the raw HTML, the scraped
+`job_data` and the AI-enriched result for the model that produced it.
+
+Entries are fresh for SCRAPE_CACHE_TTL seconds. Stale entries fetched over
+plain HTTP keep their ETag/Last-Modified so they can be revalidated with a
+conditional request instead of being scraped again. The cache is capped at
+SCRAPE_CACHE_MAX_ENTRIES rows, evicting the least recently used first.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Query parameters that only identify the click, not the posting
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "_hsenc", "_hsmi",
+    "ref", "refid", "trk", "trkinfo", "trackingid", "lipi", "originalsubdomain",
+    "from", "tk", "vjs", "advn", "adid", "src", "source", "gh_src", "lever-source",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+
+def normalize_url(url):
+    """
+    Canonical form of a job URL: lowercase scheme and host, no fragment,
+    no tracking parameters, remaining parameters sorted, no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ""))
+
+
+class ScrapeCache:
+    """
+    SQLite-backed cache of scrape results.
+
+    Parameters:
+        path: Database file (created if missing)
+        ttl: Seconds an entry is served without revalidation
+        max_entries: LRU cap on the number of cached URLs
+    """
+
+    def __init__(self, path, ttl=86400, max_entries=1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0, "misses": 0, "revalidated": 0,
+            "merged_hits": 0, "merged_misses": 0, "evictions": 0,
+        }
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_cache (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                html TEXT,
+                job_data TEXT,
+                merged TEXT,
+                merged_model TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_scrape_cache_accessed ON scrape_cache (accessed_at)")
+        self._conn.commit()
+
+    def _count(self, key):
+        self._counters[key] += 1
+
+    def _is_fresh(self, row):
+        return time.time() - row["fetched_at"] < self.ttl
+
+    def get(self, url):
+        """
+        Look up a URL. Returns None if it was never cached, otherwise a
+        dictionary with the cached `job_data`, validators and a `fresh` flag.
+        Stale entries are returned too so the caller can revalidate them.
+        """
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM scrape_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or row["job_data"] is None:
+                self._count("misses")
+                return None
+
+            fresh = self._is_fresh(row)
+            self._count("hits" if fresh else "misses")
+            self._conn.execute("UPDATE scrape_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        return {
+            "url": row["url"],
+            "html": row["html"],
+            "job_data": json.loads(row["job_data"]),
+            "etag": row["etag"],
+            "last_modified": row["last_modified"],
+            "fresh": fresh,
+        }
+
+    def get_merged(self, url, model, count_miss=True):
+        """Return the AI-enriched result for `model` if the entry is still fresh"""
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT merged, merged_model, fetched_at FROM scrape_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row["merged"] is None or row["merged_model"] != model or not self._is_fresh(row):
+                if count_miss:
+                    self._count("merged_misses")
+                return None
+
+            self._count("merged_hits")
+            self._conn.execute("UPDATE scrape_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row["merged"])
+
+    def put_page(self, url, html, job_data, etag=None, last_modified=None):
+        """Store a freshly scraped page; any previous AI-enriched result is dropped"""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO scrape_cache
+                    (key, url, html, job_data, merged, merged_model, etag, last_modified, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, NULL, NULL, ?, ?, ?, ?)
+            """, (key, url, html, json.dumps(job_data), etag, last_modified, now, now))
+            self._evict()
+            self._conn.commit()
+
+    def put_merged(self, url, model, merged):
+        """Attach the AI-enriched result produced by `model` to a cached page"""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE scrape_cache SET merged = ?, merged_model = ?, accessed_at = ? WHERE key = ?",
+                (json.dumps(merged), model, now, key),
+            ).rowcount
+            if not updated:
+                # The page itself was not cacheable (e.g. scraped through a fallback path)
+                self._conn.execute("""
+                    INSERT INTO scrape_cache (key, url, merged, merged_model, fetched_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (key, url, json.dumps(merged), model, now, now))
+                self._evict()
+            self._conn.commit()
+
+    def mark_revalidated(self, url):
+        """The origin answered 304 Not Modified: the entry is fresh again"""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            self._count("revalidated")
+            self._conn.execute(
+                "UPDATE scrape_cache SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used rows beyond max_entries (caller holds the lock)"""
+        evicted = self._conn.execute("""
+            DELETE FROM scrape_cache WHERE key IN (
+                SELECT key FROM scrape_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,)).rowcount
+        self._counters["evictions"] += max(evicted, 0)
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM scrape_cache").fetchone()[0]
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["entries"] = entries
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+scrape_cache = ScrapeCache(
+    os.getenv("SCRAPE_CACHE_PATH", os.path.join(DATA_DIR, "scrape_cache.db")),
+    ttl=int(os.getenv("SCRAPE_CACHE_TTL", "86400")),
+    max_entries=int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "1000")),
+)
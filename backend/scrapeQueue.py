@@ -0,0 +1,152 @@
+"""
+Scrape Job Queue
+
+Runs the scrape + enrich pipeline on a bounded worker pool so HTTP handlers
+can return a job ID immediately instead of holding a worker for the whole
+browser launch and LLM call. Clients poll the job or subscribe to its
+progress events (fetched, parsed, enriched). Submissions for a URL that is
+already being scraped with the same model join the in-flight job rather
+than starting a second scrape.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from scrapeCache import normalize_url
+
+
+class ScrapeJobQueue:
+    """
+    Parameters:
+        pipeline: Callable(url, model, progress) returning the job data
+        max_workers: Number of scrapes allowed to run at once
+        retention: Seconds finished jobs stay available for polling
+    """
+
+    def __init__(self, pipeline, max_workers=4, retention=3600):
+        self.pipeline = pipeline
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape")
+        self._changed = threading.Condition()
+        self._jobs = {}
+        self._inflight = {}
+        self._counters = {"submitted": 0, "deduplicated": 0, "completed": 0, "failed": 0}
+
+    def submit(self, url, model):
+        """
+        Queue a scrape. Returns (job_id, deduplicated) where `deduplicated`
+        is True if an identical in-flight job was reused.
+        """
+        key = (normalize_url(url), model)
+        with self._changed:
+            self._prune()
+            self._counters["submitted"] += 1
+
+            job_id = self._inflight.get(key)
+            if job_id is not None:
+                self._counters["deduplicated"] += 1
+                return job_id, True
+
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            self._jobs[job_id] = {
+                "id": job_id,
+                "url": url,
+                "model": model,
+                "status": "queued",
+                "events": [{"stage": "queued", "time": now}],
+                "result": None,
+                "error": None,
+                "created_at": now,
+                "finished_at": None,
+            }
+            self._inflight[key] = job_id
+
+        self._executor.submit(self._run, job_id, key)
+        return job_id, False
+
+    def _add_event(self, job_id, stage):
+        with self._changed:
+            self._jobs[job_id]["events"].append({"stage": stage, "time": time.time()})
+            self._changed.notify_all()
+
+    def _run(self, job_id, key):
+        job = self._jobs[job_id]
+        with self._changed:
+            job["status"] = "running"
+        self._add_event(job_id, "running")
+
+        try:
+            result = self.pipeline(job["url"], job["model"], lambda stage: self._add_event(job_id, stage))
+            with self._changed:
+                job["status"] = "done"
+                job["result"] = result
+                self._counters["completed"] += 1
+        except Exception as e:
+            print(f"Scrape job {job_id} failed: {str(e)}")
+            with self._changed:
+                job["status"] = "failed"
+                job["error"] = str(e)
+                self._counters["failed"] += 1
+        finally:
+            with self._changed:
+                job["finished_at"] = time.time()
+                job["events"].append({"stage": job["status"], "time": job["finished_at"]})
+                self._inflight.pop(key, None)
+                self._changed.notify_all()
+
+    def _prune(self):
+        """Forget finished jobs older than the retention window (caller holds the lock)"""
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        """Snapshot of a job's state, or None if it is unknown or expired"""
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot["events"] = list(job["events"])
+            snapshot["stage"] = job["events"][-1]["stage"]
+        return snapshot
+
+    def events(self, job_id, timeout=300):
+        """
+        Yield a job's progress events as they happen, starting from the first,
+        until it finishes or `timeout` seconds pass without it finishing.
+        """
+        deadline = time.monotonic() + timeout
+        sent = 0
+        while True:
+            with self._changed:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                while sent == len(job["events"]) and job["finished_at"] is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return
+                    self._changed.wait(remaining)
+                new_events = job["events"][sent:]
+                finished = job["finished_at"] is not None
+
+            for event in new_events:
+                yield event
+            sent += len(new_events)
+            if finished:
+                return
+
+    def stats(self):
+        with self._changed:
+            stats = dict(self._counters)
+            stats["active"] = len(self._inflight)
+            stats["tracked"] = len(self._jobs)
+        return stats
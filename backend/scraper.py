@@ -1,17 +1,24 @@
-import re 
 import os 
-import time
-import requests
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv
 import json
+from fetcher import fetch_page, fetch_with_requests
+from parsedPage import html_to_text
+from scrapeCache import scrape_cache
+from promptBudget import prepare
+from jobExtraction import (
+    REQUIREMENTS_PATTERNS, RESPONSIBILITIES_PATTERNS, extract_salary, extract_section_items, skill_matcher
+)
 
 # Load environment variables
 load_dotenv()
 
+GEMINI_MODEL = "google/gemini-2.0-flash-lite-001"
+# Token budget for a description built from the full page text (about 5000 characters)
+DESCRIPTION_TOKENS = 1200
+
 def configure_driver():
     """Configure and return a Selenium Chrome driver with anti-detection settings"""
     try:
@@ -27,13 +34,17 @@ def configure_driver():
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         
+        # Return from driver.get() at DOMContentLoaded; wait_for_page decides when the posting is ready
+        options.page_load_strategy = 'eager'
+        
         # Try headless first, but if it fails we'll try again with headless disabled
         options.add_argument('--headless=new')  # Use the newer headless mode
         
         # Add these options to prevent common Chrome issues
         options.add_argument('--disable-gpu')
         options.add_argument('--disable-software-rasterizer')
-        options.add_argument('--remote-debugging-port=9222')
+        # Let Chrome pick a free port so several pooled browsers can run side by side
+        options.add_argument('--remote-debugging-port=0')
         
         print("Setting up Chrome WebDriver...")
         
@@ -105,7 +116,9 @@ def analyze_with_gemini(url, page_content):
         Ensure all arrays contain at least 3-5 items. Be concise but accurate.
         """
         
-        # Format the user prompt with the job information
+        # Format the user prompt with the job information, without the page's
+        # navigation and legal boilerplate and within the model's token budget
+        page_content = prepare(page_content, GEMINI_MODEL, label="page analysis")
         user_prompt = f"""
         Here is a job posting from {url}:
         
@@ -116,7 +129,7 @@ def analyze_with_gemini(url, page_content):
         
         # Call Gemini API
         response = client.chat.completions.create(
-            model="google/gemini-2.0-flash-lite-001",
+            model=GEMINI_MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -142,33 +155,38 @@ def analyze_with_gemini(url, page_content):
             "keywords": ["Skills", "Experience"]
         }
 
-def scrape_job_posting(url):
+def scrape_job_posting(url, progress=None):
     """
     Scrape a job posting from the given URL and return the structured data
     Returns a dictionary with job details
+    `progress`, if given, is called with "fetched" and "parsed" as those stages finish
     """
-    driver = None
+    report = progress or (lambda stage: None)
+    page = None
     try:
         print(f"Scraping job posting from: {url}")
         
-        # First, try with Selenium
-        try:
-            driver = configure_driver()
-            driver.get(url)
-            time.sleep(3)  # Wait for page to load
-            
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            page_content = soup.get_text()
-        except Exception as selenium_error:
-            print(f"Selenium error: {str(selenium_error)}")
-            print("Falling back to requests library...")
-            
-            # Fall back to requests if Selenium fails
-            soup = fetch_with_requests(url)
-            if soup is None:
-                raise Exception("Failed to fetch page with both Selenium and requests")
-            
-            page_content = soup.get_text()
+        # Serve repeat URLs from the cache, revalidating stale entries when we have validators
+        cached = scrape_cache.get(url)
+        if cached and cached["fresh"]:
+            print("Returning cached scrape result")
+            return cached["job_data"]
+        
+        # Plain HTTP first, escalating to a pooled headless browser only when needed
+        if cached:
+            fetched = fetch_page(url, etag=cached["etag"], last_modified=cached["last_modified"])
+        else:
+            fetched = fetch_page(url)
+        
+        if fetched.get("not_modified"):
+            print("Page not modified since it was cached")
+            scrape_cache.mark_revalidated(url)
+            return cached["job_data"]
+        
+        page = fetched["page"]
+        print(f"Fetched page via {fetched['source']} (parsed with {page.backend})")
+        report("fetched")
+        page_content = page.text
         
         # Job posting data dictionary
         job_data = {
@@ -183,123 +201,43 @@ def scrape_job_posting(url):
         }
         
         # Extract job details based on common patterns across job sites
-        # Try to get the job title
-        title_candidates = [
-            soup.find('h1', {'data-testid': 'jobsearch-JobInfoHeader-title'}),  # Indeed
-            soup.find('h1', {'class': 'top-card-layout__title'}),  # LinkedIn
-            soup.find('h1', {'class': 'jobsearch-JobInfoHeader-title'}),  # Indeed alternative
-            soup.find('h1'),  # Generic fallback
-        ]
-        
-        for candidate in title_candidates:
-            if candidate and candidate.text.strip():
-                job_data["title"] = candidate.text.strip()
-                break
-        
-        # Try to get the company name
-        company_candidates = [
-            soup.find('div', {'data-testid': 'inlineHeader-companyName'}),  # Indeed
-            soup.find('a', {'class': 'topcard__org-name-link'}),  # LinkedIn
-            soup.find('div', {'class': 'company-name'}),  # Generic
-            soup.find('div', {'class': 'JobInfoHeader-company-location'}),  # Alternative
-        ]
-        
-        for candidate in company_candidates:
-            if candidate:
-                if candidate.find('a'):
-                    job_data["company"] = candidate.find('a').get_text(strip=True)
-                    break
-                elif candidate.text.strip():
-                    job_data["company"] = candidate.text.strip()
-                    break
-        
-        # Try to get the location
-        location_candidates = [
-            soup.find('div', {'data-testid': 'inlineHeader-companyLocation'}),  # Indeed
-            soup.find('span', {'class': 'topcard__flavor--bullet'}),  # LinkedIn
-            soup.find('div', {'class': 'location'}),  # Generic
-        ]
+        # (title, company, location and description candidates are resolved in one pass)
+        for key, value in page.fields().items():
+            job_data[key] = value
         
-        for candidate in location_candidates:
-            if candidate and candidate.text.strip():
-                job_data["location"] = candidate.text.strip()
-                break
-        
-        # Try to get the job description
-        description_candidates = [
-            soup.find('div', {'id': 'jobDescriptionText'}),  # Indeed
-            soup.find('div', {'class': 'description__text'}),  # LinkedIn
-            soup.find('div', {'class': 'jobDetailsHeader-descriptionDetails'}),  # Other
-        ]
-        
-        description_text = ""
-        for candidate in description_candidates:
-            if candidate:
-                description_text = candidate.get_text(strip=True)
-                if description_text:
-                    job_data["description"] = description_text
-                    break
+        # ATS pages (Workday, Greenhouse, ...) often embed the posting as schema.org JSON-LD
+        if not job_data["description"]:
+            job_posting = page.json_ld_job()
+            if job_posting and job_posting.get("description"):
+                job_data["description"] = html_to_text(job_posting["description"])
         
         # If we couldn't get a proper description, use the full page text
         if not job_data["description"] and page_content:
             print("Using full page content as description")
-            # Take first 5000 characters as description to avoid overwhelming the AI
-            job_data["description"] = page_content[:5000] + "..." if len(page_content) > 5000 else page_content
-        
-        # For salary, we'll use regex to search in the full text
-        salary_pattern = r'\$[\d,.]+\s*(?:to|–|-)\s*\$[\d,.]+|\$[\d,.]+\s*(?:per|an?|/)\s*(?:hour|year|month|annum|yr)'
-        salary_match = re.search(salary_pattern, str(soup))
-        if salary_match:
-            job_data["salary"] = salary_match.group(0)
-        
-        # Extract full page text for parsing requirements and responsibilities
-        full_text = soup.get_text()
+            # Strip the page's boilerplate and keep the requirement/responsibility text within budget
+            job_data["description"] = prepare(page_content, max_tokens=DESCRIPTION_TOKENS, label="page description")
         
-        # Look for requirements sections
-        requirements_section = None
-        for section in ["Requirements", "Qualifications", "What You'll Need", "Skills"]:
-            pattern = re.compile(f"{section}:?.*?(?=\n\n|\Z)", re.DOTALL | re.IGNORECASE)
-            match = pattern.search(full_text)
-            if match:
-                requirements_section = match.group(0)
-                break
+        # The page text is computed once and shared by salary, sections and skills
+        full_text = page_content
         
-        if requirements_section:
-            # Extract bullet points or numbered items
-            requirements = re.findall(r'[•\-\*\d+\.]\s*(.*?)(?=\n[•\-\*\d+\.]|\Z)', requirements_section)
-            if requirements:
-                job_data["requirements"] = [req.strip() for req in requirements if req.strip()]
+        # Salary is found with a regex over the text (not the serialized markup)
+        salary = extract_salary(full_text)
+        if salary:
+            job_data["salary"] = salary
         
-        # Look for responsibilities sections
-        responsibilities_section = None
-        for section in ["Responsibilities", "Duties", "What You'll Do", "The Role"]:
-            pattern = re.compile(f"{section}:?.*?(?=\n\n|\Z)", re.DOTALL | re.IGNORECASE)
-            match = pattern.search(full_text)
-            if match:
-                responsibilities_section = match.group(0)
-                break
+        # Look for requirements and responsibilities sections and pull out their bullet points
+        requirements = extract_section_items(full_text, REQUIREMENTS_PATTERNS)
+        if requirements:
+            job_data["requirements"] = requirements
         
-        if responsibilities_section:
-            # Extract bullet points or numbered items
-            responsibilities = re.findall(r'[•\-\*\d+\.]\s*(.*?)(?=\n[•\-\*\d+\.]|\Z)', responsibilities_section)
-            if responsibilities:
-                job_data["responsibilities"] = [resp.strip() for resp in responsibilities if resp.strip()]
+        responsibilities = extract_section_items(full_text, RESPONSIBILITIES_PATTERNS)
+        if responsibilities:
+            job_data["responsibilities"] = responsibilities
         
-        # Extract keywords/skills from description
-        common_skills = [
-            "Python", "Java", "JavaScript", "HTML", "CSS", "SQL", "React", "Angular",
-            "Node.js", "PHP", "C#", "C++", "Ruby", "Swift", "Kotlin", "AWS", "Azure",
-            "Docker", "Kubernetes", "Excel", "Word", "PowerPoint", "Tableau", "Power BI",
-            "Agile", "Scrum", "Project Management", "Marketing", "Sales", "Communication",
-            "Leadership", "Management", "Customer Service", "Accounting", "Finance"
-        ]
+        # Extract keywords/skills from the text in a single pass
+        job_data["keywords"] = skill_matcher.find(full_text)
         
-        keywords = []
-        for skill in common_skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', full_text, re.IGNORECASE):
-                keywords.append(skill)
-        
-        job_data["keywords"] = keywords
+        report("parsed")
         
         # Check if we got meaningful data from scraping
         if (job_data["title"] == "Unknown Title" or 
@@ -310,7 +248,7 @@ def scrape_job_posting(url):
             print("Scraping didn't yield complete results, using Gemini API as complete fallback...")
             # Ensure we have at least a partial description to send to the API
             if not job_data["description"] and page_content:
-                job_data["description"] = page_content[:5000] + "..." if len(page_content) > 5000 else page_content
+                job_data["description"] = prepare(page_content, max_tokens=DESCRIPTION_TOKENS, label="page description")
                 
             gemini_data = analyze_with_gemini(url, job_data["description"])
             
@@ -322,6 +260,7 @@ def scrape_job_posting(url):
                     elif isinstance(job_data[key], str) and (not job_data[key] or job_data[key] in ["Unknown Title", "Unknown Company", "Unknown Location", "Not specified"]):
                         job_data[key] = gemini_data[key]
         
+        scrape_cache.put_page(url, fetched["html"], job_data, fetched.get("etag"), fetched.get("last_modified"))
         return job_data
         
     except Exception as e:
@@ -331,18 +270,18 @@ def scrape_job_posting(url):
         try:
             page_content = ""
             
-            # Try to get content from Selenium if driver exists
-            if driver:
+            # Reuse the page we already parsed, if any
+            if page is not None:
                 try:
-                    page_content = BeautifulSoup(driver.page_source, "html.parser").get_text()
+                    page_content = page.text
                 except:
                     pass
             
-            # If we couldn't get content from Selenium, try requests
+            # If we don't have the page yet, try requests
             if not page_content:
-                soup = fetch_with_requests(url)
-                if soup:
-                    page_content = soup.get_text()
+                page = fetch_with_requests(url)
+                if page:
+                    page_content = page.text
             
             # If we got any content, try Gemini
             if page_content:
@@ -366,36 +305,3 @@ def scrape_job_posting(url):
                 "responsibilities": ["Could not extract responsibilities automatically."],
                 "keywords": ["Skills", "Experience"]
             }
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                print("Error closing WebDriver")
-
-def fetch_with_requests(url):
-    """
-    Fallback method to fetch a webpage using the requests library
-    Returns the page content as BeautifulSoup object
-    """
-    try:
-        print(f"Fetching {url} using requests library...")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Cache-Control': 'max-age=0'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            print("Successfully fetched page with requests")
-            return BeautifulSoup(response.text, 'html.parser')
-        else:
-            print(f"Failed to fetch with requests: Status code {response.status_code}")
-            return None
-    except Exception as e:
-        print(f"Error fetching with requests: {str(e)}")
-        return None
@@ -1,70 +1,80 @@
-from flask import Flask, request, jsonify, Response, send_file
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
-from aiSummary import stream_ai_summary, get_ai_resume_suggestions, AI_MODELS
+from aiSummary import stream_ai_summary, get_ai_resume_suggestions, AI_MODELS, gateway
 import json 
 import time
-import re
-import io
+import threading
 import os
-import pandas as pd
-import mammoth
-from PyPDF2 import PdfReader
-from scraper import scrape_job_posting  # Import the scraper function
-from resumeEditor import route_parse_resume, route_generate_suggestions, route_export_resume
+from driverPool import driver_pool_stats
+from fetcher import fetcher_stats
+from scrapeCache import scrape_cache
+from llmCache import llm_cache
+from scrapeQueue import ScrapeJobQueue
+from batchScraper import scrape_batch
+from jobPipeline import scrape_and_enrich, save_job_data
+from jobStore import job_store
+from resumeExtraction import extract_resume_text, resume_extractor
+from resumeMatcher import match_resume
+from jobRanker import job_ranker
+from embeddings import embedding_index, DUPLICATE_THRESHOLD
+from jobExport import export_jobs, FORMATS as EXPORT_FORMATS, PARQUET_AVAILABLE
+from streaming import IncrementalJsonParser, DeltaCoalescer, TICK, iter_with_ticks, parse_json_response
+from resumeEditor import route_parse_resume, route_generate_suggestions, route_generate_suggestions_stream, route_export_resume
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
-# In-memory storage for job data (for small-scale use)
-saved_jobs = []
+# Streamed text is sent in frames of at most this many seconds / characters
+STREAM_FRAME_INTERVAL = float(os.getenv("STREAM_FRAME_INTERVAL", "0.05"))
+STREAM_FRAME_CHARS = int(os.getenv("STREAM_FRAME_CHARS", "256"))
 
-def save_job_data(job_data):
-    """Save job data to the in-memory storage and return its ID"""
-    job_id = len(saved_jobs)
-    job_data['id'] = job_id
-    job_data['timestamp'] = time.strftime("%Y-%m-%d %H:%M:%S")
-    saved_jobs.append(job_data)
-    return job_id
+def job_filters():
+    """Saved-job filters from the query string, as accepted by job_store.query_jobs()"""
+    return {
+        'company': request.args.get('company'),
+        'keyword': request.args.get('keyword'),
+        'date_from': request.args.get('date_from'),
+        'date_to': request.args.get('date_to'),
+        'q': request.args.get('q'),
+    }
 
 @app.route('/export_excel', methods=['GET'])
 def export_excel():
     """Export saved job data as an Excel file"""
+    return export_saved_jobs('xlsx')
+
+@app.route('/export_jobs', methods=['GET'])
+def export_jobs_route():
+    """
+    Export saved jobs as format=xlsx (default), csv or parquet. Accepts the
+    same company/keyword/date_from/date_to/q filters as /get_saved_jobs.
+    """
+    return export_saved_jobs(request.args.get('format', 'xlsx').lower())
+
+def export_saved_jobs(fmt):
+    """Stream the filtered saved jobs in the given format as a chunked download"""
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    if fmt == 'parquet' and not PARQUET_AVAILABLE:
+        return jsonify({"error": "Parquet export requires pyarrow"}), 501
+
     try:
-        # If there are no saved jobs, return an error
-        if not saved_jobs:
+        filters = job_filters()
+        # If there are no matching saved jobs, return an error
+        if not job_store.query_jobs(limit=1, fields=['id'], **filters)['jobs']:
             return jsonify({"error": "No job data available to export"}), 404
         
-        # Create a DataFrame from the saved jobs
-        df = pd.DataFrame(saved_jobs)
-        
-        # Ensure requirements, responsibilities, and keywords are formatted properly for Excel
-        for col in ['requirements', 'responsibilities', 'keywords']:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: "\n• " + "\n• ".join(x) if isinstance(x, list) else x)
-        
-        # Create an in-memory Excel file
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(writer, sheet_name='Job Postings', index=False)
-            
-            # Auto-adjust column widths
-            worksheet = writer.sheets['Job Postings']
-            for i, col in enumerate(df.columns):
-                # Set column width based on content
-                max_width = max(df[col].astype(str).map(len).max(), len(col)) + 2
-                worksheet.set_column(i, i, min(max_width, 50))  # Cap at 50 characters width
-        
-        output.seek(0)
-        
-        return send_file(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name='job_postings.xlsx'
-        )
+        body = export_jobs(job_store.iter_jobs(**filters), fmt)
+        mimetype, filename = EXPORT_FORMATS[fmt]
+        return Response(body, mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename={filename}',
+            'X-Accel-Buffering': 'no',
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Error exporting Excel: {str(e)}")
-        return jsonify({"error": f"Failed to export Excel: {str(e)}"}), 500
+        print(f"Error exporting jobs: {str(e)}")
+        return jsonify({"error": f"Failed to export jobs: {str(e)}"}), 500
 
 @app.route('/save_job', methods=['POST'])
 def save_job():
@@ -82,14 +92,75 @@ def save_job():
 
 @app.route('/get_saved_jobs', methods=['GET'])
 def get_saved_jobs():
-    """Get all saved jobs"""
-    return jsonify(saved_jobs), 200
+    """
+    Get one page of saved jobs, newest first by default.
+
+    Query parameters: company, keyword, date_from, date_to, q (filters);
+    sort (timestamp|title|company|id), order (asc|desc), limit, cursor
+    (the previous page's next_cursor) and fields (comma-separated, e.g.
+    fields=title,company,timestamp to skip descriptions).
+    """
+    try:
+        page = job_store.query_jobs(
+            sort=request.args.get('sort', 'timestamp'),
+            order=request.args.get('order', 'desc').lower(),
+            limit=request.args.get('limit', 50, type=int),
+            cursor=request.args.get('cursor'),
+            fields=request.args.get('fields'),
+            **job_filters(),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(page), 200
+
+@app.route('/search_jobs', methods=['GET'])
+def search_jobs():
+    """
+    Full-text search over saved jobs.
+
+    Query parameters: q (required; the last word matches as a prefix),
+    keyword (restrict to jobs with this keyword, e.g. a facet the user
+    clicked), limit and offset.
+    """
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({"error": "q is required"}), 400
+
+    start = time.perf_counter()
+    try:
+        result = job_store.search(
+            q,
+            keyword=request.args.get('keyword'),
+            limit=request.args.get('limit', 20, type=int),
+            offset=request.args.get('offset', 0, type=int),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result["query"] = q
+    result["took_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return jsonify(result), 200
 
 @app.route('/get_ai_models', methods=['GET'])
 def get_ai_models():
     """Get all available AI models with pricing info"""
     return jsonify(AI_MODELS), 200
 
+@app.route('/stats', methods=['GET'])
+def get_stats():
+    """Get runtime metrics for the scraping pipeline"""
+    return jsonify({
+        "driver_pool": driver_pool_stats(),
+        "fetcher": fetcher_stats(),
+        "scrape_cache": scrape_cache.stats(),
+        "llm_cache": llm_cache.stats(),
+        "llm_gateway": gateway.stats(),
+        "job_store": job_store.stats(),
+        "job_ranker": job_ranker.stats(),
+        "embeddings": embedding_index.stats(),
+        "resume_extraction": resume_extractor.stats(),
+        "scrape_queue": scrape_queue.stats(),
+    }), 200
+
 @app.route('/analyze_job_posting', methods=['POST', 'GET'])
 def analyze_job_posting():
     print("Analyzing job posting")
@@ -101,41 +172,66 @@ def analyze_job_posting():
         data = request.json
         description = data.get('description')
         model = data.get('model', model)  # Get selected model
+        no_cache = bool(data.get('no_cache'))
     else:
         description = request.args.get('description')
         model = request.args.get('model', model)  # Get selected model from query params
+        no_cache = request.args.get('no_cache', '').lower() in ('1', 'true', 'yes')
     
     if not description:
         return jsonify({'error': 'Description is required'}), 400
     
     def generate():
-        summary = ""
+        summary_parts = []
+        parser = IncrementalJsonParser()
+        coalescer = DeltaCoalescer(max_interval=STREAM_FRAME_INTERVAL, max_chars=STREAM_FRAME_CHARS)
+        start = time.monotonic()
+        first_field_ms = None
+
         # Initial event to establish connection
-        yield f"data: {{\"text\": \"Starting analysis with {model}...\", \"complete\": false}}\n\n"
-        time.sleep(0.1)  # Small delay to ensure client receives initial message
+        yield f"data: {json.dumps({'text': f'Starting analysis with {model}...', 'complete': False})}\n\n"
         
         try:
-            ai_stream = stream_ai_summary(description, model=model)
-            for chunk in ai_stream:
+            ai_stream = stream_ai_summary(description, model=model, use_cache=not no_cache)
+            # Chunks are read on a background thread so buffered text goes out on time during a pause
+            for chunk in iter_with_ticks(ai_stream, coalescer.time_left):
+                if chunk is TICK:
+                    text = coalescer.flush()
+                    if text:
+                        yield f"data: {json.dumps({'text': text, 'complete': False})}\n\n"
+                    continue
                 if hasattr(chunk.choices[0].delta, 'content') and chunk.choices[0].delta.content:
                     delta = chunk.choices[0].delta.content
-                    summary += delta
-                    print(f"Streaming chunk: {delta}")
-                    yield f"data: {json.dumps({'text': delta, 'complete': False})}\n\n"
-                    time.sleep(0.01)  # Small delay to prevent overwhelming the client
+                    summary_parts.append(delta)
+                    fields = parser.feed(delta)
+
+                    # Send buffered text before any field it completes, so the two streams stay in order
+                    text = coalescer.add(delta)
+                    if fields and text is None:
+                        text = coalescer.flush()
+                    if text:
+                        yield f"data: {json.dumps({'text': text, 'complete': False})}\n\n"
+
+                    # Structured events use a named SSE event so plain "message" listeners ignore them
+                    for path, value in fields:
+                        if len(path) == 2 and not isinstance(path[1], int):
+                            continue  # keys of nested objects arrive with their parent
+                        if first_field_ms is None:
+                            first_field_ms = round((time.monotonic() - start) * 1000)
+                        event = {'field': path[0], 'value': value}
+                        if len(path) == 2:
+                            event['index'] = path[1]
+                        yield f"event: field\ndata: {json.dumps(event)}\n\n"
+
+            text = coalescer.flush()
+            if text:
+                yield f"data: {json.dumps({'text': text, 'complete': False})}\n\n"
+            summary = "".join(summary_parts)
+            print(f"Stream complete in {round((time.monotonic() - start) * 1000)}ms, first field after {first_field_ms}ms")
             
             # Clean up the summary response to ensure proper JSON
             try:
-                # Extract JSON object if embedded in text
-                json_match = re.search(r'(\{.*\})', summary, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(1)
-                    # Parse and re-serialize to ensure valid JSON
-                    json_obj = json.loads(json_str)
-                    clean_summary = json_obj
-                else:
-                    # If no JSON object found, try to parse the entire summary
-                    clean_summary = json.loads(summary)
+                clean_summary = parser.result if parser.done else parse_json_response(summary)
                 
                 # Ensure each required field exists
                 for field in ['title', 'company', 'requirements', 'responsibilities', 'keywords', 'location', 'salary']:
@@ -146,7 +242,6 @@ def analyze_job_posting():
                             clean_summary[field] = ""
                 
                 # Send final complete message with cleaned summary
-                print(f"Stream complete, sending cleaned summary")
                 yield f"data: {json.dumps({'text': '', 'summary': clean_summary, 'complete': True})}\n\n"
             except json.JSONDecodeError as je:
                 print(f"Error parsing JSON from summary: {je}")
@@ -177,132 +272,285 @@ def scrape_job_url():
         if not url:
             return jsonify({'error': 'URL is required'}), 400
         
+        # First, make a simple validation check on the URL
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        
         try:
-            # First, make a simple validation check on the URL
-            if not url.startswith(('http://', 'https://')):
-                url = 'https://' + url
-            
-            print(f"Starting to scrape URL: {url}")
-            
-            # Try to scrape the job posting
-            job_data = scrape_job_posting(url)
-            print(f"Scraped job data: {job_data.keys()}")
-            
-            # Always enhance with AI API if we have a description
-            if job_data.get("description"):
-                print(f"Enhancing scraped data with {model}...")
-                
-                # Use selected model to analyze the description
-                ai_stream = stream_ai_summary(job_data["description"], model=model)
-                summary = ""
-                for chunk in ai_stream:
-                    if hasattr(chunk.choices[0].delta, 'content') and chunk.choices[0].delta.content:
-                        delta = chunk.choices[0].delta.content
-                        summary += delta
-                
-                # Try to parse the AI-generated summary
-                try:
-                    # Extract JSON object if embedded in text
-                    json_match = re.search(r'(\{.*\})', summary, re.DOTALL)
-                    if json_match:
-                        json_str = json_match.group(1)
-                        ai_data = json.loads(json_str)
-                    else:
-                        ai_data = json.loads(summary)
-                    
-                    print("AI data:", ai_data.keys() if isinstance(ai_data, dict) else "Not a dictionary")
-                    
-                    # Merge AI data with scraped data, but keep scraped data if it's already populated
-                    if isinstance(ai_data, dict):
-                        for key in ai_data:
-                            # Only use AI data if the field is empty or minimal
-                            if key in job_data:
-                                if isinstance(job_data[key], list) and len(job_data[key]) == 0:
-                                    # Empty lists (requirements, responsibilities, keywords)
-                                    job_data[key] = ai_data[key]
-                                elif isinstance(job_data[key], str) and (not job_data[key] or job_data[key] in ["Unknown Title", "Unknown Company", "Unknown Location", "Not specified"]):
-                                    # Empty or default string values
-                                    job_data[key] = ai_data[key]
-                except Exception as e:
-                    print(f"Error processing AI data: {str(e)}")
-                    # If we can't get structured data from the AI, but still have an unstructured description,
-                    # try one more time with a more explicit prompt
-                    if not job_data["requirements"] or not job_data["responsibilities"]:
-                        try:
-                            print("Trying more explicit prompt for requirements/responsibilities...")
-                            # Create a more explicit prompt
-                            explicit_prompt = f"Extract the following information from this job posting:\n\n{job_data['description']}\n\nPlease return ONLY a JSON object with these keys: title, company, requirements (array), responsibilities (array), keywords (array), location, salary."
-                            
-                            # Call the AI again with this explicit prompt
-                            from aiSummary import client
-                            response = client.chat.completions.create(
-                                model=model,  # Use the selected model here too
-                                messages=[
-                                    {"role": "system", "content": "You are an expert job posting analyzer."},
-                                    {"role": "user", "content": explicit_prompt},
-                                ],
-                                response_format={"type": "json_object"},
-                            )
-                            
-                            ai_json = json.loads(response.choices[0].message.content)
-                            print("Got structured data from explicit prompt")
-                            
-                            # Fill in missing data
-                            for key in ai_json:
-                                if key in job_data:
-                                    if isinstance(job_data[key], list) and len(job_data[key]) == 0:
-                                        job_data[key] = ai_json[key]
-                                    elif isinstance(job_data[key], str) and (not job_data[key] or job_data[key] in ["Unknown Title", "Unknown Company", "Unknown Location", "Not specified"]):
-                                        job_data[key] = ai_json[key]
-                        except Exception as e2:
-                            print(f"Error in secondary AI attempt: {str(e2)}")
-            
-            # Final verification to ensure we have some minimum data
-            if not job_data.get("requirements") or len(job_data["requirements"]) == 0:
-                job_data["requirements"] = ["No specific requirements found. Please review the full job description."]
-            
-            if not job_data.get("responsibilities") or len(job_data["responsibilities"]) == 0:
-                job_data["responsibilities"] = ["No specific responsibilities found. Please review the full job description."]
-            
-            if not job_data.get("keywords") or len(job_data["keywords"]) == 0:
-                job_data["keywords"] = ["Skills", "Experience", "Communication"]
-            
-            # Add source URL to the job data
-            job_data["url"] = url
-            
-            print("Job analysis complete, returning data")
+            job_data = scrape_and_enrich(url, model)
             return jsonify(job_data), 200
         except Exception as scrape_error:
-            print(f"Error during scraping process: {str(scrape_error)}")
-            
-            # Try a direct AI analysis as a last resort
-            try:
-                from aiSummary import client
-                
-                print(f"Attempting direct URL analysis with {model}")
-                response = client.chat.completions.create(
-                    model=model,  # Use the selected model
-                    messages=[
-                        {"role": "system", "content": "You are an expert job posting analyzer."},
-                        {"role": "user", "content": f"Analyze this job posting URL: {url}\n\nExtract and return a JSON object with these keys: title, company, requirements (array), responsibilities (array), keywords (array), location, salary. If you can't access the URL directly, make educated guesses based on the URL itself."},
-                    ],
-                    response_format={"type": "json_object"},
-                )
-                
-                result = json.loads(response.choices[0].message.content)
-                # Add source URL to the result
-                result["url"] = url
-                print("Successfully got direct analysis")
-                return jsonify(result), 200
-            except Exception as ai_error:
-                print(f"Final fallback also failed: {str(ai_error)}")
-                return jsonify({
-                    'error': f'Failed to scrape job posting: {str(scrape_error)}. Additional error: {str(ai_error)}'
-                }), 500
+            return jsonify({'error': str(scrape_error)}), 500
     except Exception as e:
         print(f"Unhandled error in scrape_job_url endpoint: {str(e)}")
         return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
 
+# Background scrapes for /scrape_jobs (one worker per concurrent scrape)
+scrape_queue = ScrapeJobQueue(
+    scrape_and_enrich,
+    max_workers=int(os.getenv("SCRAPE_WORKERS", "4")),
+)
+
+@app.route('/scrape_jobs', methods=['POST'])
+def submit_scrape_job():
+    """
+    Queue a job posting URL for scraping and return a job ID immediately.
+    Poll /scrape_jobs/<job_id> or subscribe to /scrape_jobs/<job_id>/events for progress.
+    """
+    data = request.json or {}
+    url = data.get('url')
+    model = data.get('model', "mistralai/mixtral-8x7b-instruct")
+    
+    if not url:
+        return jsonify({'error': 'URL is required'}), 400
+    
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    
+    job_id, deduplicated = scrape_queue.submit(url, model)
+    return jsonify({"job_id": job_id, "deduplicated": deduplicated}), 202
+
+@app.route('/scrape_jobs/<job_id>', methods=['GET'])
+def get_scrape_job(job_id):
+    """Get the status, progress and (when done) result of a queued scrape"""
+    job = scrape_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job ID'}), 404
+    return jsonify(job), 200
+
+@app.route('/scrape_jobs/<job_id>/events', methods=['GET'])
+def stream_scrape_job(job_id):
+    """Stream a queued scrape's progress stages as server-sent events"""
+    if scrape_queue.get(job_id) is None:
+        return jsonify({'error': 'Unknown job ID'}), 404
+    
+    def generate():
+        for event in scrape_queue.events(job_id):
+            if event['stage'] not in ('done', 'failed'):
+                yield f"data: {json.dumps({'stage': event['stage'], 'complete': False})}\n\n"
+        
+        job = scrape_queue.get(job_id)
+        if job is None or job["status"] not in ("done", "failed"):
+            yield f"data: {json.dumps({'error': 'Timed out waiting for the scrape to finish'})}\n\n"
+        elif job["status"] == "failed":
+            yield f"data: {json.dumps({'error': job['error']})}\n\n"
+        else:
+            yield f"data: {json.dumps({'stage': 'done', 'result': job['result'], 'complete': True})}\n\n"
+    
+    return Response(generate(), content_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+        'Connection': 'keep-alive'
+    })
+
+@app.route('/scrape_batch', methods=['POST'])
+def scrape_batch_urls():
+    """
+    Scrape a list of job posting URLs with bounded, per-domain-polite concurrency.
+    Streams one JSON object per line as each URL completes, then a summary line.
+    """
+    data = request.json or {}
+    urls = data.get('urls') or []
+    model = data.get('model', "mistralai/mixtral-8x7b-instruct")
+    max_urls = int(os.getenv("BATCH_MAX_URLS", "1000"))
+    
+    if not isinstance(urls, list) or not urls:
+        return jsonify({'error': 'A non-empty list of URLs is required'}), 400
+    if not all(isinstance(url, str) and url.strip() for url in urls):
+        return jsonify({'error': 'Every URL must be a non-empty string'}), 400
+    if len(urls) > max_urls:
+        return jsonify({'error': f'At most {max_urls} URLs can be scraped in one batch'}), 400
+    
+    # Parsed before the response starts: a bad value must be a 400, not a broken stream
+    try:
+        concurrency = min(int(data.get('concurrency', 8)), 32)
+        per_domain = max(int(data.get('per_domain', 2)), 1)
+        delay = float(data.get('delay', 1.0))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'concurrency and per_domain must be integers and delay a number'}), 400
+    if concurrency < 1 or delay < 0:
+        return jsonify({'error': 'concurrency must be at least 1 and delay not negative'}), 400
+    
+    urls = [url.strip() for url in urls]
+    urls = [url if url.startswith(('http://', 'https://')) else 'https://' + url for url in urls]
+    
+    def generate():
+        for record in scrape_batch(
+            urls,
+            scrape_and_enrich,
+            model,
+            save=save_job_data if data.get('save', True) else None,
+            concurrency=concurrency,
+            per_domain=per_domain,
+            delay=delay,
+        ):
+            yield json.dumps(record) + "\n"
+    
+    return Response(generate(), content_type='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/match_resume', methods=['POST'])
+def match_resume_route():
+    """
+    Score a resume against a job locally, without calling the LLM.
+
+    Accepts either multipart form data with a `resume` file and
+    `analysisData` (the job analysis JSON), or a JSON body with
+    `resume_text` and `analysisData` (object). `job_id` may be given
+    instead of analysisData to use a saved job.
+    """
+    if request.is_json:
+        data = request.json or {}
+        resume_text = data.get('resume_text')
+        analysis_data = data.get('analysisData')
+        job_id = data.get('job_id')
+    else:
+        resume_file = request.files.get('resume')
+        if resume_file is None:
+            return jsonify({"error": "A resume file or resume_text is required"}), 400
+        try:
+            resume_text = extract_resume_text(resume_file)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            print(f"Error extracting text: {str(e)}")
+            return jsonify({"error": f"Error processing file: {str(e)}"}), 500
+        analysis_data = request.form.get('analysisData')
+        job_id = request.form.get('job_id', type=int)
+        if analysis_data:
+            try:
+                analysis_data = json.loads(analysis_data)
+            except json.JSONDecodeError:
+                return jsonify({"error": "Invalid analysis data format"}), 400
+
+    if analysis_data is None and job_id is not None:
+        analysis_data = job_store.get(job_id)
+        if analysis_data is None:
+            return jsonify({"error": "Job not found"}), 404
+    if not isinstance(analysis_data, dict) or not resume_text or not resume_text.strip():
+        return jsonify({"error": "Missing required files or data"}), 400
+
+    return jsonify(match_resume(analysis_data, resume_text)), 200
+
+@app.route('/rank_jobs', methods=['POST'])
+def rank_jobs():
+    """
+    Rank every saved job against one resume, best fit first.
+
+    Accepts a multipart `resume` file or a JSON body with `resume_text`;
+    `top_k` (default 10) and `method` (bm25 or cosine) may be given in
+    either.
+    """
+    if request.is_json:
+        data = request.json or {}
+        resume_text = data.get('resume_text')
+    else:
+        data = request.form
+        resume_file = request.files.get('resume')
+        if resume_file is None:
+            return jsonify({"error": "A resume file or resume_text is required"}), 400
+        try:
+            resume_text = extract_resume_text(resume_file)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            print(f"Error extracting text: {str(e)}")
+            return jsonify({"error": f"Error processing file: {str(e)}"}), 500
+
+    if not resume_text or not resume_text.strip():
+        return jsonify({"error": "Could not extract text from the resume"}), 400
+
+    try:
+        top_k = int(data.get('top_k', 10))
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_k must be an integer"}), 400
+
+    start = time.perf_counter()
+    try:
+        result = job_ranker.rank(resume_text, top_k=top_k, method=data.get('method', 'bm25'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result["took_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return jsonify(result), 200
+
+@app.route('/semantic_search', methods=['GET'])
+def semantic_search():
+    """
+    Saved jobs closest in meaning to a free-text query, using the local
+    embedding index. Query parameters: q (required), k (default 10).
+    """
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+
+    start = time.perf_counter()
+    results = embedding_index.semantic_search(q, k=min(request.args.get('k', 10, type=int), 100))
+    return jsonify({
+        "query": q,
+        "results": results,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+    }), 200
+
+@app.route('/similar_jobs/<int:job_id>', methods=['GET'])
+def similar_jobs(job_id):
+    """
+    Saved jobs most similar to one saved job; results at or above
+    `threshold` similarity are flagged as likely duplicates.
+    """
+    start = time.perf_counter()
+    results = embedding_index.similar_jobs(
+        job_id,
+        k=min(request.args.get('k', 10, type=int), 100),
+        threshold=request.args.get('threshold', DUPLICATE_THRESHOLD, type=float),
+    )
+    if results is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify({
+        "job_id": job_id,
+        "results": results,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+    }), 200
+
+@app.route('/semantic_match', methods=['POST'])
+def semantic_match():
+    """
+    Saved jobs closest in meaning to a resume, scored by the best match
+    between any resume section and the job. Accepts a multipart `resume`
+    file or a JSON body with `resume_text`; `k` (default 10) in either.
+    """
+    if request.is_json:
+        data = request.json or {}
+        resume_text = data.get('resume_text')
+    else:
+        data = request.form
+        resume_file = request.files.get('resume')
+        if resume_file is None:
+            return jsonify({"error": "A resume file or resume_text is required"}), 400
+        try:
+            resume_text = extract_resume_text(resume_file)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            print(f"Error extracting text: {str(e)}")
+            return jsonify({"error": f"Error processing file: {str(e)}"}), 500
+
+    if not resume_text or not resume_text.strip():
+        return jsonify({"error": "Could not extract text from the resume"}), 400
+
+    try:
+        k = min(max(int(data.get('k', 10)), 1), 100)
+    except (TypeError, ValueError):
+        return jsonify({"error": "k must be an integer"}), 400
+
+    start = time.perf_counter()
+    results = embedding_index.match_resume(resume_text, k=k)
+    return jsonify({
+        "results": results,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+    }), 200
+
 @app.route('/analyze_resume', methods=['POST'])
 def analyze_resume():
     print("Analyzing resume")
@@ -310,6 +558,7 @@ def analyze_resume():
     resume_file = request.files.get('resume')
     analysis_data_json = request.form.get('analysisData')
     model = request.form.get('model', "mistralai/mixtral-8x7b-instruct")  # Get model from form data
+    no_cache = request.form.get('no_cache', '').lower() in ('1', 'true', 'yes')
 
     if not resume_file or not analysis_data_json:
         return jsonify({"error": "Missing required files or data"}), 400
@@ -319,22 +568,11 @@ def analyze_resume():
     except json.JSONDecodeError:
         return jsonify({"error": "Invalid analysis data format"}), 400
     
-    filename = resume_file.filename
-    extracted_text = ""
-    
     # Extract text from the resume file
-    try: 
-        if filename.endswith('.docx'):
-            result = mammoth.extract_text(resume_file)
-            extracted_text = result.value
-            print(f"Extracted text from DOCX (first 100 chars): {extracted_text[:100]}...")
-        elif filename.endswith('.pdf'):
-            reader = PdfReader(resume_file)
-            for page in reader.pages:
-                extracted_text += page.extract_text()
-            print(f"Extracted text from PDF (first 100 chars): {extracted_text[:100]}...")
-        else: 
-            return jsonify({"error": "Unsupported file format. Please upload a PDF or DOCX file."}), 400
+    try:
+        extracted_text = extract_resume_text(resume_file)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e: 
         print(f"Error extracting text: {str(e)}")
         return jsonify({"error": f"Error processing file: {str(e)}"}), 500
@@ -344,7 +582,7 @@ def analyze_resume():
     
     # Get AI suggestions with the selected model
     try:
-        result = get_ai_resume_suggestions(analysis_data, extracted_text, model=model)
+        result = get_ai_resume_suggestions(analysis_data, extracted_text, model=model, use_cache=not no_cache)
         return jsonify(result), 200
     except Exception as e:
         print(f"Error generating suggestions: {str(e)}")
@@ -358,10 +596,18 @@ def parse_resume():
 def generate_resume_suggestions():
     return route_generate_suggestions()
 
+@app.route('/generate_resume_suggestions_stream', methods=['POST'])
+def generate_resume_suggestions_stream():
+    return route_generate_suggestions_stream()
+
 @app.route('/export_resume', methods=['POST'])
 def export_resume():
     return route_export_resume()
 
+# Build the ranking matrix and job embeddings in the background so the first requests do not pay for them
+threading.Thread(target=job_ranker.sync, name="job-ranker-warmup", daemon=True).start()
+threading.Thread(target=embedding_index.sync, name="embedding-warmup", daemon=True).start()
+
 if __name__ == '__main__':
     app.run(debug=True, port=5317)
 
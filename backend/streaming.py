@@ -0,0 +1,231 @@
+"""
+Streaming Helpers
+
+Utilities for relaying model output to clients as it is generated:
+
+- IncrementalJsonParser consumes a JSON answer chunk by chunk and reports
+  every value as soon as it closes, so a field like `title` or a single
+  `requirements` item can be shown long before generation finishes.
+- DeltaCoalescer batches tiny token deltas into frames bounded by time and
+  size, so the client gets fewer, fuller SSE messages without added delay.
+- iter_with_ticks reads a blocking stream on a background thread and yields
+  TICK whenever a deadline passes with no new item, so buffered text can be
+  flushed during a pause in generation.
+"""
+
+import json
+import queue
+import re
+import threading
+import time
+
+WHITESPACE = " \t\r\n"
+SCALAR_END = WHITESPACE + ",]}"
+
+
+class IncrementalJsonParser:
+    """
+    Incremental parser for a single JSON object, which may be preceded by
+    prose or a markdown fence (anything before the first "{" is skipped).
+
+    feed() returns a list of (path, value) pairs for every value completed
+    by that chunk whose path is at most `max_depth` long; e.g.
+    (("title",), "Engineer") or (("requirements", 0), "Python"). Once the
+    top-level object closes, `done` is True and `result` holds it. If the
+    input turns out not to be valid JSON, `failed` is set and parsing stops.
+    """
+
+    def __init__(self, max_depth=2):
+        self.max_depth = max_depth
+        self.result = None
+        self.done = False
+        self.failed = False
+
+        self._started = False
+        self._stack = []  # frames: {"value": dict|list, "path": tuple, "key": str|None, "expect_key": bool}
+        self._in_string = False
+        self._escape = False
+        self._string = []
+        self._scalar = []
+
+    def feed(self, text):
+        events = []
+        for char in text:
+            if self.done or self.failed:
+                break
+            try:
+                self._step(char, events)
+            except (ValueError, KeyError, IndexError):
+                self.failed = True
+        return events
+
+    def _step(self, char, events):
+        if not self._started:
+            if char == "{":
+                self._started = True
+                self._push({}, ())
+            return
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+                self._string.append(char)
+            elif char == "\\":
+                self._escape = True
+                self._string.append(char)
+            elif char == '"':
+                self._in_string = False
+                text = json.loads('"' + "".join(self._string) + '"')
+                frame = self._stack[-1]
+                if isinstance(frame["value"], dict) and frame["expect_key"]:
+                    frame["key"] = text
+                    frame["expect_key"] = False
+                else:
+                    self._complete(text, events)
+            else:
+                self._string.append(char)
+            return
+
+        if self._scalar:
+            if char not in SCALAR_END:
+                self._scalar.append(char)
+                return
+            value = json.loads("".join(self._scalar))
+            self._scalar = []
+            self._complete(value, events)
+
+        if char in WHITESPACE or char == ":":
+            return
+        if char == ",":
+            frame = self._stack[-1]
+            if isinstance(frame["value"], dict):
+                frame["expect_key"] = True
+            return
+        if char == '"':
+            self._in_string = True
+            self._string = []
+        elif char in "{[":
+            self._push({} if char == "{" else [], self._child_path())
+        elif char in "}]":
+            frame = self._stack.pop()
+            if isinstance(frame["value"], dict) != (char == "}"):
+                raise ValueError("Mismatched bracket")
+            self._complete(frame["value"], events, frame["path"])
+        else:
+            self._scalar = [char]
+
+    def _push(self, value, path):
+        self._stack.append({"value": value, "path": path, "key": None, "expect_key": isinstance(value, dict)})
+
+    def _child_path(self):
+        parent = self._stack[-1]
+        if isinstance(parent["value"], dict):
+            return parent["path"] + (parent["key"],)
+        return parent["path"] + (len(parent["value"]),)
+
+    def _complete(self, value, events, path=None):
+        if not self._stack:
+            self.result = value
+            self.done = True
+            return
+
+        parent = self._stack[-1]
+        if path is None:
+            path = self._child_path()
+        if isinstance(parent["value"], dict):
+            parent["value"][parent["key"]] = value
+            parent["key"] = None
+        else:
+            parent["value"].append(value)
+
+        if len(path) <= self.max_depth:
+            events.append((path, value))
+
+
+def parse_json_response(text):
+    """
+    Parse the JSON object in a model answer, ignoring any surrounding prose.
+    Raises json.JSONDecodeError if no object can be recovered.
+    """
+    parser = IncrementalJsonParser(max_depth=0)
+    parser.feed(text)
+    if parser.done:
+        return parser.result
+
+    # Fall back to everything between the first "{" and the last "}"
+    json_match = re.search(r'(\{.*\})', text, re.DOTALL)
+    return json.loads(json_match.group(1) if json_match else text)
+
+
+class DeltaCoalescer:
+    """
+    Buffers streamed text deltas and releases them as one frame once
+    `max_chars` have accumulated or `max_interval` seconds have passed
+    since the last frame.
+    """
+
+    def __init__(self, max_interval=0.05, max_chars=256):
+        self.max_interval = max_interval
+        self.max_chars = max_chars
+        self._parts = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, delta):
+        """Buffer a delta; returns the text to send now, or None to keep buffering"""
+        self._parts.append(delta)
+        self._size += len(delta)
+        if self._size >= self.max_chars or time.monotonic() - self._last_flush >= self.max_interval:
+            return self.flush()
+        return None
+
+    def time_left(self):
+        """Seconds until the buffered text is due, or None when nothing is buffered"""
+        if not self._parts:
+            return None
+        return max(0.0, self._last_flush + self.max_interval - time.monotonic())
+
+    def flush(self):
+        """Return everything buffered so far (None if empty) and reset"""
+        self._last_flush = time.monotonic()
+        if not self._parts:
+            return None
+        text = "".join(self._parts)
+        self._parts = []
+        self._size = 0
+        return text
+
+
+TICK = object()
+_END = object()
+
+
+def iter_with_ticks(iterable, next_timeout):
+    """
+    Yield the items of `iterable`, read on a background thread, and TICK
+    whenever next_timeout() seconds pass without one (None waits for the
+    next item). Errors raised by the iterable are re-raised here.
+    """
+    items = queue.Queue()
+
+    def pump():
+        try:
+            for item in iterable:
+                items.put((item, None))
+        except BaseException as e:
+            items.put((_END, e))
+            return
+        items.put((_END, None))
+
+    threading.Thread(target=pump, name="stream-pump", daemon=True).start()
+    while True:
+        try:
+            item, error = items.get(timeout=next_timeout())
+        except queue.Empty:
+            yield TICK
+            continue
+        if item is _END:
+            if error is not None:
+                raise error
+            return
+        yield item
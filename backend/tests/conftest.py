@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# The backend modules import each other by name, as server.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the module-level stores out of data/ and let aiSummary build its client offline
+_data_dir = tempfile.mkdtemp(prefix="jobbot-tests-")
+os.environ.setdefault("SCRAPE_CACHE_PATH", os.path.join(_data_dir, "scrape_cache.db"))
+os.environ.setdefault("LLM_CACHE_PATH", os.path.join(_data_dir, "llm_cache.db"))
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(_data_dir, "jobs.db"))
+os.environ.setdefault("EMBEDDINGS_DIR", os.path.join(_data_dir, "embeddings"))
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
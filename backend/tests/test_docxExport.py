@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("docx")
+pytest.importorskip("mammoth")
+pytest.importorskip("flask")
+
+from docx import Document
+
+from docxExport import html_to_docx, round_trip_check
+from htmlBlocks import SAMPLE_RESUME_HTML
+
+
+def test_round_trip_through_parse_docx_content():
+    result = round_trip_check(SAMPLE_RESUME_HTML)
+    assert result["text_similarity"] >= 0.95
+    for kind in ("heading", "list_item"):
+        before, after = result["blocks"][kind]
+        assert before == after, kind
+    assert result["links"] == [1, 1]
+
+
+def test_export_styles():
+    doc = Document(html_to_docx(SAMPLE_RESUME_HTML))
+    styles = [paragraph.style.name for paragraph in doc.paragraphs]
+    assert styles[0] == "Heading 1"
+    assert "List Bullet" in styles and "List Number 2" in styles
+    assert len(doc.tables) == 1
+
+
+def test_unclosed_empty_table():
+    doc = Document(html_to_docx("<p>a</p><table><tr></tr>"))
+    assert [paragraph.text for paragraph in doc.paragraphs] == ["a"]
+    assert not doc.tables
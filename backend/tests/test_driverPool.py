@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from driverPool import DriverPool
+
+
+class FakeDriver:
+    window_handles = ["main"]
+
+    def __init__(self):
+        self.quit_called = False
+        self.switch_to = self
+        self.window = lambda handle: None
+
+    def delete_all_cookies(self):
+        pass
+
+    def execute_script(self, script):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_reuses_idle_driver():
+    pool = DriverPool(FakeDriver, size=1)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    assert pool.stats()["created"] == 1
+
+
+def test_times_out_when_full():
+    pool = DriverPool(FakeDriver, size=1)
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.1)
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiter_spawns_when_a_broken_driver_is_discarded():
+    pool = DriverPool(FakeDriver, size=1)
+    broken = pool.acquire()
+    acquired = []
+
+    def wait_for_driver():
+        start = time.monotonic()
+        acquired.append((pool.acquire(timeout=5), time.monotonic() - start))
+
+    waiter = threading.Thread(target=wait_for_driver)
+    waiter.start()
+    time.sleep(0.1)
+    pool.release(broken, broken=True)
+    waiter.join(2)
+
+    driver, waited = acquired[0]
+    assert driver is not broken and broken.quit_called
+    assert waited < 1
+    assert pool.stats()["crashed"] == 1 and pool.stats()["alive"] == 1
@@ -0,0 +1,34 @@
+import os
+
+from embeddings import EmbeddingIndex, HashingEmbedder
+from jobStore import SQLiteJobStore
+
+RESUME = (
+    "Backend engineer with seven years of Python, Django and PostgreSQL experience building payment APIs.\n\n"
+    "Ran Kubernetes clusters on AWS with Terraform, and on-call for services handling millions of requests."
+)
+
+
+def make_index(tmp_path, **kwargs):
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    for title, description in (
+        ("Python Backend Engineer", "Build payment APIs in Python, Django and PostgreSQL."),
+        ("Frontend Developer", "React, TypeScript and CSS for our design system."),
+        ("Platform Engineer", "Kubernetes, Terraform and AWS infrastructure."),
+    ):
+        store.save({"title": title, "company": "Acme", "description": description, "keywords": []})
+    return EmbeddingIndex(store, HashingEmbedder(256), directory=str(tmp_path / "embeddings"), **kwargs)
+
+
+def test_match_resume_ranks_related_jobs(tmp_path):
+    index = make_index(tmp_path)
+    titles = [result["title"] for result in index.match_resume(RESUME, k=3)]
+    assert titles[-1] == "Frontend Developer"
+
+
+def test_resume_vectors_stay_in_memory(tmp_path):
+    index = make_index(tmp_path, resume_cache_size=2)
+    for i in range(4):
+        index.match_resume(f"{RESUME}\n\nResume {i}")
+    assert index.stats()["cached_resumes"] == 2
+    assert not [name for name in os.listdir(tmp_path / "embeddings") if name.startswith("resume_sections")]
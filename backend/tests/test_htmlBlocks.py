@@ -0,0 +1,38 @@
+from htmlBlocks import SAMPLE_RESUME_HTML, block_text, iter_blocks
+
+
+def blocks(html):
+    return list(iter_blocks(html))
+
+
+def test_headings_paragraphs_and_runs():
+    result = blocks('<h2>Skills</h2><p>Python and <strong>Go</strong>, see <a href="https://x.dev">x</a></p>')
+    assert result[0] == {"type": "heading", "level": 2, "runs": [
+        {"text": "Skills", "bold": False, "italic": False, "underline": False, "href": None},
+    ]}
+    runs = result[1]["runs"]
+    assert [run["text"] for run in runs] == ["Python and ", "Go", ", see ", "x"]
+    assert runs[1]["bold"] and runs[3]["href"] == "https://x.dev"
+
+
+def test_nested_lists():
+    result = blocks("<ol><li>one<ul><li>inner</li></ul></li><li>two</li></ol>")
+    assert [(b["ordered"], b["depth"], block_text(b)) for b in result] == [
+        (True, 0, "one"), (False, 1, "inner"), (True, 0, "two"),
+    ]
+
+
+def test_tables():
+    result = blocks("<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td><p>2</p><p>3</p></td></tr></table>")
+    assert len(result) == 1
+    assert block_text(result[0]) == "A\tB\n1\t2\n3"
+    assert result[0]["rows"][0][0]["header"]
+
+
+def test_empty_tables_are_skipped():
+    assert blocks("<p>a</p><table><tr></tr></table>") == blocks("<p>a</p>")
+    assert blocks("<p>a</p><table><tr></tr>") == blocks("<p>a</p>")
+
+
+def test_chunked_parsing_matches_single_pass():
+    assert list(iter_blocks(SAMPLE_RESUME_HTML, chunk_size=7)) == blocks(SAMPLE_RESUME_HTML)
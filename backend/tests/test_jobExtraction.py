@@ -0,0 +1,17 @@
+from jobExtraction import SkillMatcher, skill_matcher
+
+
+def test_aliases_find_the_canonical_skill():
+    assert skill_matcher.find("Deploying to k8s with Node.js and plain js") == ["JavaScript", "Node.js", "Kubernetes"]
+
+
+def test_vocabulary_skill_spelled_as_an_alias():
+    matcher = SkillMatcher(["ML", "Go", "PostgreSQL"])
+    assert matcher.find("ML platform in Go on Postgres") == ["ML", "Go", "PostgreSQL"]
+    assert matcher.find("Machine learning in golang") == ["ML", "Go"]
+
+
+def test_duplicate_skills_are_added_once():
+    matcher = SkillMatcher(["Python", "python", "Machine Learning", "ML"])
+    assert matcher.skills == ["Python", "Machine Learning", "ML"]
+    assert matcher.find("ml") == ["Machine Learning", "ML"]
@@ -0,0 +1,46 @@
+import jobRanker
+from jobRanker import JobRanker
+from jobStore import SQLiteJobStore
+
+RESUME = "Python engineer: Django, PostgreSQL, Kubernetes and AWS."
+
+
+def make_store(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    for i, (title, skills) in enumerate((
+        ("Python Backend Engineer", ["Python", "Django", "PostgreSQL"]),
+        ("Frontend Developer", ["React", "TypeScript"]),
+        ("Platform Engineer", ["Kubernetes", "AWS"]),
+    )):
+        store.save({"title": title, "company": "Acme", "url": f"https://jobs.example/{i}",
+                    "description": " ".join(skills), "keywords": skills})
+    return store
+
+
+def test_rank_orders_by_fit(tmp_path):
+    ranker = JobRanker(make_store(tmp_path))
+    for method in ("bm25", "cosine"):
+        results = ranker.rank(RESUME, top_k=3, method=method)["results"]
+        assert results[0]["title"] == "Python Backend Engineer"
+        assert results[-1]["title"] == "Frontend Developer"
+        assert "Django" in results[0]["matchedKeywords"]
+
+
+def test_updates_zero_old_rows_and_compact(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobRanker, "COMPACT_MIN_TOMBSTONES", 2)
+    store = make_store(tmp_path)
+    ranker = JobRanker(store)
+    ranker.rank(RESUME)
+
+    # The frontend job turns into a Python job, over several saves
+    for version in range(6):
+        store.save({"title": f"Python Engineer v{version}", "company": "Acme", "url": "https://jobs.example/1",
+                    "description": "Python Django PostgreSQL Kubernetes AWS", "keywords": ["Python"]})
+        result = ranker.rank(RESUME, top_k=3)
+        assert result["jobs_ranked"] == 3
+        assert result["results"][0]["title"] == f"Python Engineer v{version}"
+
+    stats = ranker.stats()
+    assert stats["jobs"] == 3
+    assert stats["rows"] <= 3 + max(2, 0.25 * stats["rows"]) + 1
+    assert ranker._matrix.shape[0] == stats["rows"]
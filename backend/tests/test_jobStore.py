@@ -0,0 +1,85 @@
+import pytest
+
+from jobStore import SQLiteJobStore
+
+JOBS = [
+    ("Python Backend Engineer", "Acme", "Build payment APIs in Python and PostgreSQL.", ["Python", "PostgreSQL"]),
+    ("Frontend Developer", "Globex", "React and TypeScript for the design system.", ["React", "TypeScript"]),
+    ("Data Engineer", "Acme", "Spark pipelines feeding the Python analytics platform.", ["Python", "Spark"]),
+    ("Site Reliability Engineer", "Initech", "Kubernetes, Terraform and on-call.", ["Kubernetes"]),
+    ("Machine Learning Engineer", "Globex", "Train ranking models in Python.", ["Python", "PyTorch"]),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    for i, (title, company, description, keywords) in enumerate(JOBS):
+        store.save({"title": title, "company": company, "description": description, "keywords": keywords,
+                    "url": f"https://jobs.example/{i}"})
+    return store
+
+
+def test_save_updates_by_url(store):
+    job_id = store.save({"title": "Python Backend Engineer II", "company": "Acme",
+                         "url": "https://JOBS.example/0", "keywords": []})
+    assert store.count() == len(JOBS)
+    assert store.get(job_id)["title"] == "Python Backend Engineer II"
+
+
+def test_pagination_visits_every_job_once(store):
+    seen, cursor = [], None
+    while True:
+        page = store.query_jobs(sort="title", order="asc", limit=2, cursor=cursor)
+        seen += [job["title"] for job in page["jobs"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(title for title, *_ in JOBS)
+
+
+def test_filters_and_fields(store):
+    page = store.query_jobs(company="acme", keyword="Python", fields="title")
+    assert sorted(job["title"] for job in page["jobs"]) == ["Data Engineer", "Python Backend Engineer"]
+    assert all(set(job) == {"id", "title"} for job in page["jobs"])
+    with pytest.raises(ValueError):
+        store.query_jobs(sort="salary")
+    with pytest.raises(ValueError):
+        store.query_jobs(cursor="not-a-cursor")
+
+
+def test_iter_jobs_pages_through_everything(store):
+    assert len(list(store.iter_jobs(batch_size=2))) == len(JOBS)
+
+
+def test_full_text_search(store):
+    if not store.fts:
+        pytest.skip("SQLite built without FTS5")
+    result = store.search("python")
+    assert result["total"] == 3
+    assert {r["title"] for r in result["results"]} == {
+        "Python Backend Engineer", "Data Engineer", "Machine Learning Engineer",
+    }
+    assert result["results"][0]["title_highlight"] == "<mark>Python</mark> Backend Engineer"
+    assert store.search("pyth")["total"] == 3  # the last term matches as a prefix
+    assert store.search("python", keyword="Spark")["total"] == 1
+    facets = {facet["keyword"]: facet["count"] for facet in result["facets"]["keywords"]}
+    assert facets["Python"] == 3
+    assert store.search("kubernetes terraform")["results"][0]["title"] == "Site Reliability Engineer"
+
+
+def test_search_highlights_are_escaped(store):
+    if not store.fts:
+        pytest.skip("SQLite built without FTS5")
+    store.save({"title": "Python <script>alert(1)</script> Dev", "company": "Evil",
+                "description": "Python & <img src=x onerror=alert(1)> jobs", "url": "https://jobs.example/evil"})
+    result = next(r for r in store.search("python")["results"] if r["company"] == "Evil")
+    assert result["title_highlight"] == "<mark>Python</mark> &lt;script&gt;alert(1)&lt;/script&gt; Dev"
+    assert "<img" not in result["snippet"]
+    assert result["snippet"].startswith("<mark>Python</mark> &amp; &lt;img")
+
+
+def test_updated_since(store):
+    changes = store.updated_since(0)
+    assert len(changes) == len(JOBS)
+    assert store.updated_since(max(updated_at for _, updated_at in changes)) == []
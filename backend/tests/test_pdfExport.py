@@ -0,0 +1,27 @@
+import time
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from htmlBlocks import SAMPLE_RESUME_HTML
+from pdfExport import benchmark, blocks_to_flowables, html_to_pdf
+
+
+def test_sample_resume_renders_two_pages():
+    result = benchmark(SAMPLE_RESUME_HTML, exports=5)
+    assert result["pages"] == 2
+    assert html_to_pdf(SAMPLE_RESUME_HTML).getvalue().startswith(b"%PDF")
+
+
+def test_export_is_fast():
+    html_to_pdf(SAMPLE_RESUME_HTML)
+    start = time.perf_counter()
+    html_to_pdf(SAMPLE_RESUME_HTML)
+    # The target is under 100 ms; leave room for slow CI machines
+    assert time.perf_counter() - start < 0.5
+
+
+def test_empty_table_is_skipped():
+    assert blocks_to_flowables([{"type": "table", "rows": []}]) == []
+    assert html_to_pdf("<p>a</p><table><tr></tr>").getvalue().startswith(b"%PDF")
@@ -0,0 +1,58 @@
+import io
+
+import pytest
+
+pytest.importorskip("reportlab")
+pytest.importorskip("PyPDF2")
+
+from concurrent.futures.process import BrokenProcessPool
+
+from reportlab.pdfgen import canvas
+
+import pdfExtraction
+from pdfExtraction import WorkerPool, extract_pdf
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes():
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for i in range(12):
+        pdf.drawString(72, 720, f"Page {i} of the CV")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = WorkerPool(2)
+    monkeypatch.setattr(pdfExtraction, "_pool", pool)
+    yield pool
+    pool.shutdown()
+
+
+def test_pooled_matches_inline(pool, pdf_bytes):
+    pooled = extract_pdf(pdf_bytes, backend="pypdf2", parallel=True)
+    inline = extract_pdf(pdf_bytes, backend="pypdf2", parallel=False)
+    assert pooled == inline
+    assert pooled["pages_read"] == 12
+    assert "Page 11 of the CV" in pooled["text"]
+
+
+def test_worker_errors_are_raised(pool):
+    with pytest.raises(RuntimeError, match="PdfReadError"):
+        pool.submit("pypdf2", b"not a pdf", 0, 1).result()
+    assert len(pool._workers) == 1  # the worker survives a bad file
+
+
+def test_dead_worker_is_replaced(pool, pdf_bytes):
+    pool.warm()
+    for worker in pool._workers:
+        worker.process.kill()
+        worker.process.wait()
+    with pytest.raises(BrokenProcessPool):
+        pool.submit("pypdf2", pdf_bytes, 0, 4).result()
+    # extract_pdf falls back to reading inline, and the next range gets a fresh worker
+    assert extract_pdf(pdf_bytes, backend="pypdf2", parallel=True)["pages_read"] == 12
+    assert pool.submit("pypdf2", pdf_bytes, 0, 4).result()[0].startswith("Page 0")
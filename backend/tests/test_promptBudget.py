@@ -0,0 +1,101 @@
+import promptBudget
+from promptBudget import count_tokens, fit_to_budget, prepare, strip_boilerplate
+
+POSTING = """Skip to content
+Home
+Jobs
+Companies
+Salaries
+Career Advice
+For Employers
+Post a Job
+Help
+Sign in
+
+Senior Backend Engineer
+Acme Corp
+Toronto, ON (Hybrid)
+
+About us
+Acme builds payment infrastructure for small businesses across Canada.
+
+Tech Stack
+Python
+Go
+Kubernetes
+PostgreSQL
+
+Requirements:
+- 5+ years building backend services
+Python
+- Experience with HTTP cookies, OAuth and session security
+- Familiarity with privacy policy compliance (GDPR)
+
+Responsibilities:
+- Design and own internal APIs
+- Mentor other engineers
+
+Acme Corp is an equal opportunity employer and considers all qualified applicants without regard to race, religion or disability.
+We use cookies to improve your experience.
+© 2026 Acme Corp. All rights reserved.
+Apply now
+Share this job
+Home
+Jobs
+"""
+
+
+def test_requirement_lines_survive():
+    text = strip_boilerplate(POSTING)
+    lines = text.splitlines()
+    for line in (
+        "Acme Corp",
+        "Python",
+        "Go",
+        "Kubernetes",
+        "PostgreSQL",
+        "- Experience with HTTP cookies, OAuth and session security",
+        "- Familiarity with privacy policy compliance (GDPR)",
+        "- Mentor other engineers",
+    ):
+        assert line in lines
+
+
+def test_boilerplate_is_removed():
+    text = strip_boilerplate(POSTING)
+    for phrase in ("Skip to content", "Career Advice", "Sign in", "equal opportunity",
+                   "We use cookies", "All rights reserved", "Apply now", "Share this job"):
+        assert phrase not in text
+    assert text.splitlines().count("Python") == 1
+
+
+def test_whitespace_is_collapsed():
+    assert strip_boilerplate("a   b\t c\n\n\n\nd") == "a b c\n\nd"
+
+
+def test_resume_keeps_short_and_repeated_lines():
+    resume = "Skills\nPython\nGo\nSQL\nDocker\nAWS\nLinux\nBash\nGit\n\nEngineer\nEngineer"
+    assert strip_boilerplate(resume, kind="resume") == resume
+
+
+def test_fit_to_budget_prefers_requirements():
+    intro = "\n".join(f"Paragraph {i} about the company culture, its history and perks." for i in range(200))
+    text = f"Senior Backend Engineer\n{intro}\n\nRequirements:\n- 5+ years Python\n- Kubernetes\n"
+    fitted = fit_to_budget(text, 120)
+    assert count_tokens(fitted) <= 120
+    assert "- 5+ years Python" in fitted and "- Kubernetes" in fitted
+    assert fitted.startswith("Senior Backend Engineer")
+    # Lines stay in document order
+    assert fitted.index("Paragraph 0") < fitted.index("Requirements:")
+
+
+def test_fit_to_budget_leaves_short_text_alone():
+    assert fit_to_budget("Python developer", 100) == "Python developer"
+
+
+def test_prepare_uses_model_budget(monkeypatch, capsys):
+    monkeypatch.setitem(promptBudget.MODEL_BUDGETS, "tiny-model", 50)
+    text = "\n".join(f"Line {i} of a long description with several words." for i in range(100))
+    assert count_tokens(prepare(text, "tiny-model")) <= 50
+    assert "tokens" in capsys.readouterr().out
+    assert prepare("", "tiny-model") == ""
@@ -0,0 +1,185 @@
+import json
+import re
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("mammoth")
+
+import resumeSections
+from resumeSections import SectionSuggestionCache, anchor, parse_resume_tree, section_prompt, stream_suggestions
+
+RESUME_HTML = (
+    "<h1>Jane Doe</h1><p>jane@example.com</p>"
+    "<h2>Experience</h2><p><strong>Engineer, Acme</strong></p>"
+    "<ul><li>Built the billing service in Python</li><li>Led a team of 4</li></ul>"
+    "<h2>Skills</h2><p>Python, Go, SQL</p>"
+)
+
+
+def test_sections_and_offsets():
+    tree = parse_resume_tree(RESUME_HTML)
+    sections = tree["sections"]
+    assert [(s["id"], s["title"], s["header"]) for s in sections] == [
+        ("s0", "Jane Doe", True), ("s1", "Experience", False), ("s2", "Skills", False),
+    ]
+    experience = sections[1]
+    assert [(n["id"], n["kind"]) for n in experience["nodes"]] == [
+        ("n0", "heading"), ("n1", "paragraph"), ("n2", "bullet"), ("n3", "bullet"),
+    ]
+    for section in sections:
+        for node in section["nodes"]:
+            assert tree["text"][node["start"]:node["end"]] == node["text"]
+            assert tree["text"].splitlines()[node["line"]] == node["text"]
+
+
+def test_section_hash_changes_only_with_its_section():
+    before = parse_resume_tree(RESUME_HTML)["sections"]
+    after = parse_resume_tree(RESUME_HTML.replace("Go, SQL", "Go, SQL, Rust"))["sections"]
+    assert before[1]["hash"] == after[1]["hash"]
+    assert before[2]["hash"] != after[2]["hash"]
+
+
+def test_resume_without_headings_is_one_section():
+    sections = parse_resume_tree("<p>Python developer.</p><p>Built APIs.</p>")["sections"]
+    assert len(sections) == 1 and not sections[0]["header"]
+
+
+def test_section_prompt_lists_nodes():
+    experience = parse_resume_tree(RESUME_HTML)["sections"][1]
+    prompt = section_prompt(experience, "Target job: Backend Engineer")
+    assert "SECTION: Experience" in prompt
+    assert "[n2] Built the billing service in Python" in prompt
+
+
+def test_anchor_finds_the_original_words():
+    tree = parse_resume_tree(RESUME_HTML)
+    experience = tree["sections"][1]
+    result = anchor(experience, {"node": "n2", "type": "achievement", "original": "billing service",
+                                 "suggestion": "billing service handling $2M/month"})
+    assert result["anchored"] and result["nodeId"] == "s1.n2"
+    assert tree["text"][result["offset"]["start"]:result["offset"]["end"]] == "billing service"
+    line = tree["text"].splitlines()[result["position"]["line"]]
+    assert line[result["position"]["ch"]:].startswith("billing service")
+
+
+def test_anchor_falls_back_when_the_model_names_the_wrong_node():
+    experience = parse_resume_tree(RESUME_HTML)["sections"][1]
+    result = anchor(experience, {"node": "n1", "type": "bogus", "original": "team of 4", "suggestion": "team of four"})
+    assert result["nodeId"] == "s1.n3" and result["type"] == "improvement"
+
+    missing = anchor(experience, {"node": "n9", "original": "not in the resume", "suggestion": "x"})
+    assert not missing["anchored"] and missing["nodeId"] == "s1.n1"
+
+
+ANSWER = json.dumps({"suggestions": [
+    {"node": "n2", "type": "achievement", "original": "billing service", "suggestion": "billing service handling $2M/month"},
+    {"node": "n3", "type": "improvement", "original": "team of 4", "suggestion": "team of four engineers"},
+]})
+LONG_SKILLS_HTML = RESUME_HTML.replace("Python, Go, SQL", "Python, Go, SQL, Terraform, Kubernetes and PostgreSQL on AWS")
+SKILLS_ANSWER = json.dumps({"suggestions": [
+    {"node": "n1", "type": "keyword", "original": "Terraform", "suggestion": "Terraform (3 years)"},
+]})
+
+
+def _chunks(text, size=7):
+    for i in range(0, len(text), size):
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text[i:i + size]))])
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """Stubbed model: answers maps a section title to its answer text, chunk iterator or exception"""
+    model = SimpleNamespace(answers={}, calls=[])
+
+    def stream(client, model_name, messages, use_cache=True):
+        title = re.search(r"SECTION: (.+)", messages[-1]["content"]).group(1)
+        model.calls.append(title)
+        answer = model.answers[title]
+        if isinstance(answer, Exception):
+            raise answer
+        return _chunks(answer) if isinstance(answer, str) else answer
+
+    monkeypatch.setattr(resumeSections.llm_cache, "stream", stream)
+    monkeypatch.setattr(resumeSections, "section_cache", SectionSuggestionCache(16))
+    return model
+
+
+def test_suggestions_are_emitted_as_each_object_closes(model):
+    first_closed = ANSWER.index("}") + 1
+    released = threading.Event()
+    stalled = []
+
+    def answer():
+        yield from _chunks(ANSWER[:first_closed])
+        # The rest of the answer only arrives once the first suggestion has been received
+        if not released.wait(5):
+            stalled.append(True)
+        yield from _chunks(ANSWER[first_closed:])
+
+    model.answers["Experience"] = answer()
+    events = stream_suggestions(RESUME_HTML)
+    kind, first = next(events)
+    released.set()
+    assert kind == "suggestion"
+    assert (first["id"], first["nodeId"], first["original"]) == (1, "s1.n2", "billing service")
+
+    rest = list(events)
+    assert not stalled
+    assert [(kind, payload["id"]) for kind, payload in rest] == [("suggestion", 2), ("section", "s1")]
+    assert rest[1][1] == {"id": "s1", "title": "Experience", "reused": False, "suggestions": 2}
+
+
+def test_cached_sections_are_replayed_first(model):
+    model.answers.update({"Experience": ANSWER, "Skills": SKILLS_ANSWER})
+    list(stream_suggestions(LONG_SKILLS_HTML))
+    assert sorted(model.calls) == ["Experience", "Skills"]
+
+    model.calls.clear()
+    events = list(stream_suggestions(LONG_SKILLS_HTML.replace("on AWS", "on AWS and GCP")))
+    assert model.calls == ["Skills"]
+    assert [(kind, payload["id"]) for kind, payload in events] == [
+        ("suggestion", 1), ("suggestion", 2), ("section", "s1"), ("suggestion", 3), ("section", "s2"),
+    ]
+    assert events[2][1]["reused"] and not events[4][1]["reused"]
+    assert events[3][1]["nodeId"] == "s2.n1"
+
+
+def test_answer_wrapped_in_prose_falls_back_to_full_parse(model):
+    # The incremental parser stops at the quoted example; the suggestions come from the full answer
+    model.answers["Experience"] = 'Each item looks like {"node": "n1", "suggestion": "..."}. Here they are:\n' + ANSWER
+    events = list(stream_suggestions(RESUME_HTML))
+    assert [(kind, payload["id"]) for kind, payload in events] == [("suggestion", 1), ("suggestion", 2), ("section", "s1")]
+    assert events[0][1]["original"] == "billing service"
+    assert events[2][1]["suggestions"] == 2
+
+
+def test_section_error_is_an_event(model):
+    model.answers["Experience"] = RuntimeError("rate limited")
+    assert list(stream_suggestions(RESUME_HTML)) == [
+        ("section", {"id": "s1", "title": "Experience", "reused": False, "suggestions": 0, "error": "rate limited"}),
+    ]
+
+
+def test_stream_route_sends_sse_frames(model):
+    flask = pytest.importorskip("flask")
+    resumeEditor = pytest.importorskip("resumeEditor")
+    app = flask.Flask(__name__)
+    app.add_url_rule("/generate_resume_suggestions_stream", methods=["POST"],
+                     view_func=resumeEditor.route_generate_suggestions_stream)
+    model.answers["Experience"] = ANSWER
+
+    response = app.test_client().post("/generate_resume_suggestions_stream", json={"resumeHtml": RESUME_HTML})
+    assert response.content_type.startswith("text/event-stream")
+    frames = [frame.split("\n") for frame in response.get_data(as_text=True).split("\n\n") if frame]
+    assert not json.loads(frames[0][0].removeprefix("data: "))["complete"]
+    assert [frame[0] for frame in frames[1:-1]] == ["event: suggestion", "event: suggestion", "event: section"]
+    assert json.loads(frames[1][1].removeprefix("data: "))["id"] == 1
+
+    final = json.loads(frames[-1][0].removeprefix("data: "))
+    assert final["complete"]
+    assert [s["id"] for s in final["suggestions"]] == [1, 2]
+    assert final["sections"] == {"total": 1, "analysed": 1, "reused": 0}
+    assert isinstance(final["firstSuggestionMs"], int)
@@ -0,0 +1,36 @@
+import pytest
+
+# server.py pulls in every backend dependency (Flask, Selenium, DOCX/PDF export)
+server = pytest.importorskip("server")
+
+
+@pytest.fixture
+def client():
+    return server.app.test_client()
+
+
+@pytest.mark.parametrize("top_k", [None, "ten", [3]])
+def test_rank_jobs_rejects_bad_top_k(client, top_k):
+    response = client.post("/rank_jobs", json={"resume_text": "Python developer", "top_k": top_k})
+    assert response.status_code == 400
+    assert "top_k" in response.get_json()["error"]
+
+
+def test_rank_jobs_accepts_numeric_string(client):
+    response = client.post("/rank_jobs", json={"resume_text": "Python developer", "top_k": "3"})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("k", [None, "ten", {}])
+def test_semantic_match_rejects_bad_k(client, k):
+    response = client.post("/semantic_match", json={"resume_text": "Python developer", "k": k})
+    assert response.status_code == 400
+    assert "k must be" in response.get_json()["error"]
+
+
+def test_semantic_match_clamps_k(client, monkeypatch):
+    requested = []
+    monkeypatch.setattr(server.embedding_index, "match_resume", lambda text, k: requested.append(k) or [])
+    for k in (0, -5, 500):
+        assert client.post("/semantic_match", json={"resume_text": "Python developer", "k": k}).status_code == 200
+    assert requested == [1, 1, 100]
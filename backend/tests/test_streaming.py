@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from streaming import TICK, DeltaCoalescer, IncrementalJsonParser, iter_with_ticks, parse_json_response
+
+ANSWER = (
+    'Here is the analysis:\n```json\n{"title": "Backend \\"Platform\\" Engineer", "salary": null, '
+    '"remote": true, "score": -1.5e2, "requirements": ["Python", "SQL, {nested} [text]"], '
+    '"meta": {"level": "senior", "tags": ["a"]}}\n```'
+)
+
+
+def slow_stream(parts, pause):
+    for part in parts:
+        yield part
+        time.sleep(pause)
+
+
+def test_coalescer_frames_by_size():
+    coalescer = DeltaCoalescer(max_interval=60, max_chars=5)
+    assert coalescer.add("ab") is None
+    assert coalescer.add("cde") == "abcde"
+    assert coalescer.time_left() is None
+    assert coalescer.flush() is None
+
+
+def test_buffered_text_is_flushed_during_a_pause():
+    coalescer = DeltaCoalescer(max_interval=0.05, max_chars=1000)
+    frames = []
+    start = time.monotonic()
+    for item in iter_with_ticks(slow_stream(["a", "b"], pause=0.5), coalescer.time_left):
+        text = coalescer.flush() if item is TICK else coalescer.add(item)
+        if text:
+            frames.append((text, time.monotonic() - start))
+    # "a" went out on a tick well before "b" arrived, not with it
+    assert frames[0][0] == "a" and frames[0][1] < 0.3
+
+
+def test_iter_with_ticks_reraises_errors():
+    def failing():
+        yield "a"
+        raise RuntimeError("stream broke")
+
+    items = iter_with_ticks(failing(), lambda: None)
+    assert next(items) == "a"
+    with pytest.raises(RuntimeError, match="stream broke"):
+        next(items)
+
+
+def feed_in_chunks(text, size):
+    parser = IncrementalJsonParser()
+    events = []
+    for start in range(0, len(text), size):
+        events += parser.feed(text[start:start + size])
+    return parser, events
+
+
+@pytest.mark.parametrize("size", [1, 3, 17, len(ANSWER)])
+def test_parser_reports_values_as_they_close(size):
+    parser, events = feed_in_chunks(ANSWER, size)
+    assert parser.done and not parser.failed
+    assert parser.result == parse_json_response(ANSWER)
+    assert parser.result["title"] == 'Backend "Platform" Engineer'
+    assert events[0] == (("title",), 'Backend "Platform" Engineer')
+    assert (("requirements", 1), "SQL, {nested} [text]") in events
+    assert (("score",), -150.0) in events and (("salary",), None) in events
+    # Deeper values arrive with their parent
+    assert (("meta", "level"), "senior") in events
+    assert not [path for path, _ in events if len(path) > 2]
+
+
+def test_parser_field_arrives_before_the_answer_ends():
+    parser = IncrementalJsonParser()
+    assert parser.feed('{"title": "Engineer", "requirements": ["Py') == [(("title",), "Engineer")]
+    assert not parser.done
+
+
+def test_parser_flags_invalid_json():
+    parser = IncrementalJsonParser()
+    parser.feed('{"title": nope}')
+    assert parser.failed and not parser.done